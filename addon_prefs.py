@@ -64,6 +64,10 @@ class BitCakeToolsPreferences(AddonPreferences):
     auto_save: BoolProperty(name="Auto Incremental-Save", default=True, description='Turn on or off auto incremental saving')
     auto_save_time: IntProperty(name="Auto Save Timer (Minutes)", default=30, min=10, description='Set the time for auto-saving')
 
+    #Exporter Setup
+    export_workers: IntProperty(name="Export Workers", default=1, min=1, max=64, description='Number of background Blender processes Batch Exports are split across. 1 exports everything inside this Blender')
+    backup_count: IntProperty(name="Backups Kept", default=3, min=0, max=100, description='How many compressed backups of each .blend the exporter keeps in .bittools/backups. Backups are only made when the file has unsaved changes. 0 turns them off')
+
 
     def draw(self, context):
         layout = self.layout
@@ -89,6 +93,10 @@ class BitCakeToolsPreferences(AddonPreferences):
         row.prop(self, "auto_save", text='Auto Save', icon='FILE_NEW')
         row.prop(self, "auto_save_time", text='Timer (mins)')
 
+        column.label(text='Exporter Configs')
+        column.prop(self, "export_workers")
+        column.prop(self, "backup_count")
+
 
 classes = (BitCakeToolsPreferences,)
 
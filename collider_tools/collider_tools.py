@@ -4,7 +4,8 @@ from bpy.types import PropertyGroup, Scene
 from bpy.props import BoolProperty, EnumProperty
 from mathutils import Vector
 from bpy.types import Operator
-from ..helpers import get_addon_prefs, get_current_engine, parent_to, name_prefix
+from ..helpers import get_current_engine, parent_to
+from ..naming_rules import NamingRules
 
 
 class BITCAKE_PROPS_collider_configs(PropertyGroup):
@@ -164,16 +165,8 @@ def toggle_all_colliders_visibility(force_on_off=None):
 
 
 def get_all_colliders():
-    collider_prefixes = get_collider_prefixes()
-    all_objects = bpy.context.scene.objects
-
-    all_colliders_list = []
-    for obj in all_objects:
-        # Checks if Prefix exists in Collider Prefixes, if so add object to collider list
-        if name_prefix(obj.name) in collider_prefixes:
-            all_colliders_list.append(obj)
-
-    return all_colliders_list
+    naming_rules = NamingRules()
+    return [obj for obj in bpy.context.scene.objects if naming_rules.classify(obj).kind == 'COLLIDER']
 
 
 def found_issues_during_checking(self, context):
@@ -556,43 +549,11 @@ def create_mesh(name, pydata, parent=None):
     return new_object
 
 
-def get_collider_prefixes():
-    """Returns an array containing all prefixes"""
-
-    addon_prefs = get_addon_prefs()
-    result = {
-        addon_prefs.box_collider_prefix,
-        addon_prefs.capsule_collider_prefix,
-        addon_prefs.sphere_collider_prefix,
-        addon_prefs.convex_collider_prefix,
-        addon_prefs.mesh_collider_prefix,
-    }
-    return result
-
 def get_prefix_for_collider(shape):
     """Returns the correct, formated prefix (with separator) for a given collider"""
 
-    addon_prefs = get_addon_prefs()
-    prefixes = {
-        'box': addon_prefs.box_collider_prefix,
-        'capsule': addon_prefs.capsule_collider_prefix,
-        'sphere': addon_prefs.sphere_collider_prefix,
-        'convex': addon_prefs.convex_collider_prefix,
-        'mesh': addon_prefs.mesh_collider_prefix,
-    }
-    prefix = prefixes[shape]
-
     collider_type = bpy.context.scene.collider_configs.collider_type
-
-    result = None
-    if collider_type == 'COLLIDER':
-        result = prefix + '_' + addon_prefs.standard_collider_prefix + '_'
-    elif collider_type == 'MOV_BLOCKER':
-        result = prefix + '_' + addon_prefs.movement_collider_prefix + '_'
-    elif collider_type == 'SLIPPERY':
-        result = prefix + '_' + addon_prefs.slippery_collider_prefix + '_'
-
-    return result
+    return NamingRules().collider_prefix(shape, collider_type)
 
 
 
@@ -645,12 +606,12 @@ def create_or_add_collider_material(obj):
 
 
 def draw_panel(self, context):
-    addon_prefs = get_addon_prefs()
-    pcol = [addon_prefs.box_collider_prefix,
-            addon_prefs.capsule_collider_prefix,
-            addon_prefs.sphere_collider_prefix,
-            addon_prefs.convex_collider_prefix,
-            addon_prefs.mesh_collider_prefix]
+    shape_prefixes = NamingRules(context).shape_prefixes
+    pcol = [shape_prefixes['box'],
+            shape_prefixes['capsule'],
+            shape_prefixes['sphere'],
+            shape_prefixes['convex'],
+            shape_prefixes['mesh']]
 
     layout = self.layout
 
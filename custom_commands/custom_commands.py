@@ -2,7 +2,7 @@ import bpy
 import re
 import os
 from pathlib import Path
-from ..helpers import get_addon_prefs, get_published_path, is_inside_published
+from ..helpers import get_addon_prefs, get_exporter_configs, get_published_path, is_inside_published
 from bpy.types import Operator
 
 class BITCAKE_OT_incremental_save(Operator):
@@ -13,7 +13,8 @@ class BITCAKE_OT_incremental_save(Operator):
 
     @classmethod
     def poll(cls, context):
-        return True
+        # The Universal Exporter renames and edits objects while it runs, that state must never be saved
+        return not context.scene.exporter_configs.export_running
 
     def execute(self, context):
         filepath = bpy.data.filepath
@@ -44,7 +45,8 @@ class BITCAKE_OT_increment_and_master_save(Operator):
 
     @classmethod
     def poll(cls, context):
-        return True
+        # The Universal Exporter renames and edits objects while it runs, that state must never be saved
+        return not context.scene.exporter_configs.export_running
 
     def execute(self, context):
         filepath = bpy.data.filepath
@@ -149,6 +151,10 @@ def master_filename(filename):
 def auto_incremental_save():
     addon_prefs = get_addon_prefs()
 
+    # Try again shortly instead of saving the exporter's staged objects
+    if get_exporter_configs().export_running:
+        return 10
+
     if addon_prefs.auto_save:
         bpy.ops.bitcake.incremental_save()
 
@@ -6,7 +6,22 @@ modules = [
     'exporter_configs',
     'register_projects',
     'exporter_configs_drawer',
+    'change_tracking',
+    'action_relevance',
+    'export_cache',
+    'export_backup',
+    'export_timings',
+    'export_workers',
+    'export_session',
+    'texture_processing',
+    'publisher',
+    'export_outputs',
+    'export_targets',
+    'export_selection',
     'exporter',
+    'export_planner',
+    'cli',
+    'bulk_export',
 ]
 
 from .. import import_or_reload_modules
@@ -0,0 +1,171 @@
+import bpy
+import re
+
+# Actions can list the armatures (or other objects) they belong to in this custom property, comma separated.
+# Only needed for actions no object uses yet that target bones several armatures have.
+ACTION_OWNERS_PROPERTY = 'Armature'
+
+BONE_DATA_PATH = re.compile(r'^pose\.bones\["((?:[^"\\]|\\.)*)"\]')
+KEY_BLOCK_DATA_PATH = re.compile(r'^key_blocks\["((?:[^"\\]|\\.)*)"\]')
+
+
+class ActionRelevance:
+    """Index of which actions belong to which objects, so each exported file only bakes its own objects' actions
+    instead of every compatible action in the file.
+
+    An action belongs to an object when:
+    - the object (or its mesh's shape keys) uses it, as the active action or in one of the NLA strips, or
+    - the action's 'Armature' custom property names the object, or
+    - nothing uses or names it, and its F-curves target the object's bones or shape keys (plus properties the object
+      or its shape keys have), or
+    - nothing uses or names it, it only targets properties every object has (like location) and one of its slots
+      was made for the object.
+
+    Shape key actions play on the mesh's shape keys, not on the object, see object_actions_for().
+
+    Build one per export, after the actions are cleaned up and before anything is staged."""
+
+    def __init__(self):
+        self.users = {}         # Action -> objects using it
+        self.owners = {}        # Action -> objects named in its custom property
+        self.targets = {}       # Action -> (bone names, shape key names, other data paths) its F-curves animate
+        self.shape_key_actions = set()
+        self.relevant = {}      # Object -> its actions, in bpy.data.actions' order
+
+        for obj in bpy.data.objects:
+            for animation_data in object_animation_datas(obj):
+                if animation_data.action:
+                    self.users.setdefault(animation_data.action, set()).add(obj)
+                for track in animation_data.nla_tracks:
+                    for strip in track.strips:
+                        if strip.action:
+                            self.users.setdefault(strip.action, set()).add(obj)
+
+        for key in bpy.data.shape_keys:
+            animation_data = key.animation_data
+            if animation_data is None:
+                continue
+
+            self.shape_key_actions.update(strip.action for track in animation_data.nla_tracks for strip in track.strips if strip.action)
+            if animation_data.action:
+                self.shape_key_actions.add(animation_data.action)
+
+        for action in bpy.data.actions:
+            owners = action.get(ACTION_OWNERS_PROPERTY)
+            if owners:
+                # Names are looked up now, exported objects are renamed while they're staged
+                names = [name.strip() for name in str(owners).split(',')]
+                self.owners[action] = {bpy.data.objects[name] for name in names if name in bpy.data.objects}
+
+            bones = set()
+            key_blocks = set()
+            data_paths = set()
+            for fcurve in action.fcurves:
+                bone_match = BONE_DATA_PATH.match(fcurve.data_path)
+                key_block_match = KEY_BLOCK_DATA_PATH.match(fcurve.data_path)
+                if bone_match:
+                    bones.add(bpy.utils.unescape_identifier(bone_match.group(1)))
+                elif key_block_match:
+                    key_blocks.add(bpy.utils.unescape_identifier(key_block_match.group(1)))
+                else:
+                    data_paths.add(fcurve.data_path)
+            self.targets[action] = (bones, key_blocks, data_paths)
+
+            if key_blocks or action_id_types(action) == {'KEY'}:
+                self.shape_key_actions.add(action)
+
+    def actions_for(self, obj):
+        """Returns the actions that belong to obj, shape key actions included."""
+        actions = self.relevant.get(obj)
+        if actions is None:
+            bone_names = {bone.name for bone in obj.data.bones} if obj.type == 'ARMATURE' else set()
+            actions = self.relevant[obj] = [action for action in self.targets if self.belongs_to(action, obj, bone_names)]
+
+        return actions
+
+    def object_actions_for(self, obj):
+        """Returns the actions that belong to obj and play on the object itself, without its shape key actions."""
+        return [action for action in self.actions_for(obj) if action not in self.shape_key_actions]
+
+    def belongs_to(self, action, obj, bone_names):
+        users = self.users.get(action, ())
+        if obj in users:
+            return True
+
+        owners = self.owners.get(action)
+        if owners is not None:
+            return obj in owners
+
+        # Used by other objects only
+        if users:
+            return False
+
+        bones, key_blocks, data_paths = self.targets[action]
+        if action in self.shape_key_actions:
+            shape_keys = shape_keys_of(obj)
+            if shape_keys is None or bones:
+                return False
+            if not key_blocks <= set(shape_keys.key_blocks.keys()):
+                return False
+            if not key_blocks and not any_slot_for(action, shape_keys):
+                return False
+            return all_resolve(shape_keys, data_paths)
+
+        if not bones and not data_paths:
+            return False
+        if not bones <= bone_names:
+            return False
+
+        # Properties every object has say nothing about which object the action is for
+        if not bones and not any_slot_for(action, obj):
+            return False
+
+        return all_resolve(obj, data_paths)
+
+    def hierarchy_actions(self, objects):
+        """Returns the actions that belong to any of objects, without duplicates."""
+        actions = {}
+        for obj in objects:
+            actions.update(dict.fromkeys(self.actions_for(obj)))
+
+        return list(actions)
+
+
+def shape_keys_of(obj):
+    return getattr(obj.data, 'shape_keys', None)
+
+
+def object_animation_datas(obj):
+    """The animation data of obj and of its mesh's shape keys, whichever exist."""
+    shape_keys = shape_keys_of(obj)
+    datablocks = (obj, shape_keys) if shape_keys is not None else (obj,)
+    return [datablock.animation_data for datablock in datablocks if datablock.animation_data is not None]
+
+
+def action_id_types(action):
+    """The types of datablock (OBJECT, KEY...) action was made for: its slots' on Blender 4.4 and up, its id_root before."""
+    slots = getattr(action, 'slots', None)
+    if slots is not None:
+        return {slot.target_id_type for slot in slots}
+
+    return {action.id_root}
+
+
+def any_slot_for(action, datablock):
+    """True if one of action's slots was made for datablock. Slots keep the name of the first datablock they were
+    assigned to, even once nothing uses the action anymore. Actions from before Blender 4.4 have no slots."""
+    slots = getattr(action, 'slots', None)
+    if not slots:
+        return False
+
+    return any(slot.target_id_type == datablock.id_type and slot.name_display == datablock.name for slot in slots)
+
+
+def all_resolve(datablock, data_paths):
+    for data_path in data_paths:
+        try:
+            datablock.path_resolve(data_path)
+        except ValueError:
+            return False
+
+    return True
@@ -0,0 +1,170 @@
+import bpy
+import numpy as np
+from contextlib import contextmanager
+
+# A bone is never sampled less often than every MAX_STEP_MULTIPLIER bake steps
+MAX_STEP_MULTIPLIER = 8
+
+# Sampling the scene costs about as much as baking it. Below MIN_SAMPLED_FRAMES a file bakes faster at base_step
+# than it can be sampled, above MAX_SAMPLED_FRAMES the sampling pass alone takes too long to be worth the gamble
+MIN_SAMPLED_FRAMES = 4 * MAX_STEP_MULTIPLIER
+MAX_SAMPLED_FRAMES = 20000
+
+
+def adaptive_bake_step(context, objects, base_step, tolerance, timings=None):
+    """Returns the largest bake step, a power of two multiple of base_step, at which the deform bones of every
+    armature in objects follow each NLA strip the FBX exporter will bake to within tolerance (Blender units).
+
+    Each strip is evaluated once, at base_step, reading all bones' matrices in one go per frame. Then every bone gets
+    the coarsest step that linear interpolation can rebuild its motion from (see bone_step_multipliers()). The FBX
+    exporter bakes a whole file at one step, so the file gets its busiest bone's step, and keyframe reduction
+    (see keyframe_reduction.py) then drops the keys bones that barely move don't need.
+
+    Evaluating the scene is as slow as baking, so it's skipped as soon as the file is known to need base_step:
+    when a strip's root motion already does (see root_motion_needs_base_step()), or a strip sampled before did.
+    Files with fewer than MIN_SAMPLED_FRAMES or more than MAX_SAMPLED_FRAMES samples in total aren't sampled at all.
+
+    Only deform bones are exported, so control bones (Auto-Rig Pro rigs have hundreds) are never looked at."""
+    strips = []
+    for armature in objects:
+        if armature.type != 'ARMATURE' or armature.animation_data is None:
+            continue
+
+        bones = deform_bones(armature)
+        if not bones:
+            continue
+
+        for strip in baked_strips(armature):
+            frames = np.arange(strip.frame_start, strip.frame_end + base_step * 0.5, base_step)
+            strips.append((armature, bones, strip, frames))
+
+    sample_count = sum(len(frames) for armature, bones, strip, frames in strips)
+    if not MIN_SAMPLED_FRAMES <= sample_count <= MAX_SAMPLED_FRAMES:
+        return base_step
+
+    multiplier = MAX_STEP_MULTIPLIER
+    for armature, bones, strip, frames in strips:
+        if multiplier == 1:
+            break
+
+        if root_motion_needs_base_step(armature, strip, frames, tolerance):
+            multiplier = 1
+            break
+
+        with soloed_strip(armature, strip):
+            points = sample_bone_points(context, armature, bones, frames)
+
+        multiplier = min(multiplier, int(bone_step_multipliers(points, tolerance).min()))
+
+    if timings:
+        sample_counts = [len(frames) for armature, bones, strip, frames in strips]
+        timings.count('Bake Samples (Fixed Step)', sum(sample_counts))
+        timings.count('Bake Samples (Adaptive Step)', sum(-(-(count - 1) // multiplier) + 1 for count in sample_counts))
+
+    return base_step * multiplier
+
+
+def root_motion_needs_base_step(armature, strip, frames, tolerance):
+    """Cheap check before evaluating the scene: reads the location F-curves of the armature's top-most bones straight
+    from the strip's action. Every other bone moves with them, so when one can't be interpolated from every other
+    sample (mocap root motion, usually), the file is baked at the base step whatever the other bones do.
+
+    Returns False whenever it can't tell: bones with constraints, scaled or repeated strips."""
+    action = strip.action
+    if action is None or strip.scale != 1 or strip.repeat != 1:
+        return False
+
+    root_names = [pose_bone.name for pose_bone in armature.pose.bones if pose_bone.parent is None and not pose_bone.constraints]
+    if not root_names:
+        return False
+
+    # Root bones' local locations are their armature space heads, rotated by their rest pose
+    action_frames = frames - strip.frame_start + strip.action_frame_start
+    points = np.zeros((len(frames), len(root_names), 1, 3), dtype=np.float32)
+    for bone_index, name in enumerate(root_names):
+        data_path = f'pose.bones["{bpy.utils.escape_identifier(name)}"].location'
+        for axis in range(3):
+            fcurve = action.fcurves.find(data_path, index=axis)
+            if fcurve is not None:
+                points[:, bone_index, 0, axis] = [fcurve.evaluate(frame) for frame in action_frames]
+
+    return bone_step_multipliers(points, tolerance).min() == 1
+
+
+def deform_bones(armature):
+    """Returns (pose bone index, bone length) of every deform bone, the only bones the exporter writes."""
+    return [(index, pose_bone.bone.length) for index, pose_bone in enumerate(armature.pose.bones) if pose_bone.bone.use_deform]
+
+
+def baked_strips(armature):
+    """The NLA strips the FBX exporter bakes to takes of their own: every strip of every unmuted track."""
+    return [strip for track in armature.animation_data.nla_tracks if not track.mute for strip in track.strips if not strip.mute]
+
+
+@contextmanager
+def soloed_strip(armature, strip):
+    """Mutes every other NLA track of armature while strip is evaluated, like the FBX exporter does when baking it."""
+    tracks = armature.animation_data.nla_tracks
+    mutes = [track.mute for track in tracks]
+    for track in tracks:
+        track.mute = strip not in track.strips.values()
+
+    try:
+        yield
+    finally:
+        for track, mute in zip(tracks, mutes):
+            track.mute = mute
+
+
+def sample_bone_points(context, armature, bones, frames):
+    """Evaluates armature at every frame and returns, for every bone in bones, its armature space head and tail and
+    the ends of its X and Z axes (scaled to the bone's length), as an array of shape (frames, bones, 4, 3). Heads and
+    tails alone miss bones twisting or scaling around their own Y axis."""
+    scene = context.scene
+    frame_current, subframe = scene.frame_current, scene.frame_subframe
+
+    pose_bones = armature.pose.bones
+    indices = np.array([index for index, length in bones])
+    lengths = np.array([length for index, length in bones], dtype=np.float32)
+
+    buffer = np.empty(len(pose_bones) * 16, dtype=np.float32)
+    matrices = np.empty((len(frames), len(bones), 4, 4), dtype=np.float32)
+    try:
+        for frame_index, frame in enumerate(frames):
+            scene.frame_set(int(frame), subframe=float(frame - int(frame)))
+            pose_bones.foreach_get('matrix', buffer)
+            # Matrices come out column by column
+            matrices[frame_index] = buffer.reshape(-1, 4, 4)[indices]
+    finally:
+        scene.frame_set(frame_current, subframe=subframe)
+
+    heads = matrices[:, :, 3, :3]
+    axes = [heads + matrices[:, :, column, :3] * lengths[None, :, None] for column in range(3)]
+
+    return np.stack((heads, axes[1], axes[0], axes[2]), axis=2)
+
+
+def bone_step_multipliers(points, tolerance):
+    """Returns, for every bone, the largest power of two step (in samples) whose linear interpolation stays within
+    tolerance of all the bone's sampled positions. points is shaped (frames, bones, points per bone, 3)."""
+    sample_count = len(points)
+    multipliers = np.ones(points.shape[1], dtype=np.int32)
+    samples = np.arange(sample_count)
+
+    step = 2
+    while step <= MAX_STEP_MULTIPLIER and step < sample_count:
+        # Interpolate every sample from the samples kept at this step, the last sample is always kept
+        left = (samples // step) * step
+        right = np.minimum(left + step, sample_count - 1)
+        fraction = ((samples - left) / np.maximum(right - left, 1))[:, None, None, None]
+        interpolated = points[left] + (points[right] - points[left]) * fraction
+
+        error = np.linalg.norm(interpolated - points, axis=-1).max(axis=(0, 2))
+        passed = (error <= tolerance) & (multipliers == step // 2)
+        if not passed.any():
+            break
+
+        multipliers[passed] = step
+        step *= 2
+
+    return multipliers
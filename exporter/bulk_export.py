@@ -0,0 +1,323 @@
+import argparse
+import bpy
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from bpy.types import Operator
+from bpy.props import StringProperty
+from ..helpers import get_addon_prefs, is_inside_published, is_wip_in_path
+from .cli import exporter_configs_to_args
+from .export_cache import CACHE_FOLDER
+from .export_workers import background_blender_command
+from .exporter import NAVIGATION_EVENTS, end_export_progress, start_export_progress, update_export_progress
+
+MANIFEST_FILENAME = 'bulk_export_manifest.json'
+
+
+class BITCAKE_OT_bulk_exporter(Operator):
+    bl_idname = "bitcake.bulk_exporter"
+    bl_label = "Send WIP Folder to Engine"
+    bl_description = "Exports every .blend inside a WIP folder using the current Export Configs.\
+    Files are exported by background Blender processes, this file is left untouched"
+    bl_options = {'INTERNAL'}
+
+    directory: StringProperty(subtype='DIR_PATH')
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT'
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        wip_root = Path(bpy.path.abspath(self.directory))
+
+        if not wip_root.is_dir():
+            self.report({'ERROR'}, 'Chosen Directory does not exist or is invalid!')
+            return {'CANCELLED'}
+
+        if not is_wip_in_path(wip_root):
+            self.report({'ERROR'}, f"'{wip_root}' is not inside a WIP folder. Please choose a folder inside your project's WIP hierarchy.")
+            return {'CANCELLED'}
+
+        blend_files = find_blend_files(wip_root)
+        if not blend_files:
+            self.report({'ERROR'}, f"No .blend files found inside '{wip_root}'")
+            return {'CANCELLED'}
+
+        export_args = exporter_configs_to_args(context.scene.exporter_configs)
+        self.wip_root = wip_root
+        self.bulk = BulkExport(blend_files, export_args, get_addon_prefs().export_workers).start()
+
+        # Files export in background Blenders, the timer only checks on them so this one stays responsive
+        start_export_progress(context, len(blend_files))
+        self.timer = context.window_manager.event_timer_add(0.5, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        bulk = self.bulk
+
+        if event.type == 'ESC' and event.value == 'PRESS' and not bulk.cancelled:
+            bulk.cancel()
+
+        if event.type in NAVIGATION_EVENTS:
+            return {'PASS_THROUGH'}
+
+        if event.type != 'TIMER':
+            return {'RUNNING_MODAL'}
+
+        try:
+            done = bulk.poll()
+            update_export_progress(context, len(bulk.entries), len(bulk.blend_files), bulk.cancelled)
+        except Exception as err:
+            self.report({'ERROR'}, f"Bulk export failed: {err}")
+            bulk.cancel()
+            done = True
+
+        if not done:
+            return {'RUNNING_MODAL'}
+
+        try:
+            context.window_manager.event_timer_remove(self.timer)
+            end_export_progress(context)
+        finally:
+            manifest = bulk.finish()
+
+        manifest['root'] = str(self.wip_root)
+        manifest_path = write_manifest(manifest, self.wip_root / CACHE_FOLDER / MANIFEST_FILENAME)
+
+        exported = len(manifest['files'])
+        failed = manifest['failed']
+        if failed:
+            self.report({'ERROR'}, f"{failed}/{exported} file(s) failed to export. See '{manifest_path}'")
+        elif bulk.cancelled:
+            self.report({'WARNING'}, f"Bulk export cancelled after {exported}/{len(bulk.blend_files)} file(s). See '{manifest_path}'")
+        else:
+            self.report({'INFO'}, f"Exported {exported} file(s) in {manifest['seconds']}s. See '{manifest_path}'")
+
+        return {'CANCELLED'} if bulk.cancelled else {'FINISHED'}
+
+
+def find_blend_files(wip_root):
+    """Returns every .blend below wip_root, ignoring exporter backups and anything inside a Published folder."""
+    blend_files = []
+
+    for root, dirs, files in os.walk(wip_root):
+        # Don't walk into our own bookkeeping folders
+        dirs[:] = sorted(folder for folder in dirs if folder != CACHE_FOLDER)
+
+        for filename in sorted(files):
+            path = Path(root) / filename
+            if path.suffix != '.blend' or path.stem.endswith('_backup'):
+                continue
+            if is_inside_published(path.parent):
+                continue
+
+            blend_files.append(path)
+
+    return blend_files
+
+
+def export_group(blend_path, export_args):
+    """Files in the same group export to the same directory, where they'd race each other saving its caches and
+    manifests (see export_cache.py, texture_processing.py and export_outputs.py), so they must not run at once.
+
+    The exporter builds each file's directory from its folders below WIP, minus their number prefixes
+    (see construct_registered_project_export_directory()), and --directory sends every file to the same one."""
+    if '--directory' in export_args:
+        return ''
+
+    parts = blend_path.parent.parts
+    wip_index = max((index for index, part in enumerate(parts) if 'WIP' in part), default=len(parts))
+    folders = []
+    for part in parts[wip_index + 1:]:
+        split_part = part.split('_')
+        if split_part[0].isnumeric():
+            split_part.pop(0)
+        folders.append('_'.join(split_part).lower())
+
+    return '/'.join(folders)
+
+
+class BulkExport:
+    """Exports blend_files in background Blenders using cli.py, at most worker_count at a time and never two files of
+    the same export_group() at once. Doesn't wait for them: call poll() until it returns True, then finish().
+
+    cancel() only stops new files from starting, files already exporting are left to finish writing."""
+
+    def __init__(self, blend_files, export_args, worker_count):
+        self.blend_files = blend_files
+        self.export_args = export_args
+        self.worker_count = max(1, worker_count)
+        self.pending = {}
+        self.running = []
+        self.entries = []
+        self.cancelled = False
+        self.start_time = 0
+        self.started = None
+        self.temp_dir = None
+
+        for blend_path in blend_files:
+            self.pending.setdefault(export_group(blend_path, export_args), []).append(blend_path)
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='bittools_bulk_'))
+        self.start_next()
+        return self
+
+    def start_next(self):
+        busy_groups = {group for group, *process in self.running}
+        for group, blend_paths in self.pending.items():
+            if self.cancelled or len(self.running) >= self.worker_count:
+                return
+            if group in busy_groups or not blend_paths:
+                continue
+
+            self.running.append((group, *self.start_file(blend_paths.pop(0))))
+            busy_groups.add(group)
+
+    def start_file(self, blend_path):
+        file_index = len(self.entries) + len(self.running)
+        report_path = self.temp_dir / f'report_{file_index}.json'
+        log_path = self.temp_dir / f'export_{file_index}.log'
+        python_expr = f"import importlib; importlib.import_module('{__package__}.cli').main()"
+        # Every file exports ALL its objects, whatever was selected when it was saved.
+        # Files already export in parallel, their exports don't split into more Blenders.
+        child_args = [*self.export_args, '--selection', 'ALL', '--export-workers', '1', '--report', report_path]
+        command = background_blender_command(blend_path, python_expr, child_args)
+
+        log_file = open(log_path, 'w')
+        process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+
+        return blend_path, process, log_file, log_path, report_path, time.perf_counter()
+
+    def poll(self):
+        """Collects the files that finished exporting and starts the next ones. Returns True once nothing is left."""
+        still_running = []
+        for group, blend_path, process, log_file, log_path, report_path, start in self.running:
+            if process.poll() is None:
+                still_running.append((group, blend_path, process, log_file, log_path, report_path, start))
+                continue
+
+            log_file.close()
+            entry = file_entry(blend_path, process.returncode, time.perf_counter() - start, report_path, log_path)
+            print(f"{entry['status']}: {entry['blend']} ({entry['seconds']}s)")
+            self.entries.append(entry)
+
+        self.running = still_running
+        self.start_next()
+
+        return not self.running
+
+    def cancel(self):
+        self.cancelled = True
+
+    def finish(self):
+        """Waits for every file that's exporting or, unless cancelled, left to export. Returns the manifest dict."""
+        while not self.poll():
+            time.sleep(0.1)
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+        return {
+            'started': self.started,
+            'seconds': round(time.perf_counter() - self.start_time, 3),
+            'workers': self.worker_count,
+            'export_args': self.export_args,
+            'cancelled': len(self.blend_files) - len(self.entries) if self.cancelled else 0,
+            'failed': len([entry for entry in self.entries if entry['status'] != 'FINISHED']),
+            'files': self.entries,
+        }
+
+
+def file_entry(blend_path, return_code, seconds, report_path, log_path):
+    """Returns a file's manifest entry, with the status and write time of each of its files."""
+    try:
+        with open(report_path, 'r') as report_file:
+            report = json.load(report_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        report = {'errors': log_path.read_text(errors='replace').strip().splitlines()[-5:], 'exported_files': []}
+
+    return {
+        'blend': str(blend_path),
+        'status': 'FINISHED' if return_code == 0 else 'FAILED',
+        'return_code': return_code,
+        'seconds': round(seconds, 3),
+        'export_seconds': report.get('seconds'),
+        'exported_files': report.get('exported_files', []),
+        'files': report.get('files', []),
+        'errors': report.get('errors', []),
+    }
+
+
+def write_manifest(manifest, manifest_path):
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(manifest_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=4)
+
+    return manifest_path
+
+
+def main(argv=None):
+    """Headless entry point to export a whole WIP folder. Unknown arguments are passed to every file's cli.py export:
+
+    blender -b --python-expr "import BitTools.exporter.bulk_export as bulk; bulk.main()" -- D:/Project/02_WIP --workers 8 --batch --engine Unity
+
+    Exits with a non-zero code if any file fails to export."""
+
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+    parser = argparse.ArgumentParser(prog='bittools-bulk-export', description="Exports every .blend inside a WIP folder.")
+    parser.add_argument('wip_root', help="WIP folder to search for .blend files")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="How many files are exported at the same time")
+    parser.add_argument('--manifest', help=f"Where to write the manifest. Default: <wip_root>/{CACHE_FOLDER}/{MANIFEST_FILENAME}")
+    args, export_args = parser.parse_known_args(argv)
+
+    wip_root = Path(args.wip_root).resolve()
+    if not is_wip_in_path(wip_root):
+        print(f"'{wip_root}' is not inside a WIP folder")
+        sys.exit(1)
+
+    blend_files = find_blend_files(wip_root)
+    bulk = BulkExport(blend_files, export_args, args.workers).start()
+    while not bulk.poll():
+        time.sleep(0.1)
+    manifest = bulk.finish()
+    manifest['root'] = str(wip_root)
+    manifest_path = write_manifest(manifest, args.manifest or wip_root / CACHE_FOLDER / MANIFEST_FILENAME)
+
+    print(f"Exported {len(blend_files)} file(s), {manifest['failed']} failed, in {manifest['seconds']}s. Manifest: {manifest_path}")
+
+    if manifest['failed']:
+        sys.exit(1)
+
+
+def draw_panel(self, context):
+    layout = self.layout
+    row = layout.row()
+    row.operator('bitcake.bulk_exporter', icon='FILE_FOLDER')
+
+
+classes = (BITCAKE_OT_bulk_exporter,)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+def unregister():
+    for cls in classes:
+        bpy.utils.unregister_class(cls)
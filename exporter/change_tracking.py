@@ -0,0 +1,116 @@
+import bpy
+from bpy.app.handlers import persistent
+from .action_relevance import ActionRelevance, object_animation_datas
+
+# Datablock types whose changes end up in exported files
+TRACKED_ID_TYPES = {'OBJECT', 'MESH', 'ARMATURE', 'CAMERA', 'CURVE', 'KEY', 'MATERIAL', 'ACTION'}
+
+
+class ChangeTracker:
+    """Keeps track of which export roots (top-level objects, exported with their whole hierarchy) changed since they
+    were last exported in this session. Used by the 'Changed' export selection type.
+
+    The depsgraph handler only stores which datablocks changed, they're resolved to export roots when needed."""
+
+    def __init__(self):
+        self.changed_ids = set()    # (id_type, name) of datablocks changed since the last resolve()
+        self.changed_roots = set()  # Names of the export roots changed since they were last exported
+        self.edit_count = 0         # Depsgraph updates to any datablock so far, never reset (see export_backup.py)
+        self.paused = False
+
+    def clear(self):
+        self.changed_ids.clear()
+        self.changed_roots.clear()
+
+    def resolve(self, scene):
+        """Turns the changed datablocks into the export roots that use them. Returns the changed root objects."""
+        # Only built when an action changed, it looks at every object and action in the file
+        action_relevance = ActionRelevance() if any(id_type == 'ACTION' for id_type, name in self.changed_ids) else None
+
+        for id_type, name in self.changed_ids:
+            for obj in objects_using(scene, id_type, name, action_relevance):
+                self.changed_roots.add(export_root(obj).name)
+
+        self.changed_ids.clear()
+
+        return [scene.objects[name] for name in sorted(self.changed_roots) if name in scene.objects]
+
+    def mark_exported(self, scene, roots):
+        self.resolve(scene)
+        for root in roots:
+            self.changed_roots.discard(root.name)
+
+
+change_tracker = ChangeTracker()
+
+
+def export_root(obj):
+    while obj.parent:
+        obj = obj.parent
+    return obj
+
+
+def objects_using(scene, id_type, name, action_relevance=None):
+    if id_type == 'OBJECT':
+        obj = scene.objects.get(name)
+        return [obj] if obj else []
+
+    if id_type == 'MATERIAL':
+        return [obj for obj in scene.objects
+                if any(slot.material and slot.material.name == name for slot in obj.material_slots)]
+
+    if id_type == 'ACTION':
+        # Exported files only bake their own objects' actions (see action_relevance.py)
+        action = bpy.data.actions.get(name)
+        if action is None or action_relevance is None:
+            return [obj for obj in scene.objects if object_uses_action(obj, name)]
+        return [obj for obj in scene.objects if action in action_relevance.actions_for(obj)]
+
+    if id_type == 'KEY':
+        return [obj for obj in scene.objects
+                if obj.type == 'MESH' and obj.data.shape_keys and obj.data.shape_keys.name == name]
+
+    return [obj for obj in scene.objects
+            if obj.data is not None and obj.data.id_type == id_type and obj.data.name == name]
+
+
+def object_uses_action(obj, name):
+    for animation_data in object_animation_datas(obj):
+        if animation_data.action and animation_data.action.name == name:
+            return True
+
+        if any(strip.action and strip.action.name == name for track in animation_data.nla_tracks for strip in track.strips):
+            return True
+
+    return False
+
+
+@persistent
+def track_depsgraph_updates(scene, depsgraph):
+    if change_tracker.paused:
+        return
+
+    for update in depsgraph.updates:
+        datablock = update.id.original
+
+        # Selecting objects also sends updates, only count actual changes
+        if datablock.id_type == 'OBJECT' and not (update.is_updated_transform or update.is_updated_geometry or update.is_updated_shading):
+            continue
+
+        change_tracker.edit_count += 1
+        if datablock.id_type in TRACKED_ID_TYPES:
+            change_tracker.changed_ids.add((datablock.id_type, datablock.name))
+
+
+@persistent
+def clear_changes_on_load(*args):
+    change_tracker.clear()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(track_depsgraph_updates)
+    bpy.app.handlers.load_post.append(clear_changes_on_load)
+
+def unregister():
+    bpy.app.handlers.load_post.remove(clear_changes_on_load)
+    bpy.app.handlers.depsgraph_update_post.remove(track_depsgraph_updates)
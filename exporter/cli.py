@@ -0,0 +1,204 @@
+import argparse
+import bpy
+import json
+import sys
+import time
+from pathlib import Path
+from ..helpers import get_addon_prefs
+from .exporter import BITCAKE_OT_universal_exporter
+from .export_planner import plan_export
+from .export_workers import BackgroundReport
+
+
+class HeadlessExport(BackgroundReport):
+    """Carries the same properties as BITCAKE_OT_universal_exporter so its execute() can run without an Operator."""
+
+    def __init__(self, is_batch=False, use_custom_dir=False, directory='', animation_only=False):
+        super().__init__()
+        self.is_batch = is_batch
+        self.animation_only = animation_only
+        self.use_custom_dir = use_custom_dir
+        self.directory = directory
+        self.exported_files = []
+        self.file_reports = []
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='bittools-export',
+        description="Runs BitTools' Universal Exporter (Send to Engine) on the currently loaded .blend file.",
+    )
+    parser.add_argument('--selection', choices=['SELECTED', 'COLLECTION', 'ALL', 'CHANGED'], default='ALL',
+                        help="Which objects to export, same as the Selected/Collection/All/Changed buttons. Default: ALL")
+    parser.add_argument('--batch', action=argparse.BooleanOptionalAction, default=None,
+                        help="Export each object hierarchy to its own file")
+    parser.add_argument('--engine', help="Engine config from configs/engine_configs.json (Unity, Unreal, Cocos...)")
+    parser.add_argument('--project', help="Registered project to export to")
+    parser.add_argument('--extra-projects', nargs='+', metavar='PROJECT',
+                        help="Also export to these registered projects, each with its own engine")
+    parser.add_argument('--directory', help="Export to this directory instead of the registered project")
+    parser.add_argument('--filename', help="Filename for non-batch exports")
+    parser.add_argument('--collection-to-folder', action=argparse.BooleanOptionalAction, default=None,
+                        help="Turn collections into folders on batch exports")
+    parser.add_argument('--origin', action=argparse.BooleanOptionalAction, default=None,
+                        help="Place objects in origin before exporting")
+    parser.add_argument('--apply', action=argparse.BooleanOptionalAction, default=None,
+                        help="Apply transforms before exporting")
+    parser.add_argument('--animations', action=argparse.BooleanOptionalAction, default=None,
+                        help="Bake animations into the exported files")
+    parser.add_argument('--cache', action=argparse.BooleanOptionalAction, default=None,
+                        help="Skip files that didn't change since they were last exported")
+    parser.add_argument('--animations-only', action='store_true',
+                        help="Only export the armatures, one file per action, skipping actions that didn't change")
+    parser.add_argument('--textures', action=argparse.BooleanOptionalAction, default=None,
+                        help="Write resized and converted textures next to the exported files")
+    parser.add_argument('--export-workers', type=int,
+                        help="Background Blender processes batch exports are split across, instead of the Export Workers preference")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Don't export anything, only plan which files would be written (added to the report as 'plan')")
+    parser.add_argument('--report', help="Write a json report (status, errors, exported files, timing) to this path")
+
+    return parser.parse_args(argv)
+
+
+def apply_args_to_exporter_configs(args, exporter_configs):
+    exporter_configs.export_selection_types = args.selection
+
+    if args.batch is not None:
+        exporter_configs.export_batch = args.batch
+    if args.engine:
+        exporter_configs.engine_configs_list = args.engine
+    if args.project:
+        exporter_configs.registered_projects = args.project
+    if args.extra_projects is not None:
+        exporter_configs.extra_export_projects = set(args.extra_projects)
+    if args.directory:
+        exporter_configs.custom_directory = args.directory
+    if args.filename:
+        exporter_configs.non_batch_filename = args.filename
+    if args.collection_to_folder is not None:
+        exporter_configs.collection_to_folder = args.collection_to_folder
+    if args.origin is not None:
+        exporter_configs.origin_transform = args.origin
+    if args.apply is not None:
+        exporter_configs.apply_transform = args.apply
+    if args.animations is not None:
+        exporter_configs.animation_export = args.animations
+    if args.cache is not None:
+        exporter_configs.use_export_cache = args.cache
+    if args.textures is not None:
+        exporter_configs.process_textures = args.textures
+    if args.export_workers:
+        # Only changes the preference in this (background) Blender, preferences aren't saved
+        get_addon_prefs().export_workers = args.export_workers
+
+
+def exporter_configs_to_args(exporter_configs):
+    """The opposite of apply_args_to_exporter_configs, so other files can be exported with the current panel settings."""
+    args = [
+        '--selection', exporter_configs.export_selection_types,
+        '--batch' if exporter_configs.export_batch else '--no-batch',
+        '--collection-to-folder' if exporter_configs.collection_to_folder else '--no-collection-to-folder',
+        '--origin' if exporter_configs.origin_transform else '--no-origin',
+        '--apply' if exporter_configs.apply_transform else '--no-apply',
+        '--animations' if exporter_configs.animation_export else '--no-animations',
+        '--cache' if exporter_configs.use_export_cache else '--no-cache',
+        '--textures' if exporter_configs.process_textures else '--no-textures',
+    ]
+
+    if exporter_configs.engine_configs_list:
+        args += ['--engine', exporter_configs.engine_configs_list]
+    if exporter_configs.registered_projects not in ('', 'NONE'):
+        args += ['--project', exporter_configs.registered_projects]
+    if exporter_configs.extra_export_projects:
+        args += ['--extra-projects', *sorted(exporter_configs.extra_export_projects)]
+
+    return args
+
+
+def run(args):
+    """Runs the Universal Exporter with the given arguments. Returns a report dict."""
+    context = bpy.context
+    exporter_configs = context.scene.exporter_configs
+    apply_args_to_exporter_configs(args, exporter_configs)
+
+    export = HeadlessExport(
+        is_batch=exporter_configs.export_batch,
+        use_custom_dir=bool(args.directory),
+        directory=args.directory or '',
+        animation_only=args.animations_only,
+    )
+
+    if args.dry_run:
+        return dry_run(context, export)
+
+    start = time.perf_counter()
+    try:
+        result = BITCAKE_OT_universal_exporter.execute(export, context)
+    except Exception as err:
+        export.report({'ERROR'}, f"Exporter failed: {err}")
+        result = {'CANCELLED'}
+    elapsed = time.perf_counter() - start
+
+    finished = result == {'FINISHED'} and not export.errors
+
+    return {
+        'blend': bpy.data.filepath,
+        'status': 'FINISHED' if finished else 'FAILED',
+        'errors': export.errors,
+        'messages': export.messages,
+        'exported_files': export.exported_files,
+        'files': export.file_reports,
+        'seconds': round(elapsed, 3),
+        'timings': export.timings.to_json(),
+    }
+
+
+def dry_run(context, export):
+    """Plans the export without writing anything, see export_planner.plan_export."""
+    if export.use_custom_dir:
+        context.scene.exporter_configs.custom_directory = export.directory
+
+    start = time.perf_counter()
+    plan = plan_export(context, use_custom_dir=export.use_custom_dir)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'blend': bpy.data.filepath,
+        'status': 'FAILED' if plan['errors'] else 'FINISHED',
+        'errors': plan['errors'],
+        'messages': [],
+        'exported_files': [],
+        'seconds': round(elapsed, 3),
+        'plan': plan,
+    }
+
+
+def main(argv=None):
+    """Headless entry point for the Universal Exporter. Arguments go after Blender's own '--', e.g.:
+
+    blender -b Props.blend --python-expr "import BitTools.exporter.cli as cli; cli.main()" -- --batch --selection ALL --engine Unity
+
+    Exits with a non-zero code if the export fails or reports any errors."""
+
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+    args = parse_args(argv)
+    report = run(args)
+
+    if args.report:
+        report_path = Path(args.report)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'w') as report_file:
+            json.dump(report, report_file, indent=4)
+
+    if args.dry_run:
+        files = report['plan']['files']
+        skipped = sum(1 for file in files if file['up_to_date'])
+        print(f"BitTools export plan {report['status']}: {len(files)} file(s), {skipped} up to date, {len(report['errors'])} error(s)")
+    else:
+        print(f"BitTools export {report['status']} in {report['seconds']}s, {len(report['exported_files'])} file(s) written, {len(report['errors'])} error(s)")
+
+    if report['status'] != 'FINISHED':
+        sys.exit(1)
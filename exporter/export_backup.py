@@ -0,0 +1,108 @@
+import bpy
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from .change_tracking import change_tracker
+from .export_cache import CACHE_FOLDER
+
+BACKUP_FOLDER = 'backups'
+BACKUP_DIGESTS_FILENAME = 'backup_digests.json'
+
+# Only one backup is compressed and rotated at a time, exports can be clicked faster than that
+backup_lock = threading.Lock()
+
+# .blend path -> change_tracker.edit_count when it was last backed up
+backed_up_edits = {}
+
+
+def backup_blend_file(backup_count):
+    """Saves a crash-safety backup of the current file, but only if it has unsaved changes that weren't backed up yet.
+    Exporting again without editing anything (which still leaves the file dirty) doesn't save it again.
+
+    The copy is written as-is by Blender, then compressed and rotated on a background thread into
+    <blend folder>/.bittools/backups, keeping the last backup_count backups. Blender opens them directly.
+    Returns the background thread, or None if no backup was needed."""
+
+    if backup_count < 1 or not bpy.data.is_saved or not bpy.data.is_dirty:
+        return None
+
+    blend_path = Path(bpy.data.filepath)
+    if backed_up_edits.get(blend_path) == change_tracker.edit_count:
+        return None
+    backup_dir = blend_path.parent / CACHE_FOLDER / BACKUP_FOLDER
+    backup_dir.mkdir(parents=True, exist_ok=True)
+
+    # A path that doesn't exist yet, otherwise Blender would keep a .blend1 of it
+    temp_path = backup_dir / f'.{blend_path.stem}_{time.time_ns()}.blend'
+    bpy.ops.wm.save_as_mainfile(filepath=str(temp_path), copy=True, compress=False)
+    backed_up_edits[blend_path] = change_tracker.edit_count
+
+    thread = threading.Thread(
+        target=compress_and_rotate_backup,
+        args=(temp_path, blend_path.stem, backup_dir, backup_count),
+        name='BitTools Backup',
+    )
+    thread.start()
+
+    return thread
+
+
+def compress_and_rotate_backup(temp_path, stem, backup_dir, backup_count):
+    """Runs on a background thread. Compresses temp_path into a new backup unless its content is the same as the
+    last backup of this file, then deletes the oldest backups."""
+    with backup_lock:
+        try:
+            digest = file_digest(temp_path)
+            digests_path = backup_dir / BACKUP_DIGESTS_FILENAME
+            digests = load_digests(digests_path)
+            backups = list_backups(backup_dir, stem)
+
+            if digests.get(stem) == digest and backups:
+                return
+
+            backup_path = backup_dir / f'{stem}_backup_{datetime.now():%Y%m%d-%H%M%S}.blend'
+            partial_path = backup_path.with_suffix('.partial')
+            with open(temp_path, 'rb') as blend_file, gzip.open(partial_path, 'wb', compresslevel=6) as backup_file:
+                shutil.copyfileobj(blend_file, backup_file, length=1024 * 1024)
+            os.replace(partial_path, backup_path)
+
+            digests[stem] = digest
+            with open(digests_path, 'w') as digests_file:
+                json.dump(digests, digests_file, indent=4, sort_keys=True)
+
+            for old_backup in list_backups(backup_dir, stem)[:-backup_count]:
+                old_backup.unlink(missing_ok=True)
+
+        except OSError as err:
+            print(f"BitTools: failed to write backup of '{stem}': {err}")
+
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+
+def list_backups(backup_dir, stem):
+    """Backups of a file, oldest first."""
+    return sorted(backup_dir.glob(f'{stem}_backup_*.blend'))
+
+
+def load_digests(digests_path):
+    try:
+        with open(digests_path, 'r') as digests_file:
+            return json.load(digests_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def file_digest(path):
+    hasher = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
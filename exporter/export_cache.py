@@ -0,0 +1,467 @@
+import bpy
+import hashlib
+import json
+import numpy as np
+from pathlib import Path
+from .. import bl_info
+
+# Folder (inside the export directory) where BitTools keeps its bookkeeping files.
+# Unity ignores dot-folders, so nothing in here is ever imported as an asset.
+CACHE_FOLDER = '.bittools'
+CACHE_FILENAME = 'export_cache.json'
+CACHE_VERSION = 3
+
+
+class ExportCache:
+    """Remembers the fingerprint of every file exported to a directory so unchanged hierarchies can be skipped."""
+
+    def __init__(self, context, export_directory, engine_configs):
+        self.directory = Path(export_directory)
+        self.path = self.directory / CACHE_FOLDER / CACHE_FILENAME
+        self.entries = self.load()
+        self.settings_digest = hash_export_settings(context, engine_configs)
+        self.scene_animation_digest = None
+        self.action_digests = {}    # Action name -> digest, actions are shared by many hierarchies
+        self.id_digests = None      # Digests of the datablocks exported objects reference, see IdDigests
+        self.skipped = 0
+        self.changed = False
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as cache_file:
+                cache_json = json.load(cache_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        if cache_json.get('version') != CACHE_VERSION:
+            return {}
+
+        return cache_json.get('entries', {})
+
+    def save(self):
+        if not self.changed:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as cache_file:
+            json.dump({'version': CACHE_VERSION, 'entries': self.entries}, cache_file, indent=4, sort_keys=True)
+
+        self.changed = False
+
+    def key(self, filepath):
+        filepath = Path(filepath)
+        try:
+            return filepath.relative_to(self.directory).as_posix()
+        except ValueError:
+            return filepath.as_posix()
+
+    def fingerprint(self, context, objects, action_relevance=None):
+        """Fingerprints the given objects and their whole hierarchies, the same set of objects the exporter selects.
+        Export settings aren't part of it, so one fingerprint can be checked against every target's cache.
+        With an ActionRelevance only the hierarchy's own actions are fingerprinted, otherwise every action is.
+        Returns None if something the file depends on can't be fingerprinted, so it's always exported."""
+        hierarchy = set()
+        for obj in objects:
+            hierarchy.add(obj)
+            hierarchy.update(obj.children_recursive)
+
+        if self.id_digests is None:
+            self.id_digests = IdDigests(context.evaluated_depsgraph_get())
+
+        hasher = hashlib.sha1()
+
+        animated = False
+        try:
+            for obj in sorted(hierarchy, key=lambda o: o.name):
+                hash_object(hasher, obj, self.id_digests)
+                if obj.type == 'ARMATURE' or obj.animation_data:
+                    animated = True
+        except Uncacheable:
+            return None
+
+        if animated and context.scene.exporter_configs.animation_export:
+            actions = bpy.data.actions if action_relevance is None else action_relevance.hierarchy_actions(hierarchy)
+            hasher.update(self.actions_digest(context, actions).encode())
+
+        return hasher.hexdigest()
+
+    def animation_fingerprint(self, context, armature, action):
+        """Fingerprints one of armature's actions as Animations Only exports write it: the skeleton and that action,
+        so editing one action (or the character's meshes) doesn't change the other actions' fingerprints."""
+        hasher = hashlib.sha1(f'{armature.name}|{armature.type}'.encode())
+        hash_skeleton(hasher, armature)
+        hasher.update(self.actions_digest(context, [action]).encode())
+
+        return hasher.hexdigest()
+
+    def actions_digest(self, context, actions):
+        if self.scene_animation_digest is None:
+            self.scene_animation_digest = hash_scene_animation(context)
+
+        hasher = hashlib.sha1(self.scene_animation_digest.encode())
+        for action in sorted(actions, key=lambda a: a.name):
+            digest = self.action_digests.get(action.name)
+            if digest is None:
+                digest = self.action_digests[action.name] = hash_action(action)
+            hasher.update(digest.encode())
+
+        return hasher.hexdigest()
+
+    def is_up_to_date(self, filepath, fingerprint, *copies):
+        """Returns True if filepath was last exported with this fingerprint and it (and its copies) still exist."""
+        if not self.matches(filepath, fingerprint):
+            return False
+
+        for path in (filepath, *copies):
+            if not Path(path).is_file():
+                return False
+
+        self.skipped += 1
+        return True
+
+    def matches(self, filepath, fingerprint):
+        """Returns True if filepath was last exported with this fingerprint, whether or not it still exists."""
+        if fingerprint is None:
+            return False
+
+        return self.entries.get(self.key(filepath)) == self.entry(fingerprint)
+
+    def update(self, filepath, fingerprint):
+        if fingerprint is None:
+            return
+
+        self.entries[self.key(filepath)] = self.entry(fingerprint)
+        self.changed = True
+
+    def forget(self, filepath):
+        if self.entries.pop(self.key(filepath), None) is not None:
+            self.changed = True
+
+    def entry(self, fingerprint):
+        """Combines an objects fingerprint with this cache's export settings."""
+        return hashlib.sha1(f'{self.settings_digest}|{fingerprint}'.encode()).hexdigest()
+
+
+def hash_export_settings(context, engine_configs):
+    """Digest of everything outside of the objects themselves that changes the exported file."""
+    exporter_configs = context.scene.exporter_configs
+
+    settings = {
+        'bittools_version': bl_info['version'],
+        'engine_configs': engine_configs,
+        'origin_transform': exporter_configs.origin_transform,
+        'apply_transform': exporter_configs.apply_transform,
+        'export_nla_strips': exporter_configs.export_nla_strips,
+        'animation_export': exporter_configs.animation_export,
+        'separator': exporter_configs.separator,
+        'prefixes': [exporter_configs.static_mesh_prefix, exporter_configs.skeletal_mesh_prefix, exporter_configs.camera_prefix],
+    }
+
+    return hashlib.sha1(json.dumps(settings, sort_keys=True, default=to_json).encode()).hexdigest()
+
+
+class Uncacheable(Exception):
+    """Raised while fingerprinting something whose exported file can't be told from its data (e.g. unsaved images)."""
+
+
+class IdDigests:
+    """Digests of the datablocks exported objects reference: modifier targets, node groups, materials, images...
+    Each is hashed by content once per export, a Boolean cutter or a material can be shared by many hierarchies."""
+
+    def __init__(self, depsgraph):
+        self.depsgraph = depsgraph
+        self.digests = {}
+
+    def digest(self, id_block):
+        digest = self.digests.get(id_block)
+        if digest is None:
+            # Datablocks referencing each other (a node group nested in itself, a cutter parented to its target)
+            # only hash the reference on the way back
+            self.digests[id_block] = f'{type(id_block).__name__}:{id_block.name}'
+
+            hasher = hashlib.sha1(self.digests[id_block].encode())
+            try:
+                hash_id(hasher, id_block, self)
+            except Uncacheable:
+                del self.digests[id_block]
+                raise
+            digest = self.digests[id_block] = hasher.hexdigest()
+
+        return digest
+
+
+def hash_object(hasher, obj, ids):
+    parent_name = obj.parent.name if obj.parent else None
+    hasher.update(f'{obj.name}|{obj.type}|{parent_name}|{obj.get("LOD")}'.encode())
+    hasher.update(np.array(obj.matrix_world, dtype=np.float32).tobytes())
+    hasher.update(hash_id_properties(obj, ids).encode())
+
+    for modifier in obj.modifiers:
+        # Geometry Nodes inputs are ID properties of the modifier
+        hasher.update(hash_rna_values(modifier, ids).encode())
+        hasher.update(hash_id_properties(modifier, ids).encode())
+
+    for slot in obj.material_slots:
+        material = slot.material
+        hasher.update(f'{slot.link}|{ids.digest(material) if material else None}'.encode())
+
+    if obj.type == 'MESH':
+        hash_mesh(hasher, obj, ids)
+    elif obj.type == 'ARMATURE':
+        hash_armature(hasher, obj)
+    elif obj.data is not None:
+        hasher.update(hash_rna_values(obj.data, ids).encode())
+
+    if obj.animation_data:
+        action = obj.animation_data.action
+        hasher.update(f'{action.name if action else None}'.encode())
+        for track in obj.animation_data.nla_tracks:
+            for strip in track.strips:
+                strip_action = strip.action.name if strip.action else None
+                hasher.update(f'{track.name}|{track.mute}|{strip.name}|{strip.mute}|{strip_action}|{strip.frame_start}|{strip.frame_end}'.encode())
+
+
+def hash_mesh(hasher, obj, ids):
+    """Hashes the mesh the exporter stages for obj: skinned meshes and meshes with shape keys are exported with their
+    modifiers (hashed in hash_object()), every other mesh is evaluated (see ExportSession.stage_mesh())."""
+    is_skinned = any(modifier.type == 'ARMATURE' for modifier in obj.modifiers)
+    if is_skinned or obj.data.shape_keys:
+        hash_mesh_data(hasher, obj.data, obj.vertex_groups)
+        return
+
+    evaluated = obj.evaluated_get(ids.depsgraph)
+    mesh = evaluated.to_mesh(preserve_all_data_layers=True, depsgraph=ids.depsgraph)
+    try:
+        hash_mesh_data(hasher, mesh, obj.vertex_groups)
+    finally:
+        evaluated.to_mesh_clear()
+
+
+def hash_mesh_data(hasher, mesh, vertex_groups=()):
+    foreach_hash(hasher, mesh.vertices, 'co', 3, np.float32)
+    foreach_hash(hasher, mesh.loops, 'vertex_index', 1, np.int32)
+    foreach_hash(hasher, mesh.polygons, 'loop_total', 1, np.int32)
+    foreach_hash(hasher, mesh.polygons, 'material_index', 1, np.int32)
+    foreach_hash(hasher, mesh.polygons, 'use_smooth', 1, bool)
+    foreach_hash(hasher, mesh.edges, 'use_edge_sharp', 1, bool)
+
+    for uv_layer in mesh.uv_layers:
+        hasher.update(uv_layer.name.encode())
+        foreach_hash(hasher, uv_layer.data, 'uv', 2, np.float32)
+
+    # Color attributes and every other attribute the FBX exporter may write.
+    # Internal attributes (selection, hidden state, topology already hashed above) start with a dot.
+    for attribute in mesh.attributes:
+        if attribute.name.startswith('.'):
+            continue
+
+        field = ATTRIBUTE_FIELDS.get(attribute.data_type)
+        if field is None:
+            raise Uncacheable(f'{mesh.name}: {attribute.data_type} attribute {attribute.name}')
+
+        hasher.update(f'{attribute.name}|{attribute.domain}|{attribute.data_type}'.encode())
+        foreach_hash(hasher, attribute.data, *field)
+
+    if mesh.has_custom_normals:
+        if hasattr(mesh, 'corner_normals'):
+            foreach_hash(hasher, mesh.corner_normals, 'vector', 3, np.float32)
+        else:
+            # Before Blender 4.1 split normals have to be computed before they can be read
+            mesh.calc_normals_split()
+            foreach_hash(hasher, mesh.loops, 'normal', 3, np.float32)
+
+    if mesh.shape_keys:
+        for key_block in mesh.shape_keys.key_blocks:
+            hasher.update(f'{key_block.name}|{key_block.value}|{key_block.mute}'.encode())
+            foreach_hash(hasher, key_block.data, 'co', 3, np.float32)
+
+    # Vertex weights can't be read in bulk, only pay for them on skinned meshes
+    if vertex_groups:
+        hasher.update('|'.join(group.name for group in vertex_groups).encode())
+        weights = [(group.group, group.weight) for vertex in mesh.vertices for group in vertex.groups]
+        hasher.update(np.array(weights, dtype=np.float32).tobytes())
+
+
+# Attribute data type -> (field, size, dtype) to read all its values with foreach_get
+ATTRIBUTE_FIELDS = {
+    'FLOAT': ('value', 1, np.float32),
+    'INT': ('value', 1, np.int32),
+    'INT8': ('value', 1, np.int32),
+    'BOOLEAN': ('value', 1, bool),
+    'FLOAT2': ('vector', 2, np.float32),
+    'INT32_2D': ('value', 2, np.int32),
+    'FLOAT_VECTOR': ('vector', 3, np.float32),
+    'FLOAT_COLOR': ('color', 4, np.float32),
+    'BYTE_COLOR': ('color', 4, np.float32),
+    'QUATERNION': ('value', 4, np.float32),
+    'FLOAT4X4': ('value', 16, np.float32),
+}
+
+
+def hash_id(hasher, id_block, ids):
+    """Hashes a datablock exported objects reference by its content."""
+    if isinstance(id_block, bpy.types.Object):
+        hash_object(hasher, id_block, ids)
+        return
+
+    if isinstance(id_block, bpy.types.Mesh):
+        hash_mesh_data(hasher, id_block)
+    elif isinstance(id_block, bpy.types.NodeTree):
+        hash_node_tree(hasher, id_block, ids)
+    elif isinstance(id_block, bpy.types.Image):
+        hash_image(hasher, id_block)
+    elif isinstance(id_block, bpy.types.Collection):
+        hasher.update(np.array(id_block.instance_offset, dtype=np.float32).tobytes())
+        for obj in sorted(id_block.all_objects, key=lambda o: o.name):
+            hasher.update(ids.digest(obj).encode())
+    else:
+        # Materials, curves, texts... Material node trees are pointers too, so they're hashed by content
+        hasher.update(hash_rna_values(id_block, ids).encode())
+
+    hasher.update(hash_id_properties(id_block, ids).encode())
+
+
+# Node properties that only change how the node editor draws it
+NODE_UI_PROPERTIES = {'select', 'location', 'width', 'width_hidden', 'height', 'dimensions', 'hide', 'show_options',
+                      'show_preview', 'show_texture', 'label', 'use_custom_color', 'color'}
+
+
+def hash_node_tree(hasher, node_tree, ids):
+    """Hashes the nodes, their inputs and links of a material node tree or a (Geometry Nodes) node group."""
+    # Blender 4.0 moved group inputs and outputs to the node tree's interface
+    interface = node_tree.interface.items_tree if hasattr(node_tree, 'interface') else [*node_tree.inputs, *node_tree.outputs]
+    for item in interface:
+        hasher.update(hash_rna_values(item, ids).encode())
+
+    for node in sorted(node_tree.nodes, key=lambda n: n.name):
+        hasher.update(hash_rna_values(node, ids, NODE_UI_PROPERTIES).encode())
+        for socket in node.inputs:
+            value = getattr(socket, 'default_value', None)
+            hasher.update(f'{socket.identifier}|{json.dumps(to_json(value, ids))}'.encode())
+
+    for link in node_tree.links:
+        hasher.update(f'{link.from_node.name}|{link.from_socket.identifier}|{link.to_node.name}|{link.to_socket.identifier}|{link.is_muted}'.encode())
+
+
+def hash_image(hasher, image):
+    # Painted but unsaved pixels aren't in the file the FBX exporter copies
+    if image.is_dirty:
+        raise Uncacheable(f'{image.name} has unsaved changes')
+
+    hasher.update(f'{image.source}|{image.filepath}|{tuple(image.size)}|{image.colorspace_settings.name}'.encode())
+    if image.packed_file:
+        hasher.update(image.packed_file.data)
+    elif image.source == 'FILE':
+        # The file's size and modification time stand for its pixels, reading them all would be too slow
+        try:
+            stat = Path(bpy.path.abspath(image.filepath, library=image.library)).stat()
+        except OSError:
+            raise Uncacheable(f'{image.name} has no file to compare')
+        hasher.update(f'{stat.st_size}|{stat.st_mtime_ns}'.encode())
+
+
+def hash_armature(hasher, obj):
+    hash_skeleton(hasher, obj)
+    foreach_hash(hasher, obj.pose.bones, 'matrix_basis', 16, np.float32)
+
+
+def hash_skeleton(hasher, obj):
+    bones = obj.data.bones
+
+    hasher.update('|'.join(f'{bone.name}:{bone.parent.name if bone.parent else ""}' for bone in bones).encode())
+    foreach_hash(hasher, bones, 'head_local', 3, np.float32)
+    foreach_hash(hasher, bones, 'tail_local', 3, np.float32)
+    foreach_hash(hasher, bones, 'use_deform', 1, bool)
+
+
+def hash_scene_animation(context):
+    """Digest of the scene data that goes into the animation markers json."""
+    hasher = hashlib.sha1()
+    scene = context.scene
+
+    hasher.update(f'{scene.render.fps}'.encode())
+    for marker in scene.timeline_markers:
+        hasher.update(f'{marker.name}|{marker.frame}'.encode())
+
+    return hasher.hexdigest()
+
+
+def hash_action(action):
+    hasher = hashlib.sha1()
+
+    hasher.update(f'{action.name}|{action.use_frame_range}|{action.use_cyclic}|{tuple(action.frame_range)}'.encode())
+    hasher.update(hash_id_properties(action).encode())
+
+    for marker in action.pose_markers:
+        hasher.update(f'{marker.name}|{marker.frame}'.encode())
+
+    for fcurve in action.fcurves:
+        hasher.update(f'{fcurve.data_path}|{fcurve.array_index}|{fcurve.mute}'.encode())
+        foreach_hash(hasher, fcurve.keyframe_points, 'co', 2, np.float32)
+        foreach_hash(hasher, fcurve.keyframe_points, 'handle_left', 2, np.float32)
+        foreach_hash(hasher, fcurve.keyframe_points, 'handle_right', 2, np.float32)
+        foreach_hash(hasher, fcurve.keyframe_points, 'interpolation', 1, np.int32)
+
+    return hasher.hexdigest()
+
+
+def foreach_hash(hasher, collection, attribute, size, dtype):
+    buffer = np.empty(len(collection) * size, dtype=dtype)
+    collection.foreach_get(attribute, buffer)
+    hasher.update(buffer.tobytes())
+
+
+def hash_id_properties(struct, ids=None):
+    """Serializes the custom properties of an ID (or a modifier's Geometry Nodes inputs) so they can be hashed.
+    With IdDigests, datablocks they point to are hashed by content, otherwise by name."""
+    try:
+        items = struct.items()
+    except TypeError:
+        # Most structs other than IDs can't have custom properties
+        return ''
+
+    properties = {key: to_json(value, ids) for key, value in items}
+    return json.dumps(properties, sort_keys=True, default=lambda value: to_json(value, ids))
+
+
+# Properties every struct or datablock has that never change the exported file
+IGNORED_PROPERTIES = {'rna_type', 'id_data', 'original', 'preview'}
+
+
+def hash_rna_values(struct, ids=None, skipped=(), depth=0):
+    """Serializes all plain RNA properties of a struct (modifier, camera, light...) so they can be hashed.
+    Nested structs are serialized too. With IdDigests, datablocks it points to (a Boolean's cutter, a Geometry Nodes
+    group, a material's node tree...) are hashed by content, otherwise by name."""
+    values = {'type': struct.bl_rna.identifier}
+
+    for prop in struct.bl_rna.properties:
+        if prop.identifier in IGNORED_PROPERTIES or prop.identifier in skipped or prop.type == 'COLLECTION':
+            continue
+
+        value = getattr(struct, prop.identifier, None)
+        if prop.type == 'POINTER' and value is not None and not isinstance(value, bpy.types.ID):
+            # Settings structs (a node's parent frame, a modifier's sub-settings) rarely nest deeper than this
+            value = json.loads(hash_rna_values(value, ids, skipped, depth + 1)) if depth < 2 else None
+
+        values[prop.identifier] = value
+
+    return json.dumps(values, sort_keys=True, default=lambda value: to_json(value, ids))
+
+
+def to_json(value, ids=None):
+    """json.dumps fallback for Blender types (ID properties, vectors, matrices, datablocks)."""
+    if value is None or isinstance(value, (int, float, str, bool)):
+        return value
+    if isinstance(value, bpy.types.ID):
+        return ids.digest(value) if ids else value.name
+    if isinstance(value, (set, frozenset)):
+        return sorted(to_json(item, ids) for item in value)
+    if hasattr(value, 'to_dict'):
+        return {key: to_json(item, ids) for key, item in value.to_dict().items()}
+    if hasattr(value, 'to_list'):
+        return value.to_list()
+
+    try:
+        return [to_json(item, ids) for item in value]
+    except TypeError:
+        return str(value)
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from .export_cache import CACHE_FOLDER
+
+PENDING_FOLDER = 'pending'
+MANIFEST_FILENAME = 'manifest.json'
+MANIFEST_VERSION = 2
+
+
+class ExportOutputs:
+    """Every file an export writes (FBX, markers json, published copies) is first written to a hidden pending folder,
+    then commit() moves them all into place at the end of the export. Engines never see half-written files and get
+    all changes in one go, so they reimport once per export instead of once per file.
+
+    commit() also adds every path that changed and its hash to <export directory>/.bittools/manifest.json, for engine
+    side tooling to reimport in a single pass. Paths stay listed (with their latest hash) until the engine side deletes
+    the manifest, so exports made before it got to read it aren't lost."""
+
+    def __init__(self, export_directory):
+        self.directory = Path(export_directory)
+        self.pending = {}           # Final path -> pending path
+        self.groups = {}            # Group (usually the exported FBX path) -> its final paths
+        self.done_groups = set()
+        self.unchanged = set()      # Final paths known to be written exactly as they were last time
+
+    def stage(self, final_path, group=None, unchanged=False):
+        """Returns the pending path to write final_path to. Files are grouped so they're committed together.
+
+        Set unchanged when final_path is known to get the same content as last time (its export cache fingerprint
+        matches), an existing file is then left untouched. FBX files are never byte for byte identical (they keep
+        their creation time), so only json files are otherwise compared by content."""
+        final_path = Path(final_path)
+
+        try:
+            root = self.directory
+            relative_path = final_path.relative_to(root)
+        except ValueError:
+            root = final_path.parent
+            relative_path = Path(final_path.name)
+
+        pending_path = root / CACHE_FOLDER / PENDING_FOLDER / relative_path
+        pending_path.parent.mkdir(parents=True, exist_ok=True)
+        pending_path.unlink(missing_ok=True)
+
+        self.pending[final_path] = pending_path
+        self.groups.setdefault(group, []).append(final_path)
+        if unchanged:
+            self.unchanged.add(final_path)
+
+        return pending_path
+
+    def done(self, group=None):
+        """Marks a group as completely written. Groups that aren't done are discarded by commit()."""
+        self.done_groups.add(group)
+
+    def commit(self, blend_path):
+        """Moves every pending file of the done groups into place. Files that can't be replaced (on Windows, while
+        an engine has them open) are left as they were.
+        Returns (changed paths, unchanged count, [(final path, error)] of the files that couldn't be replaced)."""
+        changed = []
+        unchanged = 0
+        failed = []
+
+        for group, final_paths in self.groups.items():
+            for final_path in final_paths:
+                pending_path = self.pending[final_path]
+
+                if group not in self.done_groups or not pending_path.is_file():
+                    pending_path.unlink(missing_ok=True)
+                    continue
+
+                if final_path in self.unchanged and final_path.is_file():
+                    pending_path.unlink()
+                    unchanged += 1
+                    continue
+
+                digest = file_digest(pending_path)
+                if final_path.suffix == '.json' and is_same_file(final_path, pending_path, digest):
+                    pending_path.unlink()
+                    unchanged += 1
+                    continue
+
+                try:
+                    final_path.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(pending_path, final_path)
+                except OSError as err:
+                    pending_path.unlink(missing_ok=True)
+                    failed.append((final_path, err))
+                    continue
+
+                changed.append({'path': self.manifest_path(final_path), 'sha1': digest})
+
+        self.remove_pending_folders()
+
+        if changed:
+            self.write_manifest(changed, blend_path)
+
+        self.pending.clear()
+        self.groups.clear()
+        self.done_groups.clear()
+        self.unchanged.clear()
+
+        return changed, unchanged, failed
+
+    def manifest_path(self, final_path):
+        try:
+            return final_path.relative_to(self.directory).as_posix()
+        except ValueError:
+            return final_path.as_posix()
+
+    def write_manifest(self, changed, blend_path):
+        manifest_path = self.directory / CACHE_FOLDER / MANIFEST_FILENAME
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        date = datetime.now().isoformat(timespec='seconds')
+
+        # Merged with what the engine side hasn't read yet, newer entries replace older ones of the same path
+        entries = {entry['path']: entry for entry in load_manifest_entries(manifest_path)}
+        for entry in changed:
+            entries[entry['path']] = dict(entry, blend=str(blend_path), date=date)
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'date': date,
+            'blend': str(blend_path),
+            'root': str(self.directory),
+            'changed': list(entries.values()),
+        }
+
+        partial_path = manifest_path.with_name(manifest_path.name + '.partial')
+        with open(partial_path, 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=4)
+        os.replace(partial_path, manifest_path)
+
+    def remove_pending_folders(self):
+        """Removes the pending folders that are now empty, deepest first."""
+        folders = set()
+        for pending_path in self.pending.values():
+            folder = pending_path.parent
+            while folder.name != CACHE_FOLDER and folder != folder.parent:
+                folders.add(folder)
+                folder = folder.parent
+
+        for folder in sorted(folders, key=lambda path: len(path.parts), reverse=True):
+            try:
+                folder.rmdir()
+            except OSError:
+                pass
+
+
+def load_manifest_entries(manifest_path):
+    try:
+        with open(manifest_path, 'r') as manifest_file:
+            return json.load(manifest_file).get('changed', [])
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def file_digest(path):
+    hasher = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+def is_same_file(final_path, pending_path, pending_digest):
+    if not final_path.is_file() or final_path.stat().st_size != pending_path.stat().st_size:
+        return False
+
+    return file_digest(final_path) == pending_digest
@@ -0,0 +1,221 @@
+import bpy
+from pathlib import Path
+from ..helpers import get_published_path
+from ..naming_rules import NamingRules
+from .action_relevance import ActionRelevance
+from .change_tracking import change_tracker
+from .export_cache import ExportCache
+from .export_selection import resolve_export_objects
+from .export_session import CollectionPaths
+from .export_workers import BackgroundReport
+from .export_targets import resolve_export_targets
+from .exporter import fingerprint_objects, get_batch_export_paths, get_non_batch_filename, obj_ancestor_in_objects_set
+
+PLAN_VERSION = 2
+
+
+class ExportPlanner:
+    """Keeps the last export plan until the .blend path, project, export settings, naming rules or objects change,
+    so the panel can show what Send to Engine would write on every redraw without working it out again."""
+
+    def __init__(self):
+        self.key = None
+        self.plan = None
+
+    def get(self, context, use_custom_dir=False):
+        key = plan_key(context, use_custom_dir)
+        if key != self.key:
+            # Fingerprinting every object is too slow for a redraw, the panel plan doesn't check the cache
+            self.plan = plan_export(context, use_custom_dir, check_cache=False)
+            self.key = key
+
+        return self.plan
+
+    def clear(self):
+        self.key = None
+        self.plan = None
+
+
+export_planner = ExportPlanner()
+
+
+def plan_key(context, use_custom_dir):
+    """Everything a plan depends on, cheap enough to check on every redraw: the export settings, naming rules,
+    Ignored Collections and, for every object in the view layer, what decides whether and under which name it's
+    exported (name, type, parent, collections, LOD, visibility)."""
+    exporter_configs = context.scene.exporter_configs
+    selection_type = exporter_configs.export_selection_types
+    active_object = context.active_object
+    view_layer = context.view_layer
+
+    if selection_type == 'SELECTED':
+        selection = tuple(obj.name for obj in context.selected_objects)
+    elif selection_type == 'COLLECTION':
+        selection = active_object.users_collection[0].name if active_object else None
+    elif selection_type == 'CHANGED':
+        selection = (len(change_tracker.changed_ids), tuple(sorted(change_tracker.changed_roots)))
+    else:
+        selection = None
+
+    naming_rules = NamingRules(context)
+    objects = tuple(
+        (obj.name, obj.type, obj.parent.name if obj.parent else None,
+         tuple(collection.name for collection in obj.users_collection), obj.get('LOD'),
+         obj.hide_select, obj.visible_get(view_layer=view_layer))
+        for obj in view_layer.objects
+    )
+
+    return (
+        bpy.data.filepath,
+        exporter_configs.registered_projects,
+        tuple(sorted(exporter_configs.extra_export_projects)),
+        exporter_configs.engine_configs_list,
+        use_custom_dir,
+        exporter_configs.custom_directory,
+        exporter_configs.export_batch,
+        exporter_configs.non_batch_filename,
+        exporter_configs.collection_to_folder,
+        exporter_configs.use_export_cache,
+        exporter_configs.static_mesh_export,
+        exporter_configs.skeletal_mesh_export,
+        exporter_configs.camera_export,
+        naming_rules.separator,
+        naming_rules.static_prefix,
+        tuple(sorted(naming_rules.object_prefixes.items())),
+        tuple(sorted(naming_rules.collider_shapes.items())),
+        tuple(sorted(naming_rules.collider_types.items())),
+        tuple(sorted(collection.name for collection in bpy.data.collections if collection.get('Ignore'))),
+        selection_type,
+        active_object.name if active_object else None,
+        selection,
+        objects,
+    )
+
+
+def plan_export(context, use_custom_dir=False, check_cache=True):
+    """Dry run of the Universal Exporter: returns every file it would write, without exporting or changing anything.
+
+    The plan is a json serializable dict with the main export directory and, for each file, the project and engine
+    it's exported for, its final and published paths, the (exported) names of the objects that go in it and whether
+    it would be skipped as up to date (None when the export cache wasn't checked). Files for every project in
+    Also Send To are listed after the main project's. Problems that would stop the export are listed in 'errors'."""
+    exporter_configs = context.scene.exporter_configs
+    is_batch = exporter_configs.export_batch
+    report = BackgroundReport()
+
+    plan = {
+        'version': PLAN_VERSION,
+        'blend': bpy.data.filepath,
+        'engine': exporter_configs.engine_configs_list,
+        'project': None if use_custom_dir else exporter_configs.registered_projects,
+        'batch': is_batch,
+        'directory': None,
+        'files': [],
+        'errors': report.errors,
+    }
+
+    if exporter_configs.export_selection_types == 'COLLECTION' and context.active_object is None:
+        report.report({'ERROR'}, 'No active object to export the collection of')
+        return plan
+
+    objects_list = resolve_export_objects(context)
+    if not objects_list:
+        report.report({'ERROR'}, 'No objects to export')
+        return plan
+
+    naming_rules = NamingRules(context)
+    export_names = naming_rules.export_names(objects_list)
+    for conflict in naming_rules.name_conflicts(export_names):
+        report.report({'ERROR'}, conflict)
+
+    if not use_custom_dir and not bpy.data.is_saved:
+        report.report({'ERROR'}, 'This file has never been saved')
+        return plan
+
+    try:
+        targets = resolve_export_targets(report, context, use_custom_dir)
+    except (OSError, KeyError, ValueError) as err:
+        report.report({'ERROR'}, f"Couldn't find the project's export directory: {err}")
+        return plan
+    if targets == {'CANCELLED'}:
+        return plan
+    plan['directory'] = str(targets[0].directory)
+
+    fingerprints = {}
+    if check_cache and exporter_configs.use_export_cache:
+        for target in targets:
+            target.export_cache = ExportCache(context, target.directory, target.engine_configs)
+        action_relevance = ActionRelevance() if exporter_configs.animation_export else None
+        fingerprints = fingerprint_objects(context, targets[0].export_cache, objects_list, is_batch, action_relevance)
+
+    if is_batch:
+        # Every exported object goes in the file of its top-most exported ancestor
+        hierarchies = {}
+        for member, name in export_names.items():
+            root = member
+            while root.parent in export_names:
+                root = root.parent
+            hierarchies.setdefault(root, []).append(name)
+
+        objects_set = set(objects_list)
+        roots = [obj for obj in objects_list if not obj_ancestor_in_objects_set(objects_set, obj)]
+        collection_paths = CollectionPaths(context.scene)
+        for target in targets:
+            for obj in roots:
+                filepath, published_dir = get_batch_export_paths(context, obj, export_names[obj], target.directory, target.publish, collection_paths)
+                plan['files'].append(plan_file(target, filepath, published_dir, hierarchies[obj], fingerprints.get(obj)))
+    else:
+        active_object = context.active_object or objects_list[0]
+        filename = get_non_batch_filename(context, export_names.get(active_object, active_object.name))
+        for target in targets:
+            published_dir = get_published_path_parent() if target.publish else None
+            plan['files'].append(plan_file(target, target.directory / filename, published_dir, list(export_names.values()), fingerprints.get(None)))
+
+    return plan
+
+
+def plan_file(target, filepath, published_dir, object_names, fingerprint):
+    published_path = published_dir / filepath.name if published_dir else None
+    export_cache = target.export_cache
+
+    up_to_date = None
+    if export_cache:
+        published_copies = [published_path] if published_path else []
+        up_to_date = export_cache.is_up_to_date(filepath, fingerprint, *published_copies)
+
+    return {
+        'project': target.project,
+        'engine': target.engine,
+        'filepath': str(filepath),
+        'published_filepath': str(published_path) if published_path else None,
+        'objects': object_names,
+        'up_to_date': up_to_date,
+    }
+
+
+def get_published_path_parent():
+    published_path = get_published_path()
+    return published_path.parent if published_path else None
+
+
+def draw_panel(self, context):
+    configs = context.scene.exporter_configs
+    if configs.export_running or not configs.engine_configs_list:
+        return
+
+    plan = export_planner.get(context)
+
+    box = self.layout.box()
+    box.label(text='Current Export Directory:')
+
+    for error in plan['errors'][:3]:
+        box.label(text=error, icon='ERROR')
+
+    if plan['directory']:
+        box.label(text=plan['directory'])
+
+    files = plan['files']
+    if len(files) == 1:
+        box.label(text=Path(files[0]['filepath']).name, icon='FILE')
+    elif files:
+        box.label(text=f'{len(files)} files', icon='FILE')
@@ -0,0 +1,59 @@
+import bpy
+from ..naming_rules import NamingRules
+from .change_tracking import change_tracker
+
+
+def resolve_export_objects(context):
+    """Returns the objects to export for the current export type (Selected, Collection, All, Changed), with their child
+    colliders added and everything that must not be exported (Ignored Collections, disabled types) removed.
+
+    Works directly on the view layer data in a single pass: no operators, and nothing is selected, unhidden or made
+    active. The list keeps the view layer's order."""
+
+    exporter_configs = context.scene.exporter_configs
+    selection_type = exporter_configs.export_selection_types
+    view_layer = context.view_layer
+
+    naming_rules = NamingRules(context)
+    colliders = [obj for obj in view_layer.objects if naming_rules.is_collider(obj)]
+
+    if selection_type == 'SELECTED':
+        candidates = context.selected_objects
+    elif selection_type == 'COLLECTION':
+        # The active object picks the collection, there's nothing to export without one
+        active_object = context.active_object
+        candidates = active_object.users_collection[0].all_objects if active_object else []
+    elif selection_type == 'CHANGED':
+        candidates = change_tracker.resolve(context.scene)
+    else:
+        # Everything that could be selected in the viewport, colliders included even when they're hidden
+        collider_set = set(colliders)
+        candidates = [obj for obj in view_layer.objects
+                      if not obj.hide_select and (obj in collider_set or obj.visible_get(view_layer=view_layer))]
+
+    objects_list = list(dict.fromkeys(candidates))
+    objects_set = set(objects_list)
+
+    # Colliders always go with the objects they're parented to
+    for collider in colliders:
+        if collider in objects_set:
+            continue
+
+        parent = collider.parent
+        while parent:
+            if parent in objects_set:
+                objects_list.append(collider)
+                break
+            parent = parent.parent
+
+    excluded_collections = {collection for collection in bpy.data.collections if collection.get('Ignore')}
+    excluded_types = set()
+    if not exporter_configs.static_mesh_export:
+        excluded_types.add('MESH')
+    if not exporter_configs.skeletal_mesh_export:
+        excluded_types.add('ARMATURE')
+    if not exporter_configs.camera_export:
+        excluded_types.add('CAMERA')
+
+    return [obj for obj in objects_list
+            if obj.type not in excluded_types and excluded_collections.isdisjoint(obj.users_collection)]
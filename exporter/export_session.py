@@ -0,0 +1,369 @@
+import bpy
+from mathutils import Matrix
+from .material_slots import compact_material_slots, has_unused_material_slots, restore_material_slots
+
+STAGING_COLLECTION_NAME = 'BitTools_Export_Staging'
+PARKED_NAME_PREFIX = 'BitTools_Parked_'
+
+
+class ExportSession:
+    """Stages temporary copies of everything being exported so the user's objects and data are never modified.
+    The only exception are shared meshes' unused material slots, removed during the export and put back by free().
+
+    Static meshes are staged as evaluated meshes (modifiers and, if needed, transforms applied).
+    Armatures, skinned meshes, empties and cameras are staged as object copies that share the original data.
+    Call free() when the export is done to delete everything that was staged."""
+
+    def __init__(self, operator, context):
+        self.operator = operator
+        self.context = context
+
+        self.staged_objects = {}    # Source object -> staged object
+        self.applied = set()        # Source objects whose staged data has their transforms applied
+        self.created_ids = []       # Every datablock created by the session, freed together by free()
+        self.parked_names = {}      # Source object -> its name before export
+        self.staged_meshes = []     # Meshes created by the session, their unused material slots are removed
+        self.shared_meshes = []     # Original meshes staged objects share, compacted in place then restored by free()
+        self.collider_meshes = []
+        self.slots_restore = []
+        self.instanced_meshes = {}  # (source mesh, slot materials, collider, applied) -> staged mesh shared by its instances
+        self.collection = None
+        self.image_nodes = MaterialImageNodes()
+        self.collection_paths = CollectionPaths(context.scene)
+
+        self.active_object = context.view_layer.objects.active
+        self.selected_objects = context.selected_objects[:]
+
+    def stage(self, objects_list, export_names, colliders, hierarchies=True):
+        """Stages objects_list and all their hierarchies (only objects_list itself without hierarchies).
+        export_names is a dict of source object -> name in the exported file, colliders is the set of source objects
+        that must be exported without materials."""
+        panel_prefs = self.context.scene.exporter_configs
+        depsgraph = self.context.evaluated_depsgraph_get()
+
+        members = []
+        for obj in objects_list:
+            for member in ((obj, *obj.children_recursive) if hierarchies else (obj,)):
+                if member not in export_names:
+                    export_names[member] = member.name
+                members.append(member)
+
+        # Parents first, so children can always be parented to their staged parent
+        members = sorted(set(members), key=hierarchy_depth)
+
+        self.park_source_names(members, export_names)
+
+        self.collection = bpy.data.collections.new(STAGING_COLLECTION_NAME)
+        self.created_ids.append(self.collection)
+        self.context.scene.collection.children.link(self.collection)
+
+        for member in members:
+            self.stage_object(member, export_names[member], member in colliders, depsgraph, panel_prefs.apply_transform)
+
+        # Every staged mesh's material slots are cleaned up in one go, without operators
+        compact_material_slots(self.staged_meshes)
+        compact_material_slots(self.shared_meshes, self.slots_restore)
+
+        # Colliders are exported without materials
+        for mesh in self.collider_meshes:
+            for index in range(len(mesh.materials)):
+                mesh.materials[index] = None
+
+        for member in members:
+            staged = self.staged_objects[member]
+            if member.parent in self.staged_objects:
+                staged.parent = self.staged_objects[member.parent]
+
+            # Skinned meshes must be deformed by the staged armature, not the original one
+            for modifier in staged.modifiers:
+                if modifier.type == 'ARMATURE' and modifier.object in self.staged_objects:
+                    modifier.object = self.staged_objects[modifier.object]
+
+        if panel_prefs.apply_transform:
+            self.apply_transforms(members, set(objects_list), panel_prefs.origin_transform)
+        elif panel_prefs.origin_transform:
+            # Only move root objects to 0,0,0 to avoid errors with Custom Pivots.
+            for obj in objects_list:
+                if obj.parent is None:
+                    self.staged_objects[obj].location = 0, 0, 0
+
+        # Index the exported materials' image nodes once, every file then only looks up its own
+        self.image_nodes.of_objects(self.staged_objects.values())
+
+        return self.staged_objects
+
+    def stage_actions(self, action_relevance, keep_nla_strips):
+        """Puts every staged object's own actions (see action_relevance.py) on NLA tracks of their own, so the FBX
+        exporter bakes them as NLA strips instead of baking every compatible action in the file.
+        The staged objects' existing NLA tracks are muted unless keep_nla_strips is set. Shape key actions are left
+        on the shape keys, they're baked from there."""
+        for source, staged in self.staged_objects.items():
+            actions = action_relevance.object_actions_for(source)
+            animation_data = staged.animation_data
+            if animation_data is None:
+                if not actions:
+                    continue
+                animation_data = staged.animation_data_create()
+
+            # The active action is one of the object's actions, it's baked from its own strip
+            animation_data.action = None
+            for track in animation_data.nla_tracks:
+                if not keep_nla_strips:
+                    track.mute = True
+
+            for action in actions:
+                track = animation_data.nla_tracks.new()
+                track.name = action.name
+                # Same take name the FBX exporter gives the actions it bakes itself
+                track.strips.new(f'{staged.name}|{action.name}', int(action.frame_range[0]), action)
+
+    def park_source_names(self, members, export_names):
+        """Temporarily renames source objects that hold a name one of the staged objects needs."""
+        target_names = set(export_names.values())
+
+        for member in members:
+            if member.name in target_names:
+                self.parked_names[member] = member.name
+                member.name = f'{PARKED_NAME_PREFIX}{len(self.parked_names)}'
+
+    def stage_object(self, source, name, is_collider, depsgraph, apply_transform):
+        staged = source.copy()
+        self.created_ids.append(staged)
+        staged.name = name
+        if staged.name != name:
+            self.operator.report({"ERROR"}, f"Failed to rename object '{source.name}' to '{name}' for export")
+
+        self.collection.objects.link(staged)
+        staged.hide_viewport = False
+        staged.hide_select = False
+        self.staged_objects[source] = staged
+
+        if source.type == 'MESH':
+            self.stage_mesh(source, staged, is_collider, depsgraph, apply_transform)
+
+        return staged
+
+    def stage_mesh(self, source, staged, is_collider, depsgraph, apply_transform):
+        is_skinned = any(modifier.type == 'ARMATURE' for modifier in source.modifiers)
+        can_apply = apply_transform and not is_skinned and source.parent_type != 'BONE'
+
+        if is_skinned or source.data.shape_keys:
+            # Skinned meshes and meshes with shape keys keep their modifiers and shape keys for the FBX exporter,
+            # so they share the original mesh unless something about it has to change.
+            # Unused material slots are removed from the original mesh and put back by free(), unless other objects
+            # use that mesh too, or its materials are linked to the object.
+            if not (is_collider or can_apply):
+                other_users = source.data.users - 2 - int(source.data.use_fake_user)
+                if other_users == 0 and all(slot.link == 'DATA' for slot in source.material_slots):
+                    self.shared_meshes.append(source.data)
+                    return
+                if not has_unused_material_slots(source.data):
+                    return
+            mesh = source.data.copy()
+        else:
+            staged.modifiers.clear()
+
+            # Instances without modifiers all evaluate to the same mesh, so they share a single staged copy
+            instance_key = None
+            if not source.modifiers and source.data.users > 2:
+                instance_key = (source.data, tuple(slot.material for slot in source.material_slots), is_collider, can_apply)
+                mesh = self.instanced_meshes.get(instance_key)
+                if mesh is not None:
+                    staged.data = mesh
+                    for slot in staged.material_slots:
+                        slot.link = 'DATA'
+                    if can_apply:
+                        self.applied.add(source)
+                    return
+
+            mesh = bpy.data.meshes.new_from_object(source.evaluated_get(depsgraph), preserve_all_data_layers=True, depsgraph=depsgraph)
+            if instance_key:
+                self.instanced_meshes[instance_key] = mesh
+
+        self.created_ids.append(mesh)
+        # Copying a mesh also copies its shape keys datablock
+        if mesh.shape_keys:
+            self.created_ids.append(mesh.shape_keys)
+        staged.data = mesh
+
+        # Object-linked materials would be lost in the new mesh, so store every slot's material in the mesh itself
+        for index, slot in enumerate(source.material_slots):
+            if index < len(mesh.materials):
+                mesh.materials[index] = slot.material
+        for slot in staged.material_slots:
+            slot.link = 'DATA'
+
+        self.staged_meshes.append(mesh)
+        if is_collider:
+            self.collider_meshes.append(mesh)
+
+        if can_apply:
+            self.applied.add(source)
+
+    def apply_transforms(self, members, objects_set, origin_transform):
+        """Bakes rotation and scale into the staged meshes, leaving them with world space location only.
+        Instances sharing a staged mesh only get their own copy if their rotation and scale differ."""
+        staged_worlds = {}
+        mesh_transforms = {}    # Staged mesh -> rounded rotation/scale -> (rotation/scale, staged objects)
+
+        for member in members:
+            staged = self.staged_objects[member]
+            world = member.matrix_world.copy()
+
+            root = member
+            while root.parent:
+                root = root.parent
+            if origin_transform and root in objects_set:
+                world = Matrix.Translation(-root.matrix_world.translation) @ world
+
+            if member in self.applied:
+                rotation_scale = world.to_3x3().to_4x4()
+                key = tuple(round(value, 5) for row in rotation_scale for value in row)
+                transforms = mesh_transforms.setdefault(staged.data, {})
+                transforms.setdefault(key, (rotation_scale, []))[1].append(staged)
+                world = Matrix.Translation(world.translation)
+
+            staged_worlds[member] = world
+
+        for mesh, transforms in mesh_transforms.items():
+            transforms = list(transforms.values())
+
+            # Copies are made before anything is transformed
+            meshes = [mesh]
+            for rotation_scale, staged_objects in transforms[1:]:
+                mesh_copy = mesh.copy()
+                self.created_ids.append(mesh_copy)
+                if mesh_copy.shape_keys:
+                    self.created_ids.append(mesh_copy.shape_keys)
+                for staged in staged_objects:
+                    staged.data = mesh_copy
+                meshes.append(mesh_copy)
+
+            for target, (rotation_scale, staged_objects) in zip(meshes, transforms):
+                target.transform(rotation_scale, shape_keys=True)
+                if rotation_scale.is_negative and hasattr(target, 'flip_normals'):
+                    target.flip_normals()
+
+        for member in members:
+            staged = self.staged_objects[member]
+
+            # Objects parented to bones follow the pose, keep them as they are
+            if staged.parent and staged.parent_type == 'BONE':
+                continue
+
+            parent_world = Matrix.Identity(4)
+            if member.parent in staged_worlds:
+                parent_world = staged_worlds[member.parent]
+            elif staged.parent:
+                parent_world = staged.parent.matrix_world
+
+            staged.constraints.clear()
+            staged.matrix_parent_inverse.identity()
+            staged.matrix_basis = parent_world.inverted() @ staged_worlds[member]
+
+    def staged_name(self, obj):
+        staged = self.staged_objects.get(obj)
+        return staged.name if staged else obj.name
+
+    def free(self):
+        """Deletes everything that was staged and puts names, selection and active object back.
+        Only the datablocks the session created are removed, in a single pass, the rest of the file isn't looked at."""
+        if self.created_ids:
+            bpy.data.batch_remove(self.created_ids)
+
+        restore_material_slots(self.slots_restore)
+
+        for source, name in self.parked_names.items():
+            source.name = name
+
+        self.staged_objects.clear()
+        self.created_ids.clear()
+        self.parked_names.clear()
+        self.staged_meshes.clear()
+        self.shared_meshes.clear()
+        self.collider_meshes.clear()
+        self.slots_restore.clear()
+        self.instanced_meshes.clear()
+        self.collection = None
+
+        selected_objects = set(self.selected_objects)
+        for obj in self.context.view_layer.objects:
+            obj.select_set(obj in selected_objects)
+        self.context.view_layer.objects.active = self.active_object
+
+
+class CollectionPaths:
+    """Child -> parent map of the scene's collections, built once, with each collection's path cached.
+    Used by Collections as Folders exports."""
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.parents = None
+        self.paths = {}
+
+    def build_parents(self):
+        self.parents = {}
+        stack = [self.scene.collection]
+        while stack:
+            parent = stack.pop()
+            for child in parent.children:
+                # Collections linked in more than one place use the first parent found
+                if child not in self.parents:
+                    self.parents[child] = parent
+                    stack.append(child)
+
+    def path(self, collection):
+        """Names of the collections from the scene's root down to collection, not including the scene collection."""
+        if collection in self.paths:
+            return self.paths[collection]
+
+        if self.parents is None:
+            self.build_parents()
+
+        if collection == self.scene.collection or collection not in self.parents:
+            path = []
+        else:
+            path = self.path(self.parents[collection]) + [collection.name]
+
+        self.paths[collection] = path
+        return path
+
+
+class MaterialImageNodes:
+    """Index of material -> its Image Texture nodes, filled as materials are looked up."""
+
+    def __init__(self):
+        self.nodes = {}
+
+    def of_material(self, material):
+        if material not in self.nodes:
+            node_tree = material.node_tree
+            self.nodes[material] = [node for node in node_tree.nodes if node.type == 'TEX_IMAGE'] if node_tree else []
+
+        return self.nodes[material]
+
+    def of_objects(self, objects):
+        """Image nodes of every material used by objects."""
+        materials = {slot.material for obj in objects for slot in obj.material_slots if slot.material}
+
+        nodes = []
+        for material in materials:
+            nodes += self.of_material(material)
+
+        return nodes
+
+
+def solo_staged_action(staged, action_name):
+    """Mutes every NLA track of staged except the one ExportSession.stage_actions() made for action_name, so the
+    next file it's exported to only bakes that action. Also works in background workers, where there's no session."""
+    take_name = f'{staged.name}|{action_name}'
+    for track in staged.animation_data.nla_tracks:
+        track.mute = not any(strip.name == take_name for strip in track.strips)
+
+
+def hierarchy_depth(obj):
+    depth = 0
+    while obj.parent:
+        depth += 1
+        obj = obj.parent
+    return depth
@@ -0,0 +1,118 @@
+import bpy
+import json
+import os
+from pathlib import Path
+from ..helpers import get_current_project_assets_path, get_current_project_structure_json, get_engine_configs_path, get_registered_projects
+from .export_outputs import ExportOutputs
+
+
+class ExportTarget:
+    """A project (and the engine it's exported for) one export writes to. Objects are collected, named and staged once,
+    and every target exports the same staged objects. Only the directory, engine configs (axes, scale...),
+    export cache, textures and pending outputs are per target."""
+
+    def __init__(self, project, engine, engine_configs, directory, publish):
+        self.project = project
+        self.engine = engine
+        self.engine_configs = engine_configs
+        self.directory = Path(directory)
+        self.publish = publish      # Only the main target is published, they would all publish to the same folder
+        self.outputs = ExportOutputs(directory)
+        self.export_cache = None
+        self.texture_stage = None
+
+
+def resolve_export_targets(operator, context, use_custom_dir):
+    """Returns the ExportTargets to write to: the current project (or the custom directory) first, then every other
+    project in Also Send To, each exported with its own registered engine.
+    Returns {'CANCELLED'} if the first target can't be exported to, other targets that can't are reported and skipped."""
+    panel_prefs = context.scene.exporter_configs
+    engine = panel_prefs.engine_configs_list
+    engine_configs = load_engine_configs()
+
+    if use_custom_dir:
+        custom_directory = bpy.path.abspath(panel_prefs.custom_directory)
+        if not os.path.isdir(custom_directory):
+            operator.report({'ERROR'}, 'Chosen Directory does not exist or is invalid!')
+            return {'CANCELLED'}
+
+        return [ExportTarget(None, engine, engine_configs[engine], custom_directory, publish=False)]
+
+    export_directory = construct_registered_project_export_directory(operator)
+    if export_directory == {'CANCELLED'}:
+        return export_directory
+
+    targets = [ExportTarget(panel_prefs.registered_projects, engine, engine_configs[engine], export_directory, publish=True)]
+
+    extra_projects = panel_prefs.extra_export_projects
+    for project, project_settings in get_registered_projects().items():
+        if project not in extra_projects or project == panel_prefs.registered_projects:
+            continue
+
+        project_engine = project_settings.get('engine')
+        if project_engine not in engine_configs:
+            operator.report({'WARNING'}, f"No engine config for {project}'s engine '{project_engine}', exporting it with {engine}'s")
+            project_engine = engine
+
+        project_directory = construct_registered_project_export_directory(operator, project)
+        if project_directory == {'CANCELLED'}:
+            operator.report({'WARNING'}, f"Skipped exporting to {project}")
+            continue
+
+        if any(target.directory == Path(project_directory) for target in targets):
+            continue
+
+        targets.append(ExportTarget(project, project_engine, engine_configs[project_engine], project_directory, publish=False))
+
+    return targets
+
+
+def construct_registered_project_export_directory(self, project=None):
+    blend_path = Path(bpy.path.abspath('//'))
+    wip = False
+    pathway = []
+
+    # Get the project's project_structure.json object to get its folder structure
+    structure_json = get_current_project_structure_json(project)
+    if not structure_json:
+        self.report({"ERROR"},
+                    "No project_structure.json found! Please use BitPipe to create one for your project!")
+        return {'CANCELLED'}
+
+    # First, add the parent folder where all assets in the project reside
+    pathway.append(structure_json['folderName'])
+
+    # Search the .blend Path for BitCake's folder structure
+    # Change _WIP folder to Art then construct the rest of the path
+    for part in blend_path.parts:
+
+        if wip is True:
+            split_part = part.split('_')
+            # If folder name starts with a number, remove it, otherwise join again.
+            if split_part[0].isnumeric():
+                split_part.pop(0)
+                pathway.append('_'.join(split_part))
+            else:
+                pathway.append('_'.join(split_part))
+
+        if part.__contains__('WIP'):
+            pathway.append('Art')
+            wip = True
+
+    # If no WIP folder found then fail
+    if wip is False:
+        self.report({"ERROR"},
+                    "The .blend path is not contained inside a proper BitCake Pipeline hierarchy, please make sure your hierarchy's root folder contains the word '_WIP' like in c:/BitTools/02_WIP/Environment")
+        return {'CANCELLED'}
+
+    # Construct final directory and return it
+    current_project_path = Path(get_current_project_assets_path(project))
+    constructed_directory = current_project_path.joinpath(*pathway) # Unpacks the list as arguments
+
+    return constructed_directory
+
+
+def load_engine_configs():
+    engine_configs_file = get_engine_configs_path()
+    with open(engine_configs_file, 'r') as configs_file:
+        return json.load(configs_file)
@@ -0,0 +1,83 @@
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from .export_cache import CACHE_FOLDER
+
+TIMINGS_FOLDER = 'timings'
+
+
+class ExportTimings:
+    """Records wall time, call count and object count of each stage of an export.
+
+    with timings.stage('FBX Export', objects=12):
+        ...
+
+    Stages can be entered many times (once per exported file, for instance), their numbers add up."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = {}
+        self.files = {}    # Exported filepath -> seconds spent writing it
+        self.counts = {}   # Other numbers worth keeping, like keyframes before and after reduction
+
+    @contextmanager
+    def stage(self, name, objects=0):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, 1, objects)
+
+    def add(self, name, seconds, calls=1, objects=0):
+        entry = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0, 'objects': 0})
+        entry['seconds'] += seconds
+        entry['calls'] += calls
+        entry['objects'] += objects
+
+    def add_file(self, filepath, seconds):
+        self.files[str(filepath)] = self.files.get(str(filepath), 0.0) + seconds
+
+    def count(self, name, value):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def merge(self, timings_json):
+        """Adds the numbers of another ExportTimings, as returned by to_json() (e.g. from a background worker)."""
+        for name, entry in timings_json.get('stages', {}).items():
+            self.add(name, entry['seconds'], entry['calls'], entry['objects'])
+        for filepath, seconds in timings_json.get('files', {}).items():
+            self.add_file(filepath, seconds)
+        for name, value in timings_json.get('counts', {}).items():
+            self.count(name, value)
+
+    def total(self):
+        return time.perf_counter() - self.start
+
+    def summary(self, count=3):
+        """Short text with the total time and the slowest stages, for the operator's INFO report."""
+        slowest = sorted(self.stages.items(), key=lambda item: item[1]['seconds'], reverse=True)[:count]
+        stages = ', '.join(f"{name} {entry['seconds']:.2f}s" for name, entry in slowest)
+        return f"{self.total():.2f}s ({stages})"
+
+    def to_json(self):
+        return {
+            'seconds': round(self.total(), 4),
+            'stages': {name: dict(entry, seconds=round(entry['seconds'], 4)) for name, entry in self.stages.items()},
+            'files': {filepath: round(seconds, 4) for filepath, seconds in self.files.items()},
+            'counts': self.counts,
+        }
+
+    def write(self, export_directory, blend_path):
+        """Writes the report to <export_directory>/.bittools/timings/<blend name>.json. Returns its path."""
+        timings_path = Path(export_directory) / CACHE_FOLDER / TIMINGS_FOLDER / (Path(blend_path).stem + '.json')
+        timings_path.parent.mkdir(parents=True, exist_ok=True)
+
+        timings_json = self.to_json()
+        timings_json['blend'] = str(blend_path)
+        timings_json['date'] = datetime.now().isoformat(timespec='seconds')
+
+        with open(timings_path, 'w') as timings_file:
+            json.dump(timings_json, timings_file, indent=4)
+
+        return timings_path
@@ -0,0 +1,171 @@
+import bpy
+import importlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from .export_timings import ExportTimings
+
+
+class BackgroundReport:
+    """Stands in for an Operator's self.report() when exporter functions run outside of an Operator."""
+
+    def __init__(self):
+        self.errors = []
+        self.messages = []
+        self.timings = ExportTimings()
+
+    def report(self, type, message):
+        if 'ERROR' in type:
+            self.errors.append(message)
+        else:
+            self.messages.append(message)
+
+        print(f"{'/'.join(sorted(type))}: {message}")
+
+
+def background_blender_command(blend_path, python_expr, args=()):
+    """Returns the command line to run python_expr inside a background Blender with blend_path loaded."""
+    return [
+        bpy.app.binary_path,
+        '--background', str(blend_path),
+        '--python-exit-code', '1',
+        '--python-expr', python_expr,
+        '--', *[str(arg) for arg in args],
+    ]
+
+
+def save_temp_blend_copy(prefix='bittools_'):
+    """Saves a copy of the current file, as it is in memory right now, in a new temp folder. Returns (folder, blend path)."""
+    temp_dir = Path(tempfile.mkdtemp(prefix=prefix))
+    blend_path = temp_dir / Path(bpy.data.filepath).name
+
+    bpy.ops.wm.save_as_mainfile(filepath=str(blend_path), copy=True)
+
+    return temp_dir, blend_path
+
+
+class BackgroundJobs:
+    """Splits jobs (json serializable dicts) across worker_count background Blender processes without waiting for them.
+    Each process loads blend_path and calls module_name.function_name([job]) for each of its share of the jobs.
+
+    Call poll() to know how many jobs are done, cancel() to make the workers stop after their current job and
+    results() to wait for them and get one result dict per job, in the same order as jobs."""
+
+    def __init__(self, blend_path, module_name, function_name, jobs, worker_count):
+        self.blend_path = blend_path
+        self.module_name = module_name
+        self.function_name = function_name
+        self.jobs = jobs
+        self.worker_count = worker_count
+        self.temp_dir = None
+        self.workers = []
+
+    def start(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='bittools_jobs_'))
+        cancel_path = self.temp_dir / 'cancel'
+        python_expr = f"import importlib; importlib.import_module('{__name__}').worker_main('{self.module_name}', '{self.function_name}')"
+
+        for worker_index in range(self.worker_count):
+            job_indices = list(range(worker_index, len(self.jobs), self.worker_count))
+            if not job_indices:
+                continue
+
+            jobs_path = self.temp_dir / f'jobs_{worker_index}.json'
+            results_path = self.temp_dir / f'results_{worker_index}.json'
+            log_path = self.temp_dir / f'worker_{worker_index}.log'
+
+            with open(jobs_path, 'w') as jobs_file:
+                json.dump([self.jobs[i] for i in job_indices], jobs_file)
+
+            command = background_blender_command(self.blend_path, python_expr, (jobs_path, results_path, cancel_path))
+            log_file = open(log_path, 'w')
+            process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+            self.workers.append((process, log_file, log_path, results_path, job_indices))
+
+        return self
+
+    def poll(self):
+        """Returns (jobs done, True if every worker has exited)."""
+        done = 0
+        running = False
+        for process, log_file, log_path, results_path, job_indices in self.workers:
+            if process.poll() is None:
+                running = True
+            done += len(read_worker_results(results_path))
+
+        return done, not running
+
+    def cancel(self):
+        (self.temp_dir / 'cancel').touch()
+
+    def results(self):
+        results = [None] * len(self.jobs)
+        cancelled = (self.temp_dir / 'cancel').exists()
+
+        for process, log_file, log_path, results_path, job_indices in self.workers:
+            return_code = process.wait()
+            log_file.close()
+
+            worker_results = read_worker_results(results_path)
+
+            for position, job_index in enumerate(job_indices):
+                if position < len(worker_results):
+                    results[job_index] = worker_results[position]
+                    continue
+
+                if cancelled and return_code == 0:
+                    results[job_index] = {'finished': False, 'cancelled': True, 'errors': []}
+                    continue
+
+                # Worker died before getting to this job, keep the end of its log so we know why
+                log_tail = log_path.read_text(errors='replace').strip().splitlines()[-5:]
+                results[job_index] = {
+                    'finished': False,
+                    'errors': [f"Background export worker exited with code {return_code}: {' | '.join(log_tail)}"],
+                }
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+        return results
+
+
+def run_background_jobs(blend_path, module_name, function_name, jobs, worker_count):
+    """Runs jobs across worker_count background Blender processes and waits for them, see BackgroundJobs.
+    Returns one result dict per job, in the same order as jobs."""
+    return BackgroundJobs(blend_path, module_name, function_name, jobs, worker_count).start().results()
+
+
+def read_worker_results(results_path):
+    try:
+        with open(results_path, 'r') as results_file:
+            return json.load(results_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def worker_main(module_name, function_name):
+    """Runs inside the background Blender processes started by BackgroundJobs."""
+    argv = sys.argv[sys.argv.index('--') + 1:]
+    jobs_path, results_path, cancel_path = Path(argv[0]), Path(argv[1]), Path(argv[2])
+
+    with open(jobs_path, 'r') as jobs_file:
+        jobs = json.load(jobs_file)
+
+    function = getattr(importlib.import_module(module_name), function_name)
+
+    # Results are written after every job so the main Blender can show progress
+    results = []
+    for job in jobs:
+        if cancel_path.exists():
+            break
+
+        results += function([job])
+
+        partial_path = results_path.with_suffix('.partial')
+        with open(partial_path, 'w') as results_file:
+            json.dump(results, results_file)
+        os.replace(partial_path, results_path)
@@ -2,11 +2,25 @@ import shutil
 import bpy
 import os
 import json
+import time
 from bpy.types import Operator
 from bpy.props import BoolProperty, StringProperty
 from pathlib import Path
-from ..helpers import get_anim_configs_file_path, get_current_engine, get_object_prefixes, get_published_path, select_and_make_active, get_engine_configs_path, get_current_project_assets_path, get_current_project_structure_json, get_collider_prefixes, select_object_hierarchy, select_object_hierarchy_additive, name_prefix
-from ..collider_tools.collider_tools import toggle_all_colliders_visibility, get_all_colliders
+from ..helpers import get_addon_prefs, get_anim_configs_file_path, get_current_engine, get_published_path, select_object_hierarchy, select_object_hierarchy_additive
+from ..naming_rules import NamingRules
+from .action_relevance import ActionRelevance
+from .adaptive_sampling import adaptive_bake_step
+from .export_backup import backup_blend_file
+from .change_tracking import change_tracker
+from .export_cache import ExportCache
+from .export_selection import resolve_export_objects
+from .export_session import CollectionPaths, ExportSession, MaterialImageNodes, solo_staged_action
+from .export_targets import resolve_export_targets
+from .export_timings import ExportTimings
+from .keyframe_reduction import get_tolerances, reduce_fbx_keyframes
+from .publisher import Publisher
+from .texture_processing import TextureStage
+from .export_workers import BackgroundJobs, BackgroundReport, save_temp_blend_copy
 
 
 class BITCAKE_OT_universal_exporter(Operator):
@@ -16,6 +30,7 @@ class BITCAKE_OT_universal_exporter(Operator):
     bl_options = {'INTERNAL', 'UNDO'}
 
     is_batch: BoolProperty(name='Batch Export', default=False)
+    animation_only: BoolProperty(name='Animations Only', description="Export only the armatures, one file per action", default=False)
     use_custom_dir: BoolProperty(name='Send to Engine', default=False)
     directory: StringProperty(subtype='DIR_PATH')
 
@@ -32,412 +47,518 @@ class BITCAKE_OT_universal_exporter(Operator):
         return self.execute(context)
 
     def execute(self, context):
-        panel_prefs = context.scene.exporter_configs
-        original_context = context.mode
-
-        # If started from Pose mode, let's put in Object so the Operator works then later on, let's revert it.
-        if original_context == 'POSE' and context.object is not None:
-            bpy.ops.object.mode_set(mode='OBJECT', toggle=False)
-
-        # Get List of objects to export according to export type (Selected, Collection, All)
-        objects_list = make_objects_list(context)
-
-        # Filter List, removing unwanted objects
-        objects_list = filter_object_list(objects_list)
-
-        # Verify if there are actual objects to export...
-        if len(objects_list) == 0:
-            self.report({'ERROR'}, 'No objects to export. Check if Active Object is part of an Ignored Collection')
+        export = UniversalExport(self, context)
+        if export.prepare() == {'CANCELLED'}:
             return {'CANCELLED'}
 
-        # If file has never been saved...
-        if not bpy.data.is_saved:
-            self.report({'ERROR'}, 'This file has never been saved, please save this file in an appropriate WIP folder.')
-            return {'CANCELLED'}
-
-        # Setup Export Directory, if any error occur during path setup, stop!
-        if panel_prefs.custom_directory == '':
-             panel_prefs.custom_directory = self.directory
-        if self.use_custom_dir:
-            custom_directory = bpy.path.abspath(panel_prefs.custom_directory)
-            if os.path.isdir(custom_directory):
-                export_directory = Path(custom_directory)
-            else:
-                self.report({'ERROR'}, 'Chosen Directory does not exist or is invalid!')
-                return {'CANCELLED'}
-        else:
-            export_directory = construct_registered_project_export_directory(self)
-            if export_directory == {'CANCELLED'}:
-                return export_directory
-
-        original_path = Path(bpy.data.filepath)
-        # Get current filename, append _backup and save as new file
-        backup_filename = original_path.stem + '_backup'
-        backup_path = original_path.with_stem(backup_filename)
-        # Create a backup and then Save file before messing around!
-        bpy.ops.wm.save_mainfile(filepath=str(backup_path))
-        bpy.ops.wm.save_mainfile(filepath=str(original_path))
-
-        # Perform Animation Cleanup
-        actions_cleanup(context)
-
-        # Active Object can be None, so let's fix that.
-        if context.active_object is None:
-            context.view_layer.objects.active = context.selected_objects[0]
-
-        # Init dict in case we'll need to revert Original Transforms.
-        # It's important that 'active_object' is the first key.
-        obj_original_info_dict = {'active_object': context.active_object,}
-
-        for obj in objects_list:
-            # Add some base obj information before anything else
-            obj_original_info_dict[obj] = {
-                'name': obj.name,
-                'location': obj.location.copy(),
-                'rotation_euler': obj.rotation_euler.copy(),
-                'scale': obj.scale.copy(),
-            }
-
-        collider_prefixes = get_collider_prefixes()
-
-        for obj in objects_list:
-            # First let's clean all the unused materials from this object
-            if obj.type != 'EMPTY':
-                if obj.material_slots:
-                    overriden_context = {'active_object': obj}
-                    with bpy.context.temp_override(active_object = overriden_context):
-                        print(overriden_context)
-                        try:
-                            bpy.ops.object.material_slot_remove_unused()
-                        except RuntimeError:
-                            pass
-                else:
-                    print(f"obj '{obj.name}' has no material slots")
-
-            # Let's save all object's materials to return them back later
-            if obj.type == 'MESH':
-                obj_original_info_dict[obj]['materials'] = obj.data.materials.items().copy()
-
-            select_and_make_active(context, obj)
+        # With a UI, batch exports write one file per timer tick so Blender keeps drawing and Esc can cancel them.
+        # Headless runs (see cli.py) and single file exports are written right away.
+        if export.jobs and not bpy.app.background:
+            self.export = export
+            start_export_progress(context, len(export.jobs))
+            self.timer = context.window_manager.event_timer_add(0.05, window=context.window)
+            context.window_manager.modal_handler_add(self)
+            return {'RUNNING_MODAL'}
 
-            # Save original name and rename current object according to rules
-            rename_with_prefix(self, context, obj, obj_original_info_dict)
-            rename_if_lod(obj)
+        try:
+            export.export_all()
+        finally:
+            export.finish()
 
-            # Use the collider tags to check if object is a collider, and remove its materials
-            if name_prefix(obj.name) in collider_prefixes:
-                unlink_materials(obj)
+        return {'FINISHED'}
 
-            # Create the json object if object has animation events
-            markers_json = construct_animation_configs_json(self, context, obj)
+    def modal(self, context, event):
+        export = self.export
 
-            # Only move root objects to 0,0,0 to avoid errors with Custom Pivots.
-            if panel_prefs.origin_transform and obj.parent is None:
-                obj.location = 0, 0, 0
+        if event.type == 'ESC' and event.value == 'PRESS' and not export.cancelled:
+            export.cancel()
 
-            # Deal with linked objects (multi user)
-            if obj.data is not None and obj.data.users > 1:
-                obj_original_info_dict[obj]['linked_mesh'] = obj.data.original
-                bpy.ops.object.make_single_user(object=True, obdata=True, material=False, animation=False, obdata_animation=True)
+        # Let the viewport be navigated, but nothing else can touch the scene while its staged copies are in use
+        if event.type in NAVIGATION_EVENTS:
+            return {'PASS_THROUGH'}
 
-            if panel_prefs.apply_transform:
-                if not [armature for armature in obj.modifiers if armature.type == 'ARMATURE'] and obj.data:
-                    selected_child_colliders = []
-                    for child in bpy.context.selected_objects:
-                        if name_prefix(child.name) in collider_prefixes:
-                            selected_child_colliders.append(child)
-                            child.select_set(False)
+        if event.type != 'TIMER':
+            return {'RUNNING_MODAL'}
 
-                    original_data_name = obj.data.name
-                    original_data = obj.data.copy()
-                    obj_original_info_dict[obj]['original_data_name'] = original_data_name
-                    obj_original_info_dict[obj]['original_data'] = original_data
-                    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True, properties=True)
+        try:
+            done = export.export_next()
+            update_export_progress(context, *export.progress(), export.cancelled)
+        except Exception as err:
+            self.report({'ERROR'}, f"Export failed: {err}")
+            done = True
 
-                    for child in selected_child_colliders:
-                        child.select_set(True)
+        if not done:
+            return {'RUNNING_MODAL'}
 
+        # Whatever failed above, the staged copies must go and the user's objects get their names back
+        try:
+            context.window_manager.event_timer_remove(self.timer)
+            end_export_progress(context)
+        finally:
+            export.finish()
+
+        return {'CANCELLED'} if export.cancelled else {'FINISHED'}
+
+
+NAVIGATION_EVENTS = {
+    'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE', 'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE',
+    'TRACKPADPAN', 'TRACKPADZOOM', 'MOUSEROTATE', 'MOUSESMARTZOOM',
+}
+
+
+class UniversalExport:
+    """One run of the Universal Exporter. prepare() collects and stages everything, then the files are written either
+    all at once by export_all() or one per export_next() call (see the operator's modal), and finish() cleans up.
+
+    operator is the Operator, or anything with the same properties and a report() method (see cli.py)."""
+
+    def __init__(self, operator, context):
+        self.operator = operator
+        self.context = context
+
+        # Where export time goes, written next to the exported files (see export_timings.py)
+        self.timings = operator.timings = ExportTimings()
+
+        self.session = None
+        self.targets = []           # Projects (and engines) the files are written for, see export_targets.py
+        self.publisher = operator.publisher = Publisher()
+        self.jobs = None            # Batch export jobs, None on single file exports
+        self.batch_jobs = []        # Every batch job, including the ones already up to date
+        self.job_roots = {}         # Batch job root name -> source object
+        self.results = []           # One result per finished job
+        self.worker_count = 0
+        self.background_jobs = None
+        self.workers_start = 0
+        self.worker_temp_dir = None
+        self.done = 0
+        self.exported_files = []
+        self.cancelled = False
+
+    def prepare(self):
+        operator = self.operator
+        context = self.context
+        timings = self.timings
+        panel_prefs = context.scene.exporter_configs
+        self.original_context = context.mode
 
-        # Only Select objects inside the list before exporting
-        toggle_all_colliders_visibility(True)
+        # If started from Pose mode, let's put in Object so the Operator works then later on, let's revert it.
+        if self.original_context == 'POSE' and context.object is not None:
+            bpy.ops.object.mode_set(mode='OBJECT', toggle=False)
 
-        # Process all types of paths then export accordingly
-        if self.is_batch:
-            batch_process_objs_paths_and_export(self, context, objects_list, export_directory, markers_json)
-        else:
-            process_objs_paths_and_export(self, obj_original_info_dict, objects_list, export_directory, markers_json)
+        with timings.stage('Collect Objects'):
+            # Get List of objects to export according to export type (Selected, Collection, All, Changed), filtered
+            objects_list = resolve_export_objects(context)
 
-        # If only apply transform was selected, end Operation
-        if panel_prefs.apply_transform and not panel_prefs.origin_transform:
-            # Re-hide all colliders for good measure
-            toggle_all_colliders_visibility(False)
-            # Save! :D
-            bpy.ops.wm.save_mainfile(filepath=str(original_path))
+        # Verify if there are actual objects to export...
+        if len(objects_list) == 0 and panel_prefs.export_selection_types == 'CHANGED':
+            operator.report({'INFO'}, 'Nothing changed since the last export')
+            return {'CANCELLED'}
+        if len(objects_list) == 0:
+            operator.report({'ERROR'}, 'No objects to export. Check if Active Object is part of an Ignored Collection')
+            return {'CANCELLED'}
 
-            return {'FINISHED'}
+        # Work out every exported name up front, so clashing names stop the export before anything is written
+        with timings.stage('Naming', objects=len(objects_list)):
+            naming_rules = NamingRules(context)
+            export_names = naming_rules.export_names(objects_list)
+            colliders = naming_rules.colliders(export_names)
+            name_conflicts = naming_rules.name_conflicts(export_names)
 
-        # Return things to original state
-        for index, obj in enumerate(obj_original_info_dict):
-            # We skip the first item in the dictionary, which was the current active object.
-            if index == 0:
-                continue
+        if name_conflicts:
+            operator.report({'ERROR'}, 'Export names clash, please rename these objects:\n' + '\n'.join(name_conflicts))
+            return {'CANCELLED'}
 
-            saved_props = obj_original_info_dict[obj]
+        # Animations Only exports write each exported armature's actions to files of their own, without any meshes
+        armatures = []
+        if operator.animation_only:
+            if not panel_prefs.animation_export:
+                operator.report({'ERROR'}, 'Animations Only exports need Animations Export turned on')
+                return {'CANCELLED'}
 
-            if 'name' in saved_props:
-                obj.name = saved_props['name']
-            if 'location' in saved_props:
-                obj.location = saved_props['location']
-            if 'rotation_euler' in saved_props:
-                obj.rotation_euler = saved_props['rotation_euler']
-            if 'scale' in saved_props:
-                obj.scale = saved_props['scale']
+            armatures = [obj for obj in export_names if obj.type == 'ARMATURE']
+            if not armatures:
+                operator.report({'ERROR'}, 'No armatures to export animations from')
+                return {'CANCELLED'}
 
-            if 'original_data' in saved_props:
-                obj.data.name = obj.data.name + '_exported'
-                obj.data = saved_props['original_data']
-                obj.data.name = saved_props['original_data_name']
+        # If file has never been saved...
+        if not bpy.data.is_saved:
+            operator.report({'ERROR'}, 'This file has never been saved, please save this file in an appropriate WIP folder.')
+            return {'CANCELLED'}
 
-            if 'linked_mesh' in saved_props:
-                obj.data.user_remap(saved_props['linked_mesh'])
+        # Setup Export Directories, if any error occur during path setup, stop!
+        if panel_prefs.custom_directory == '':
+             panel_prefs.custom_directory = operator.directory
+        targets = resolve_export_targets(operator, context, operator.use_custom_dir)
+        if targets == {'CANCELLED'}:
+            return targets
+        self.targets = targets
+        self.export_directory = targets[0].directory
+        if len(targets) > 1:
+            operator.report({'INFO'}, 'Exporting to ' + ', '.join(f'{target.project} ({target.engine})' for target in targets))
+
+        # Changes made by the export itself (staging, renames...) must not count as changes to export next time
+        change_tracker.paused = True
+        try:
+            # The export never modifies the user's objects, so the file itself isn't saved.
+            # Unsaved changes still get a backup (compressed and rotated in the background) in case anything crashes.
+            with timings.stage('Backup'):
+                backup_blend_file(get_addon_prefs().backup_count)
+
+            # Perform Animation Cleanup
+            with timings.stage('Actions Cleanup'):
+                actions_cleanup(context)
+
+            # Each file only bakes the actions that belong to its own objects
+            action_relevance = None
+            if panel_prefs.animation_export:
+                with timings.stage('Action Relevance'):
+                    action_relevance = ActionRelevance()
+
+            # Fingerprint everything before we start renaming and applying transforms,
+            # so hierarchies that didn't change since the last export can be skipped.
+            # Objects are only fingerprinted once, each target's cache adds its own export settings to the fingerprints.
+            fingerprints = {}
+            if panel_prefs.use_export_cache:
+                with timings.stage('Fingerprint', objects=len(objects_list)):
+                    for target in targets:
+                        target.export_cache = ExportCache(context, target.directory, target.engine_configs)
+                    if operator.animation_only:
+                        fingerprints = fingerprint_animations(context, targets[0].export_cache, armatures, action_relevance)
+                    else:
+                        fingerprints = fingerprint_objects(context, targets[0].export_cache, objects_list, operator.is_batch, action_relevance)
+        except BaseException:
+            # Nothing was staged yet, there's only change tracking to put back
+            change_tracker.paused = False
+            raise
 
-            if 'materials' in saved_props:
-                relink_materials(obj, saved_props['materials'])
+        # Active Object can be None, so let's fix that.
+        if context.active_object is None:
+            context.view_layer.objects.active = objects_list[0]
+        self.active_object = context.active_object
+
+        # Everything is exported from temporary copies, the user's objects are never touched.
+        self.session = session = ExportSession(operator, context)
+        try:
+            with timings.stage('Staging', objects=len(export_names)):
+                if operator.animation_only:
+                    session.stage(armatures, export_names, colliders, hierarchies=False)
+                else:
+                    session.stage(objects_list, export_names, colliders)
+                if action_relevance:
+                    session.stage_actions(action_relevance, panel_prefs.export_nla_strips)
+            operator.image_nodes = session.image_nodes
+
+            # Create the json object if object has animation events, one per exported armature
+            with timings.stage('Markers Json', objects=len(objects_list)):
+                markers_jsons = {}
+                for source, staged in session.staged_objects.items():
+                    actions = action_relevance.actions_for(source) if action_relevance else None
+                    markers_json = construct_animation_configs_json(operator, context, staged, actions)
+                    if markers_json is not None:
+                        markers_jsons[source] = markers_json
+                markers_json = hierarchy_markers_json(markers_jsons, [self.active_object, *objects_list])
+
+            if operator.animation_only:
+                with timings.stage('Animation Paths', objects=len(armatures)):
+                    batch_jobs = []
+                    for index, target in enumerate(targets):
+                        batch_jobs += make_animation_export_jobs(context, session, armatures, target, index, action_relevance, markers_jsons, fingerprints)
+                self.jobs = [job for job in batch_jobs if not job['up_to_date']]
+                self.worker_count = min(get_addon_prefs().export_workers, len(self.jobs))
+            elif operator.is_batch:
+                with timings.stage('Batch Paths', objects=len(objects_list)):
+                    batch_jobs = []
+                    for index, target in enumerate(targets):
+                        batch_jobs += make_batch_export_jobs(operator, context, session, objects_list, target, index, markers_jsons, fingerprints)
+                self.jobs = [job for job in batch_jobs if not job['up_to_date']]
+                # Same roots make_batch_export_jobs() writes a file for
+                objects_set = set(objects_list)
+                self.job_roots = {session.staged_name(obj): obj for obj in objects_list if not obj_ancestor_in_objects_set(objects_set, obj)}
+                self.worker_count = min(get_addon_prefs().export_workers, len(self.jobs))
+
+            # Textures are read now and written by a thread pool while the files are exported
+            if panel_prefs.process_textures and not operator.animation_only:
+                with timings.stage('Texture Read'):
+                    for target in targets:
+                        target.texture_stage = TextureStage(target.directory, target.engine_configs, target.outputs)
+                    if operator.is_batch:
+                        for job in batch_jobs:
+                            root = bpy.data.objects[job['root']]
+                            nodes = session.image_nodes.of_objects([root, *root.children_recursive])
+                            targets[job['target']].texture_stage.add([node.image for node in nodes], Path(job['filepath']).parent)
+                    else:
+                        nodes = session.image_nodes.of_objects(session.staged_objects.values())
+                        for target in targets:
+                            target.texture_stage.add([node.image for node in nodes], target.directory)
+                    for target in targets:
+                        target.texture_stage.start(operator)
+
+        except BaseException:
+            session.free()
+            change_tracker.paused = False
+            raise
+
+        self.objects_list = objects_list
+        self.markers_json = markers_json
+        self.fingerprints = fingerprints
+        self.batch_jobs = batch_jobs if operator.is_batch or operator.animation_only else []
 
-        # Deletes all data created in the process that has no users to clean the file
-        bpy.ops.outliner.orphans_purge()
+        return {'FINISHED'}
 
-        # Re-hide all colliders for good measure
-        toggle_all_colliders_visibility(False)
+    def export_all(self):
+        """Writes every file right away."""
+        if self.jobs is None:
+            for target in self.targets:
+                self.exported_files += process_objs_paths_and_export(self.operator, self.session, self.active_object, self.objects_list, target, self.markers_json, self.fingerprints)
+        elif self.worker_count > 1:
+            self.start_workers()
+            self.collect_worker_results()
+        else:
+            while not self.export_next():
+                pass
+
+    def export_next(self):
+        """Exports the next batch job, or checks on the background workers. Returns True when there's nothing left to do."""
+        if self.worker_count > 1:
+            if self.background_jobs is None:
+                self.start_workers()
+                return False
+
+            self.done, exited = self.background_jobs.poll()
+            if exited:
+                self.collect_worker_results()
+            return exited
+
+        if self.cancelled or len(self.results) >= len(self.jobs):
+            return True
+
+        export_job(self.operator, self.jobs[len(self.results)])
+        self.results.append({'finished': True, 'errors': []})
+        self.done = len(self.results)
+
+        return len(self.results) >= len(self.jobs)
+
+    def start_workers(self):
+        # Workers load a copy of the scene exactly as it was staged for export (renamed, transforms applied)
+        with self.timings.stage('Worker Blend Copy'):
+            self.worker_temp_dir, blend_path = save_temp_blend_copy()
+
+        self.workers_start = time.perf_counter()
+        self.background_jobs = BackgroundJobs(blend_path, __name__, 'export_jobs_in_worker', self.jobs, self.worker_count).start()
+
+    def collect_worker_results(self):
+        self.results = self.background_jobs.results()
+        self.timings.add('Background Workers', time.perf_counter() - self.workers_start, objects=len(self.jobs))
+        shutil.rmtree(self.worker_temp_dir, ignore_errors=True)
+
+        for result in self.results:
+            for error in result['errors']:
+                self.operator.report({'ERROR'}, error)
+            # Worker stages ran in parallel, so they add up to more than the Background Workers wall time
+            self.timings.merge(result.get('timings', {}))
+
+        self.done = len([result for result in self.results if result['finished']])
+
+    def exported_roots(self):
+        """Root objects whose files were exported or were already up to date."""
+        # Animations Only exports leave the meshes out, so nothing counts as exported
+        if self.operator.animation_only:
+            return []
+        if self.jobs is None:
+            return [obj for obj in self.objects_list if obj.parent is None]
+
+        finished = {job['filepath'] for job, result in zip(self.jobs, self.results) if result['finished']}
+        return [self.job_roots[job['root']] for job in self.batch_jobs if job['up_to_date'] or job['filepath'] in finished]
+
+    def file_reports(self):
+        """Status (EXPORTED, UP_TO_DATE, FAILED or CANCELLED) and FBX write time of every file of the export."""
+        # Files are timed while they're written to their pending paths
+        final_paths = {str(pending): str(final) for target in self.targets for final, pending in target.outputs.pending.items()}
+        seconds = {final_paths.get(path, path): round(elapsed, 4) for path, elapsed in self.timings.files.items()}
+
+        if self.jobs is None:
+            return [{'filepath': path, 'status': 'EXPORTED', 'seconds': seconds.get(path)} for path in self.exported_files]
+
+        results = {job['filepath']: result for job, result in zip(self.jobs, self.results)}
+        reports = []
+        for job in self.batch_jobs:
+            result = results.get(job['filepath'])
+            if job['up_to_date']:
+                status = 'UP_TO_DATE'
+            elif result is None:
+                status = 'CANCELLED'
+            else:
+                status = 'EXPORTED' if result['finished'] else 'FAILED'
+            reports.append({'filepath': job['filepath'], 'status': status, 'seconds': seconds.get(job['filepath'])})
+
+        return reports
+
+    def cancel(self):
+        """Stops the export after the file(s) currently being written."""
+        self.cancelled = True
+        if self.background_jobs:
+            self.background_jobs.cancel()
+
+    def progress(self):
+        """Returns (files done, files to export)."""
+        return self.done, len(self.jobs or [])
+
+    def finish(self):
+        """Puts the written files into place and cleans up. The scene is always put back the way it was, even when
+        files can't be committed (an engine holding one open, for instance)."""
+        try:
+            self.commit_outputs()
+        finally:
+            self.restore_scene()
+
+        timings = self.timings
+        timings.write(self.export_directory, bpy.data.filepath)
+
+        skipped = sum(target.export_cache.skipped for target in self.targets if target.export_cache)
+        if self.cancelled:
+            self.operator.report({'WARNING'}, f"Export Cancelled! {len(self.exported_files)}/{len(self.jobs)} file(s) were exported.")
+        elif skipped:
+            self.operator.report({'INFO'}, f"Export Complete in {timings.summary()}! {skipped} unchanged file(s) skipped.")
+        else:
+            self.operator.report({'INFO'}, f"Export Complete in {timings.summary()}!")
+
+    def commit_outputs(self):
+        operator = self.operator
+        timings = self.timings
+
+        if self.jobs is not None:
+            for job, result in zip(self.jobs, self.results):
+                if result['finished']:
+                    target = self.targets[job['target']]
+                    target.outputs.done(job['filepath'])
+                    if target.export_cache:
+                        target.export_cache.update(job['filepath'], job['fingerprint'])
+
+            self.exported_files = [job['filepath'] for job, result in zip(self.jobs, self.results) if result['finished']]
+
+            if self.worker_count > 1:
+                operator.report({'INFO'}, f"{len(self.exported_files)}/{len(self.jobs)} file(s) exported by {self.worker_count} background workers")
+
+        for target in self.targets:
+            if target.texture_stage:
+                with timings.stage('Texture Write'):
+                    target.texture_stage.finish(operator)
+
+        with timings.stage('Publish Wait'):
+            report_publish_results(operator, self.publisher)
+
+        # Keep track of every file's status so headless runs can list it (see cli.py), before pending paths are committed
+        operator.file_reports = self.file_reports()
+
+        # Everything goes into place at once, so engines reimport a single batch of complete files
+        changed, unchanged = [], 0
+        with timings.stage('Commit Files'):
+            for target in self.targets:
+                target_changed, target_unchanged, target_failed = target.outputs.commit(bpy.data.filepath)
+                changed += target_changed
+                unchanged += target_unchanged
+                for final_path, err in target_failed:
+                    operator.report({'ERROR'}, f"Couldn't replace '{final_path}': {err}")
+                    # It's exported again next time instead of being skipped as up to date
+                    if target.export_cache:
+                        target.export_cache.forget(final_path)
+        if changed or unchanged:
+            operator.report({'INFO'}, f"{len(changed)} file(s) updated, {unchanged} identical file(s) left untouched")
+
+        fixed_samples = timings.counts.get('Bake Samples (Fixed Step)')
+        if fixed_samples:
+            adaptive_samples = timings.counts['Bake Samples (Adaptive Step)']
+            operator.report({'INFO'}, f"Adaptive sampling: {adaptive_samples} of {fixed_samples} animation samples baked")
+
+        keys_baked = timings.counts.get('Keys Baked')
+        if keys_baked:
+            keys_exported = timings.counts['Keys Exported']
+            operator.report({'INFO'}, f"Keyframe reduction: {keys_baked} baked keys down to {keys_exported} ({keys_exported / keys_baked:.0%})")
+
+        with timings.stage('Cache Save'):
+            for target in self.targets:
+                if target.export_cache:
+                    target.export_cache.save()
+
+    def restore_scene(self):
+        context = self.context
+
+        # Deletes everything that was created for the export and puts back names and selection
+        try:
+            with self.timings.stage('Free Staged Data', objects=len(self.session.staged_objects)):
+                self.session.free()
+
+            # Let the depsgraph see what the export did while changes aren't tracked
+            context.view_layer.update()
+        finally:
+            change_tracker.paused = False
+
+        # Forget about what was exported
+        change_tracker.mark_exported(context.scene, self.exported_roots())
+
+        # Keep track of what was written so headless runs can list it (see cli.py)
+        self.operator.exported_files = self.exported_files
 
         # Go back to Pose Mode if that's what it was
-        if original_context == 'POSE':
-            bpy.context.view_layer.objects.active = obj_original_info_dict['active_object']
+        if self.original_context == 'POSE':
+            bpy.context.view_layer.objects.active = self.active_object
             bpy.ops.object.mode_set(mode='POSE', toggle=False)
 
-        # Save! :D
-        bpy.ops.wm.save_mainfile(filepath=str(original_path))
 
-        self.report({'INFO'}, "Export Complete!")
+def report_publish_results(self, publisher):
+    """Waits for the publisher to finish and reports what it did."""
+    results = publisher.finish()
+    self.timings.add('Publish', publisher.seconds, calls=len(results))
 
-        return {'FINISHED'}
+    methods = {}
+    for result in results:
+        if result['error']:
+            self.report({'ERROR'}, f"Failed to publish '{result['path']}': {result['error']}")
+        else:
+            methods[result['method']] = methods.get(result['method'], 0) + 1
 
+    if methods:
+        published = ', '.join(f"{count} {method.lower()}" for method, count in sorted(methods.items()))
+        self.report({'INFO'}, f"Published {sum(methods.values())} file(s): {published}")
 
-def make_objects_list(context):
-    panel_prefs = bpy.context.scene.exporter_configs
-    objects_list = []
 
-    if panel_prefs.export_selection_types == 'SELECTED':
-        selected_objects = context.selected_objects
-        selected_objects = append_child_colliders(selected_objects)
-        objects_list = selected_objects
+def start_export_progress(context, total):
+    exporter_configs = context.scene.exporter_configs
+    exporter_configs.export_running = True
+    exporter_configs.export_progress = 0
+    exporter_configs.export_progress_text = f"Exporting 0/{total}"
+    context.window_manager.progress_begin(0, total)
 
-    elif panel_prefs.export_selection_types == 'COLLECTION':
-        change_active_collection(context)
-        collection_objects = context.active_object.users_collection[0].all_objects
-        collection_objects = append_child_colliders([obj for obj in collection_objects])
-        objects_list = collection_objects
 
+def update_export_progress(context, done, total, cancelling=False):
+    exporter_configs = context.scene.exporter_configs
+    exporter_configs.export_progress = 100 * done / max(total, 1)
+    if cancelling:
+        exporter_configs.export_progress_text = f"Cancelling after current file... {done}/{total}"
     else:
-        bpy.ops.object.select_all(action='DESELECT')
-        toggle_all_colliders_visibility(True)
-        bpy.ops.object.select_all()
-        objects_list = context.selected_objects
-
-    return objects_list
-
-def append_child_colliders(obj_list):
-    all_colliders = get_all_colliders()
-    for obj in obj_list:
-        for child in obj.children_recursive:
-            # If collider is already in the list, ignore it
-            if child in obj_list:
-                continue
-
-            if child in all_colliders:
-                # If object has collider, unhide it, select it, add it to list
-                child.hide_set(False)
-                child.hide_viewport = False
-                child.select_set(True)
-                obj_list.append(child)
-
-    return obj_list
-
-def change_active_collection(context=bpy.context):
-    active_collection = context.active_object.users_collection[0].name
-    layer_collections = context.view_layer.layer_collection.children
-
-    for i in layer_collections:
-        if i.name == active_collection:
-            context.view_layer.active_layer_collection = i
-
-    return
-
-
-def filter_object_list(object_list):
-    '''Removes all objects that are:
-    - Inside an Ignored Collection or are Linked inside one'''
-
-    panel_prefs = bpy.context.scene.exporter_configs
-    sm = panel_prefs.static_mesh_export
-    sk = panel_prefs.skeletal_mesh_export
-    cam = panel_prefs.camera_export
-
-    list_copy = object_list.copy()
-
-    for obj in list_copy:
-        for col in obj.users_collection:
-            if col.get('Ignore'):
-                object_list.remove(obj)
-        if sm is False and obj.type == 'MESH':
-            object_list.remove(obj)
-        if sk is False and obj.type == 'ARMATURE':
-            object_list.remove(obj)
-        if cam is False and obj.type == 'CAMERA':
-            object_list.remove(obj)
-
-    return object_list
-
-
-def construct_registered_project_export_directory(self):
-    blend_path = Path(bpy.path.abspath('//'))
-    wip = False
-    pathway = []
-
-    # Get the current project's project_structure.json object to get its folder structure
-    structure_json = get_current_project_structure_json()
-    if not structure_json:
-        self.report({"ERROR"},
-                    "No project_structure.json found! Please use BitPipe to create one for your project!")
-        return {'CANCELLED'}
-
-    # First, add the parent folder where all assets in the project reside
-    pathway.append(structure_json['folderName'])
-
-    # Search the .blend Path for BitCake's folder structure
-    # Change _WIP folder to Art then construct the rest of the path
-    for part in blend_path.parts:
-
-        if wip is True:
-            split_part = part.split('_')
-            # If folder name starts with a number, remove it, otherwise join again.
-            if split_part[0].isnumeric():
-                split_part.pop(0)
-                pathway.append('_'.join(split_part))
-            else:
-                pathway.append('_'.join(split_part))
-
-        if part.__contains__('WIP'):
-            pathway.append('Art')
-            wip = True
-
-    # If no WIP folder found then fail
-    if wip is False:
-        self.report({"ERROR"},
-                    "The .blend path is not contained inside a proper BitCake Pipeline hierarchy, please make sure your hierarchy's root folder contains the word '_WIP' like in c:/BitTools/02_WIP/Environment")
-        return {'CANCELLED'}
-
-    # Construct final directory and return it
-    current_project_path = Path(get_current_project_assets_path())
-    constructed_directory = current_project_path.joinpath(*pathway) # Unpacks the list as arguments
-
-    return constructed_directory
-
-def rename_object(self, obj, target_name):
-    original_name = obj.name
-    obj.name = target_name
-    if obj.name != target_name:
-        self.report({"ERROR"}, f"Failed to rename object '{original_name}' to '{target_name}' for export")
-
-
-def rename_with_prefix(self, context, obj, obj_original_info_dict):
-    """Renames parent obj and all its children."""
-
-    if obj.parent:
-        return
-
-    panel_prefs = context.scene.exporter_configs
-    separator = panel_prefs.separator
-
-    prefix = get_correct_prefix(context, obj)
-    if not object_has_correct_prefix(context, prefix, obj):
-        rename_object(self, obj, f"{prefix}{separator}{obj.name}")
-
-    collider_prefixes = get_collider_prefixes()
-
-    collider_index = 0
-    for child in obj.children_recursive:
-        prefix = get_correct_prefix(context, child)
+        exporter_configs.export_progress_text = f"Exporting {done}/{total} (Esc to cancel)"
 
-        if not child in obj_original_info_dict:
-            obj_original_info_dict[child] = {'name': child.name}
+    context.window_manager.progress_update(done)
+    context.workspace.status_text_set(f"BitTools: {exporter_configs.export_progress_text}")
+    redraw_exporter_panels(context)
 
-        prefix_split = prefix.split(separator)
 
-        if prefix_split[0] in collider_prefixes:
-            if child.parent in obj_original_info_dict:
-                rename_object(self, child, f"{prefix}{separator}{obj_original_info_dict[child.parent]['name']}{separator}{str(collider_index).zfill(2)}")
-            else:
-                rename_object(self, child, f"{prefix}{separator}{obj_original_info_dict[obj]['name']}{separator}{str(collider_index).zfill(2)}")
-            collider_index += 1
-        else:
-            # Checks if object already has correct prefix in name
-            if not object_has_correct_prefix(context, prefix, child):
-                rename_object(self, child, f"{prefix}{separator}{child.name}")
-
-
-def rename_if_lod(obj):
-    """Renames obj if it's the LOD0."""
-
-    if obj.get('LOD') == 0:
-        obj.name = obj.name + '_LOD0'
+def end_export_progress(context):
+    exporter_configs = context.scene.exporter_configs
+    exporter_configs.export_running = False
+    exporter_configs.export_progress_text = ''
 
-    return
+    context.window_manager.progress_end()
+    context.workspace.status_text_set(None)
+    redraw_exporter_panels(context)
 
-def get_correct_prefix(context, obj):
-    panel_prefs = context.scene.exporter_configs
-    separator = panel_prefs.separator
-
-    # Create list of Collider Prefixes to use so that Colliders don't get renamed
-    collider_prefixes = get_collider_prefixes()
-
-    # Get user-defined object prefixes
-    object_prefixes = get_object_prefixes()
-
-    # If object is correctly named, return its prefix
-    split_name = obj.name.split(separator)
-    prefixes = collider_prefixes + object_prefixes
-    col_prefix = ['','']
-    for prefix in prefixes:
-        if split_name[0] == prefix:
-            col_prefix[0] = prefix
-        if len(split_name) > 1:
-            if split_name[1] == prefix:
-                col_prefix[1] = prefix
-    if col_prefix[0]:
-        prefix = col_prefix[0]
-        if col_prefix[1]:
-            prefix = prefix + separator + col_prefix[1]
-        return prefix
-
-    # Return correct prefix for each case
-    # Check get_object_prefixes for each index, this is bad, should be a dict instead?
-    if obj.type == 'ARMATURE':
-        return object_prefixes[1]
-    if obj.type == 'CAMERA':
-        return object_prefixes[2]
-    else:
-        return object_prefixes[0]
 
-def object_has_correct_prefix(context, prefix, obj):
-    panel_prefs = context.scene.exporter_configs
-    separator = panel_prefs.separator
+def redraw_exporter_panels(context):
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
 
-    split_name = obj.name.split(separator)
-    if split_name[0] == prefix:
-        return True
-
-    return False
 
 def actions_cleanup(context):
     actions = context.blend_data.actions
@@ -449,11 +570,14 @@ def actions_cleanup(context):
         elif not action.use_fake_user:
             action.use_fake_user = True
 
-def construct_animation_configs_json(self, context, obj):
+def construct_animation_configs_json(self, context, obj, actions=None):
+    """Returns the animation markers json for armature obj, listing actions (every action in the file by default)."""
     if obj.type != 'ARMATURE':
         return
 
-    if bpy.data.actions.items() == []:
+    if actions is None:
+        actions = bpy.data.actions
+    if not actions:
         return
 
     markers_json = Path(get_anim_configs_file_path())
@@ -472,7 +596,7 @@ def construct_animation_configs_json(self, context, obj):
         markers_json['TimelineMarkers'].append(dictionary)
 
     markers_json['ActionsData'] = []
-    for action in bpy.data.actions:
+    for action in actions:
         action_marker = {"Name": action.name,
                          "Markers": [],
                          "StartEndFrames": [],
@@ -498,43 +622,24 @@ def construct_animation_configs_json(self, context, obj):
 
     return markers_json
 
-def unlink_materials(obj):
-    if obj.override_library is not None and obj.type != 'EMPTY':
-        obj.data.override_create(remap_local_usages=True)
-
-    try:
-        bpy.ops.object.material_slot_remove_unused()
-
-    except RuntimeError:
-        pass
-
-    finally:
-        for index, material in enumerate(obj.material_slots):
-            obj.material_slots[index].material = None
-
-    return
-
-def create_fake_materials(obj):
-    for index, material in enumerate(obj.material_slots):
-        mat = bpy.data.materials.new(name=f'{obj.name}_{material.name}_{index}')
-        obj.material_slots[index].material = mat
+def hierarchy_markers_json(markers_jsons, objects):
+    """Returns the markers json of the first armature found in objects' hierarchies, or None if they have none."""
+    for obj in objects:
+        for member in (obj, *obj.children_recursive):
+            if member in markers_jsons:
+                return markers_jsons[member]
 
-def relink_materials(obj, materials):
-    if materials == []:
-        return
-
-    for index, slot in enumerate(obj.material_slots):
-        if slot.material is None:
-            slot.material = materials[index][1]
+    return None
 
-    return
+def animation_markers_json_path(path):
+    path = path.with_stem(path.stem + '_configs')
+    return path.with_suffix('.json')
 
 def create_animation_markers_json_file(path, markers_json):
     if markers_json is None:
         return
 
-    path = path.with_stem(path.stem + '_configs')
-    path = path.with_suffix('.json')
+    path = animation_markers_json_path(path)
 
     with open(path, 'w') as json_file:
         json.dump(markers_json, json_file, indent=4)
@@ -550,58 +655,48 @@ def select_objects_in_list(objects_list):
 
     return
 
-def get_object_collection_hierarchy(context, parent_collection, collection_list=[]):
-
-    if parent_collection == context.scene.collection:
-        return []
-
-    parent = find_parent_collection(context, parent_collection)
-    get_object_collection_hierarchy(context, parent, collection_list)
-    collection_list.append(parent_collection)
-
-    return collection_list
-
+def get_collection_hierarchy_list_as_path(context, obj, collection_paths=None):
+    """Names of the collections from the scene's root down to obj's collection."""
+    if collection_paths is None:
+        collection_paths = CollectionPaths(context.scene)
 
-def find_parent_collection(context, collection):
-    data = bpy.data
+    return collection_paths.path(obj.users_collection[0])
 
-    # First get a list of ALL collections in the scene
-    collections = [c for c in data.collections if context.scene.user_of_id(c)]
-    # Then append the master collection because we need to stop this at some point.
-    collections.append(context.scene.collection)
+def has_animation(objects):
+    """True if the FBX exporter may bake animation for any of objects: armatures, animated objects or shape keys."""
+    for obj in objects:
+        if obj.type == 'ARMATURE' or obj.animation_data:
+            return True
+        shape_keys = getattr(obj.data, 'shape_keys', None)
+        if shape_keys and shape_keys.animation_data:
+            return True
 
-    coll = collection
-    collection = [c for c in collections if c.user_of_id(coll)]
-
-    return collection[0]
-
-def get_collection_hierarchy_list_as_path(context, obj):
-    parent_collection = obj.users_collection[0]
-    # Initializing an empty list otherwise it wouldn't reset properly
-    collection_hierarchy = []
-    collection_hierarchy = get_object_collection_hierarchy(context, parent_collection, collection_hierarchy)
-    collection_hierarchy = [c.name for c in collection_hierarchy]
-
-    return collection_hierarchy
+    return False
 
-def exporter(self, path):
+def exporter(self, path, configs):
+    """Writes the selected (staged) objects to an FBX file at path. configs is the engine's engine_configs.json entry."""
     panel_prefs = bpy.context.scene.exporter_configs
-    configs = get_engine_configs(panel_prefs)
 
-    export_nla = panel_prefs.export_nla_strips
+    timings = self.timings
 
-    # remember what textures each material uses
+    # remember what textures each material of the exported objects uses
     node_to_texture = {}
-    for material in bpy.data.materials:
-        if material and material.node_tree:
-            for node in material.node_tree.nodes:
-                if node.type == "TEX_IMAGE":
-                    node_to_texture[node] = node.image
-                    node.image = None
+    with timings.stage('Detach Textures'):
+        for node in self.image_nodes.of_objects(bpy.context.selected_objects):
+            node_to_texture[node] = node.image
+            node.image = None
+
+    # Bones that move smoothly enough don't need a key every anim_sampling frames, bake at the step they all allow
+    bake_step = configs['anim_sampling']
+    tolerance = configs.get('anim_position_tolerance')
+    if panel_prefs.animation_export and tolerance:
+        with timings.stage('Adaptive Sampling'):
+            bake_step = adaptive_bake_step(bpy.context, bpy.context.selected_objects, bake_step, tolerance, timings)
 
     # Export file
+    start = time.perf_counter()
     try:
-        teste = bpy.ops.export_scene.fbx(
+        bpy.ops.export_scene.fbx(
             filepath=str(path),
             apply_scale_options=configs['apply_scale'],
             use_space_transform=configs['space_transform'],
@@ -613,8 +708,10 @@ def exporter(self, path):
             primary_bone_axis=configs['primary_bone'],
             secondary_bone_axis=configs['secondary_bone'],
             bake_anim=panel_prefs.animation_export,
-            bake_anim_use_nla_strips=export_nla,
-            bake_anim_step=configs['anim_sampling'],
+            # Each object's own actions are staged as NLA strips (see ExportSession.stage_actions)
+            bake_anim_use_nla_strips=True,
+            bake_anim_use_all_actions=False,
+            bake_anim_step=bake_step,
             bake_anim_simplify_factor=configs['anim_simplify'],
             bake_anim_force_startend_keying=True,
             use_selection=True,
@@ -624,48 +721,79 @@ def exporter(self, path):
             axis_forward=configs['forward_axis'],
             axis_up=configs['up_axis'],
         )
-    except err:
+    except RuntimeError as err:
         self.report({"ERROR"}, f"error while exporting: '{err}'")
+    elapsed = time.perf_counter() - start
+    timings.add('FBX Export', elapsed, objects=len(bpy.context.selected_objects))
+    timings.add_file(path, elapsed)
+
+    # The exporter bakes a key every anim_sampling frames, keep only the ones needed to stay within the engine's tolerances
+    # Parsing the file again is only worth it when there's animation in it
+    tolerances = get_tolerances(configs)
+    if panel_prefs.animation_export and tolerances and has_animation(bpy.context.selected_objects):
+        with timings.stage('Keyframe Reduction'):
+            keys_before, keys_after = reduce_fbx_keyframes(path, tolerances)
+        timings.count('Keys Baked', keys_before)
+        timings.count('Keys Exported', keys_after)
 
     # restore all materials textures
-    for node in node_to_texture:
-        texture = node_to_texture[node]
-        if texture:
-            node.image = texture
-        else:
-            self.report({"ERROR"}, f"node '{node}' lost reference to its texture")
+    with timings.stage('Restore Textures'):
+        for node in node_to_texture:
+            texture = node_to_texture[node]
+            if texture:
+                node.image = texture
+            else:
+                self.report({"ERROR"}, f"node '{node}' lost reference to its texture")
 
     return
 
 
-def process_objs_paths_and_export(self, original_info_dict, objects_list, export_directory, markers_json):
-    panel_prefs = bpy.context.scene.exporter_configs
+def process_objs_paths_and_export(self, session, active_object, objects_list, target, markers_json, fingerprints={}):
+    export_cache = target.export_cache
 
-    select_objects_in_list(objects_list)
+    staged_list = [session.staged_objects[obj] for obj in objects_list]
+    select_objects_in_list(staged_list)
 
-    for object in objects_list:
+    for object in staged_list:
         select_object_hierarchy_additive(object)
 
-    # Create the filename based on this .blend name
-    filename = panel_prefs.non_batch_filename + '.fbx'
-    if filename == '':
-        filename = original_info_dict['active_object'].name + '.fbx'
+    filename = get_non_batch_filename(bpy.context, session.staged_name(active_object))
     # Constructs final path
-    constructed_path = export_directory.joinpath(filename)
-    # If folder doesn't exist, create it
-    constructed_path.parent.mkdir(parents=True, exist_ok=True)
+    constructed_path = target.directory.joinpath(filename)
+
+    published_dir = None
+    if target.publish:
+        published_dir = get_published_path().parent
+
+    # Nothing changed since this file was last exported, so there's nothing to write
+    fingerprint = fingerprints.get(None)
+    published_copies = [published_dir / filename] if published_dir else []
+    if export_cache and export_cache.is_up_to_date(constructed_path, fingerprint, *published_copies):
+        return []
+
+    # Files are written to a pending folder, and moved into place when the export is done (see export_outputs.py)
+    group = str(constructed_path)
+    unchanged = bool(export_cache) and export_cache.matches(constructed_path, fingerprint)
+    pending_path = target.outputs.stage(constructed_path, group, unchanged)
+    if markers_json is not None:
+        target.outputs.stage(animation_markers_json_path(constructed_path), group)
+
     # Pass the Json Dict and dump it to create the actual file in the directory
-    create_animation_markers_json_file(constructed_path, markers_json)
+    with self.timings.stage('Markers Json File'):
+        create_animation_markers_json_file(pending_path, markers_json)
     # Finally, export the file
-    exporter(self, constructed_path)
+    exporter(self, pending_path, target.engine_configs)
 
-    # Copy the created FBX to its published folder
-    if not self.use_custom_dir:
-        published_dir = get_published_path().parent
-        published_dir.mkdir(parents=True, exist_ok=True)
-        shutil.copy(constructed_path, published_dir)
+    # Copy the created FBX to its published folder, in the background
+    if published_dir:
+        self.publisher.publish(pending_path, target.outputs.stage(published_dir / filename, group, unchanged))
 
-    return
+    target.outputs.done(group)
+
+    if export_cache:
+        export_cache.update(constructed_path, fingerprint)
+
+    return [str(constructed_path)]
 
 def obj_ancestor_in_objects_set(objects_set, obj):
     result = False
@@ -677,94 +805,208 @@ def obj_ancestor_in_objects_set(objects_set, obj):
         obj = obj.parent
     return result
 
-def batch_process_objs_paths_and_export(self, context, objects_list, export_directory, markers_json):
-    """Process each object in the list, constructs each path, creates Animation Markers Json and Exports Files"""
-    panel_prefs = bpy.context.scene.exporter_configs
+def fingerprint_objects(context, export_cache, objects_list, is_batch, action_relevance=None):
+    """Returns a dict of export root -> fingerprint. Non-batch exports produce one file, keyed by None."""
+    if not is_batch:
+        return {None: export_cache.fingerprint(context, objects_list, action_relevance)}
 
     objects_set = {}
-
     for obj in objects_list:
         objects_set[obj] = True
 
+    fingerprints = {}
     for obj in objects_list:
         if obj_ancestor_in_objects_set(objects_set, obj):
             continue
+        fingerprints[obj] = export_cache.fingerprint(context, [obj], action_relevance)
+
+    return fingerprints
+
+def fingerprint_animations(context, export_cache, armatures, action_relevance):
+    """Returns a dict of (armature, action name) -> fingerprint for Animations Only exports."""
+    fingerprints = {}
+    for armature in armatures:
+        for action in action_relevance.actions_for(armature):
+            fingerprints[(armature, action.name)] = export_cache.animation_fingerprint(context, armature, action)
+
+    return fingerprints
+
+def get_batch_export_paths(context, obj, export_name, export_directory, publish, collection_paths=None):
+    """Returns the path of the file a batch export writes for root obj, and the folder it's published to (None if
+    it isn't published)."""
+    panel_prefs = context.scene.exporter_configs
+
+    if panel_prefs.collection_to_folder:
+        # Gets object Collection Hierarchy as a path in string list format
+        collection_hierarchy = get_collection_hierarchy_list_as_path(context, obj, collection_paths)
+        # Constructs the export Path without filename
+        constructed_path = export_directory.joinpath(*collection_hierarchy)
+    else:
+        constructed_path = export_directory
 
-        # Selects the object and all its hierachy
-        select_object_hierarchy(obj)
+    constructed_path = constructed_path.joinpath(export_name + '.fbx')
 
+    published_dir = None
+    if publish and get_published_path():
+        published_dir = get_published_path().parent
         if panel_prefs.collection_to_folder:
-            # Gets object Collection Hierarchy as a path in string list format
-            collection_hierarchy = get_collection_hierarchy_list_as_path(context, obj)
-            # Constructs the export Path without filename
-            constructed_path = export_directory.joinpath(*collection_hierarchy)
-        else:
-            constructed_path = export_directory
-
-        constructed_path = constructed_path.joinpath(obj.name + '.fbx')
-        # Create dir if not found
-        constructed_path.parent.mkdir(parents=True, exist_ok=True)
-        # Pass the Json Dict and dump it to create the actual file in the directory
-        create_animation_markers_json_file(constructed_path, markers_json)
-        # Finally, export the file
-        exporter(self, constructed_path)
-
-        # Copy the created FBX to its published folder
-        if not self.use_custom_dir:
-            published_dir = get_published_path().parent
-            if panel_prefs.collection_to_folder:
-                published_dir = published_dir.joinpath(*collection_hierarchy)
-            published_dir.mkdir(parents=True, exist_ok=True)
-            shutil.copy(constructed_path, published_dir)
+            published_dir = published_dir.joinpath(*collection_hierarchy)
 
-    return
+    return constructed_path, published_dir
 
-def construct_dummy_export_directory():
-    blend_path = Path(bpy.path.abspath('//'))
-    wip = False
-    pathway = []
-
-    # Get the current project's project_structure.json object to get its folder structure
-    structure_json = get_current_project_structure_json()
-    if structure_json is None:
-        return "project_structure.json not found"
-
-    # First, add the parent folder where all assets in the project reside
-    pathway.append(structure_json['folderName'])
-
-    # Search the .blend Path for BitCake's folder structure
-    # Change _WIP folder to Art then construct the rest of the path
-    for part in blend_path.parts:
-
-        if wip is True:
-            split_part = part.split('_')
-            # If folder name starts with a number, remove it, otherwise join again.
-            if split_part[0].isnumeric():
-                split_part.pop(0)
-                pathway.append('_'.join(split_part))
-            else:
-                pathway.append('_'.join(split_part))
+def get_non_batch_filename(context, active_object_export_name):
+    panel_prefs = context.scene.exporter_configs
 
-        if part.__contains__('WIP'):
-            pathway.append('Art')
-            wip = True
+    # Create the filename based on this .blend name
+    if panel_prefs.non_batch_filename == '':
+        return active_object_export_name + '.fbx'
+
+    return panel_prefs.non_batch_filename + '.fbx'
 
-    # Construct final directory and return it
-    current_project_path = Path(get_current_project_assets_path())
-    constructed_directory = current_project_path.joinpath(*pathway) # Unpacks the list as arguments
+def make_batch_export_jobs(self, context, session, objects_list, target, target_index, markers_jsons, fingerprints={}):
+    """Constructs the path of every file a batch export writes for target. Returns a list of json serializable job
+    dicts, jobs whose file is up to date have 'up_to_date' set and don't need to be exported."""
+    export_cache = target.export_cache
+    objects_set = {}
 
-    return constructed_directory
+    for obj in objects_list:
+        objects_set[obj] = True
 
+    jobs = []
+    for obj in objects_list:
+        if obj_ancestor_in_objects_set(objects_set, obj):
+            continue
 
-def get_engine_configs(panel_prefs):
-    engine_configs_file = get_engine_configs_path()
-    configs = json.load(engine_configs_file.open())
+        export_name = session.staged_name(obj)
+        markers_json = hierarchy_markers_json(markers_jsons, [obj])
+        constructed_path, published_dir = get_batch_export_paths(context, obj, export_name, target.directory, target.publish, session.collection_paths)
+
+        # Nothing changed in this hierarchy since it was last exported, so there's nothing to write
+        fingerprint = fingerprints.get(obj)
+        published_copies = [published_dir / constructed_path.name] if published_dir else []
+        up_to_date = bool(export_cache) and export_cache.is_up_to_date(constructed_path, fingerprint, *published_copies)
+
+        # Files are written to a pending folder, and moved into place when the export is done (see export_outputs.py)
+        pending_path = published_pending_path = None
+        if not up_to_date:
+            group = str(constructed_path)
+            # Only the published copy is missing when the fingerprint matches, the file itself would be written the same
+            unchanged = bool(export_cache) and export_cache.matches(constructed_path, fingerprint)
+            pending_path = target.outputs.stage(constructed_path, group, unchanged)
+            if markers_json is not None:
+                target.outputs.stage(animation_markers_json_path(constructed_path), group)
+            if published_dir:
+                published_pending_path = target.outputs.stage(published_dir / constructed_path.name, group, unchanged)
+
+        jobs.append({
+            'root': export_name,
+            'filepath': str(constructed_path),
+            'pending_filepath': str(pending_path) if pending_path else None,
+            'published_pending_filepath': str(published_pending_path) if published_pending_path else None,
+            'markers_json': markers_json,
+            'fingerprint': fingerprint,
+            'up_to_date': up_to_date,
+            'target': target_index,
+            'engine_configs': target.engine_configs,
+        })
+
+    return jobs
+
+def make_animation_export_jobs(context, session, armatures, target, target_index, action_relevance, markers_jsons, fingerprints={}):
+    """Animations Only version of make_batch_export_jobs(): one job per action of every armature, each writing
+    <armature>@<action>.fbx with only that (staged) armature and action in it."""
+    export_cache = target.export_cache
+
+    jobs = []
+    for armature in armatures:
+        staged = session.staged_objects[armature]
+        markers_json = markers_jsons.get(armature)
+
+        for action in action_relevance.actions_for(armature):
+            export_name = f'{staged.name}@{bpy.path.clean_name(action.name)}'
+            constructed_path, published_dir = get_batch_export_paths(context, armature, export_name, target.directory, target.publish, session.collection_paths)
+
+            # This action didn't change since it was last exported, so there's nothing to write
+            fingerprint = fingerprints.get((armature, action.name))
+            published_copies = [published_dir / constructed_path.name] if published_dir else []
+            up_to_date = bool(export_cache) and export_cache.is_up_to_date(constructed_path, fingerprint, *published_copies)
+
+            clip_json = None
+            if markers_json is not None:
+                clip_json = dict(markers_json, ActionsData=[data for data in markers_json['ActionsData'] if data['Name'] == action.name])
+
+            pending_path = published_pending_path = None
+            if not up_to_date:
+                group = str(constructed_path)
+                # Only the published copy is missing when the fingerprint matches, the file itself would be written the same
+                unchanged = bool(export_cache) and export_cache.matches(constructed_path, fingerprint)
+                pending_path = target.outputs.stage(constructed_path, group, unchanged)
+                if clip_json is not None:
+                    target.outputs.stage(animation_markers_json_path(constructed_path), group)
+                if published_dir:
+                    published_pending_path = target.outputs.stage(published_dir / constructed_path.name, group, unchanged)
+
+            jobs.append({
+                'root': staged.name,
+                'action': action.name,
+                'filepath': str(constructed_path),
+                'pending_filepath': str(pending_path) if pending_path else None,
+                'published_pending_filepath': str(published_pending_path) if published_pending_path else None,
+                'markers_json': clip_json,
+                'fingerprint': fingerprint,
+                'up_to_date': up_to_date,
+                'target': target_index,
+                'engine_configs': target.engine_configs,
+            })
+
+    return jobs
+
+def export_job(self, job):
+    """Exports a single batch job: the job's (staged) root object and all its hierarchy.
+    Animations Only jobs export their root armature with only the job's action."""
+    constructed_path = Path(job['pending_filepath'])
+
+    # Selects the object and all its hierachy
+    with self.timings.stage('Select Hierarchy'):
+        root = bpy.data.objects[job['root']]
+        select_object_hierarchy(root)
+        if job.get('action'):
+            solo_staged_action(root, job['action'])
+
+    # Create dir if not found
+    constructed_path.parent.mkdir(parents=True, exist_ok=True)
+    # Pass the Json Dict and dump it to create the actual file in the directory
+    with self.timings.stage('Markers Json File'):
+        create_animation_markers_json_file(constructed_path, job['markers_json'])
+    # Finally, export the file
+    exporter(self, constructed_path, job['engine_configs'])
 
-    current_engine = panel_prefs.engine_configs_list
-    current_config = configs[current_engine]
+    # Copy the created FBX to its published folder, in the background
+    if job['published_pending_filepath']:
+        self.publisher.publish(constructed_path, job['published_pending_filepath'])
 
-    return current_config
+    return
 
+def export_jobs_in_worker(jobs):
+    """Runs inside background Blender workers, see export_workers.BackgroundJobs."""
+    results = []
+    image_nodes = MaterialImageNodes()
+    for job in jobs:
+        report = BackgroundReport()
+        report.image_nodes = image_nodes
+        report.publisher = Publisher()
+        # Same as export_next(): errors reported along the way (a failed publish...) don't discard the file
+        finished = True
+        try:
+            export_job(report, job)
+        except Exception as err:
+            report.report({'ERROR'}, f"Failed to export '{job['filepath']}': {err}")
+            finished = False
+        report_publish_results(report, report.publisher)
+
+        results.append({'filepath': job['filepath'], 'finished': finished, 'errors': report.errors, 'timings': report.timings.to_json()})
+
+    return results
 
 def draw_panel(self, context):
     configs = context.scene.exporter_configs
@@ -789,15 +1031,22 @@ def draw_panel(self, context):
         row.alert = configs.filename_alert
         row.prop(configs, 'non_batch_filename', toggle=1)
 
-    # box = layout.box()
-    # box.label(text='Current Export Directory:')
-    # directory = construct_dummy_export_directory()
-    # box.label(text=f'{directory}')
+    if configs.export_running:
+        box = layout.box()
+        box.label(text=configs.export_progress_text, icon='EXPORT')
+        row = box.row()
+        row.enabled = False
+        row.prop(configs, 'export_progress', text='', slider=True)
 
     row = layout.row()
     op = row.operator('bitcake.universal_exporter', text=f'{batch}Send to {current_engine} Project', icon_value=engine_logo.icon_id)
     op.is_batch = configs.export_batch
 
+    if configs.animation_export:
+        row = layout.row()
+        op = row.operator('bitcake.universal_exporter', text=f'Send Animations to {current_engine} Project', icon='ACTION')
+        op.animation_only = True
+
     row = layout.row()
     row.separator()
     row = layout.row()
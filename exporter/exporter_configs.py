@@ -4,27 +4,41 @@ import os
 from bpy.app.handlers import persistent
 from bpy.types import PropertyGroup, Scene
 from bpy.utils import previews
-from bpy.props import BoolProperty, EnumProperty, StringProperty
-from ..helpers import get_current_project_structure_json, get_engine_configs_path, get_exporter_configs, get_registered_projects_path
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, StringProperty
+from ..helpers import clear_registered_projects_cache, get_current_project_structure_json, get_engine_configs_path, get_exporter_configs, get_registered_projects
 
 def update_registered_projects(self, context):
     projects_list = []
 
-    projects_file_path = get_registered_projects_path()
+    projects_json = get_registered_projects()
 
-    if projects_file_path.is_file():
-        with open(str(projects_file_path), 'r') as projects:
-            projects_json = json.load(projects)
-
-            for i, project in enumerate(projects_json):
-                projects_list.append((project, project, '', i))
+    if projects_json:
+        for i, project in enumerate(projects_json):
+            projects_list.append((project, project, '', i))
     else:
         projects_list = [("NONE", "No Projects Registered", "", 0),]
 
     return projects_list
 
+def list_export_target_projects(self, context):
+    # Flag enum items need power of two values
+    return [(project, project, '', 1 << i) for i, project in enumerate(get_registered_projects())]
+
+# Flag enums are saved as their bits, which move whenever a project is (un)registered.
+# The chosen projects are saved by name in extra_export_project_names instead, the enum only shows them.
+def get_extra_export_projects(self):
+    names = set(json.loads(self.extra_export_project_names or '[]'))
+    return sum(1 << i for i, project in enumerate(get_registered_projects()) if project in names)
+
+def set_extra_export_projects(self, value):
+    names = [project for i, project in enumerate(get_registered_projects()) if value & (1 << i)]
+    self.extra_export_project_names = json.dumps(names)
+
 @persistent     # Persistent function so it runs when Blender opens.
 def check_project_for_settings(self, context):
+    # Another Blender may have registered projects since they were last read
+    clear_registered_projects_cache()
+
     exporter_configs = get_exporter_configs()
     project_settings_file = get_current_project_structure_json()
 
@@ -75,9 +89,19 @@ class BITCAKE_PROPS_exporter_configs(PropertyGroup):
                                     description='List all available engine export configurations.',
                                     )
 
+    extra_export_projects: EnumProperty(items=list_export_target_projects,
+                                        name='Also Send To',
+                                        description="Other registered projects Send to Engine also exports to, each with its own engine's settings.\nThe scene is only prepared once for all of them",
+                                        options={'ENUM_FLAG'},
+                                        get=get_extra_export_projects,
+                                        set=set_extra_export_projects,
+                                        )
+    extra_export_project_names: StringProperty(name="Also Send To Projects", default='')
+
     export_selection_types: EnumProperty(items=[('SELECTED', 'Selected', 'Export Selected Objects Only', 'RESTRICT_SELECT_OFF', 0),
                                                 ('COLLECTION', 'Collection', "Export Objects in the Active Object's Collection", 'OUTLINER_COLLECTION', 1),
-                                                ('ALL', 'All', "Export All Objects", 'OUTLINER', 2)], default='SELECTED')
+                                                ('ALL', 'All', "Export All Objects", 'OUTLINER', 2),
+                                                ('CHANGED', 'Changed', "Export only the hierarchies that changed since they were last exported in this session", 'FILE_REFRESH', 3)], default='SELECTED')
 
 
     project_has_settings: BoolProperty(name="Project Has Settings", description="Checks if current active project has a project_settings.json file in the Asset folder root", default=False)
@@ -88,9 +112,16 @@ class BITCAKE_PROPS_exporter_configs(PropertyGroup):
     origin_transform: BoolProperty(name="Origin", description="Place objects in origin before exporting", default=False)
     apply_transform: BoolProperty(name="Apply", description="Apply transforms before exporting", default=False)
     export_textures: BoolProperty(name="Embed Textures", description="Embed Textures on FBX or not", default=False)
+    process_textures: BoolProperty(name="Write Textures", description="Writes the textures of the exported materials to a Textures folder next to the exported files,\nresized and converted to the engine's texture_max_size and texture_format (engine_configs.json)", default=False)
     export_nla_strips: BoolProperty(name="Export NLA Strips", description="Separate NLA Strips into their own animations when exporting.\nYou'll usually want this turned OFF for Game Engine", default=False)
+    use_export_cache: BoolProperty(name="Skip Unchanged", description="Skips writing files whose objects, animations and export settings didn't change since they were last exported", default=True)
     filename_alert: BoolProperty(name="Filename Alert", default=True)
 
+    # Export progress, set while a batch export runs in the background (see BITCAKE_OT_universal_exporter.modal)
+    export_running: BoolProperty(name="Export Running", default=False)
+    export_progress: FloatProperty(name="Export Progress", subtype='PERCENTAGE', min=0, max=100, default=0)
+    export_progress_text: StringProperty(name="Export Progress Text", default='')
+
     # Prefixes Setup (user changeable)
     separator: StringProperty(name='Separator', default='_')
     animation_prefix: StringProperty(name='Animation', default='Anim') # Unused due to Blender's FBX limitations
@@ -13,10 +13,12 @@ def draw_panel(self, context):
 
     row = layout.row(align=True)
     row.prop(exporter_configs, 'export_textures', toggle=1, icon_value=1, icon='TEXTURE')
+    row.prop(exporter_configs, 'process_textures', toggle=1, icon_value=1, icon='IMAGE_DATA')
 
 
     row = layout.row(align=True)
     row.prop(exporter_configs, 'export_nla_strips', toggle=1, icon_value=1, icon='NLA')
+    row.prop(exporter_configs, 'use_export_cache', toggle=1, icon_value=1, icon='FILE_REFRESH')
 
     if exporter_configs.export_batch:
         row = layout.row(align=True)
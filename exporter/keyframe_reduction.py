@@ -0,0 +1,182 @@
+import array
+import numpy as np
+import os
+from pathlib import Path
+
+# engine_configs.json keys with the largest error each channel of a baked animation can be reduced to.
+# Position is in Blender units, rotation in degrees, scale is unitless. Engines without them export every baked key.
+TOLERANCE_KEYS = {
+    b'T': 'anim_position_tolerance',
+    b'R': 'anim_rotation_tolerance',
+    b'S': 'anim_scale_tolerance',
+}
+
+
+def get_tolerances(configs):
+    """Returns the engine config's tolerances as {FBX curve node name: tolerance}, empty if it doesn't reduce keys."""
+    return {channel: configs[key] for channel, key in TOLERANCE_KEYS.items() if configs.get(key)}
+
+
+def reduce_curve(times, values, tolerance):
+    """Returns a mask of the keys to keep so that linear interpolation between them never misses values by more
+    than tolerance. The first and last keys are always kept.
+
+    Works like Ramer-Douglas-Peucker, splitting every segment that's off at its worst key, but all segments of the
+    curve are checked at once on each pass."""
+    count = len(values)
+    keep = np.zeros(count, dtype=bool)
+    keep[[0, -1]] = True
+    if count <= 2:
+        return keep
+
+    indices = np.arange(count)
+    while True:
+        kept = np.flatnonzero(keep)
+        segment = np.minimum(np.searchsorted(kept, indices, side='right') - 1, len(kept) - 2)
+        start = kept[segment]
+        end = kept[segment + 1]
+
+        fraction = (times - times[start]) / (times[end] - times[start])
+        error = np.abs(values - (values[start] + (values[end] - values[start]) * fraction))
+        error[keep] = 0.0
+
+        # Worst key of each segment, segments start at every kept key but the last
+        worst = np.maximum.reduceat(error, kept[:-1])[segment]
+        split = (worst > tolerance) & (error == worst)
+        if not split.any():
+            return keep
+
+        keep |= split
+
+
+def reduce_fbx_keyframes(path, tolerances):
+    """Reduces the baked keys of every position, rotation and scale curve in the FBX file at path to the fewest keys
+    that stay within tolerances (see get_tolerances()), then writes the file again.
+    Returns (keys before, keys after), both 0 if the file has no animation."""
+    # Blender's own FBX addon reads and writes the file, it's always there when FBX files can be exported
+    from io_scene_fbx import encode_bin, parse_fbx
+
+    root, version = parse_fbx.parse(str(path), use_namedtuple=True)
+    objects = find_elem(root, b'Objects')
+    connections = find_elem(root, b'Connections')
+    if objects is None or connections is None:
+        return 0, 0
+
+    # Curve -> its curve node's name (T, R, S, or a custom property's)
+    curves = {elem.props[0]: elem for elem in objects.elems if elem.id == b'AnimationCurve'}
+    if not curves:
+        return 0, 0
+
+    curve_nodes = {elem.props[0]: elem.props[1].split(b'\x00\x01')[0] for elem in objects.elems if elem.id == b'AnimationCurveNode'}
+    channels = {}
+    for connection in connections.elems:
+        if connection.props[0] == b'OP' and connection.props[1] in curves and connection.props[2] in curve_nodes:
+            channels[connection.props[1]] = curve_nodes[connection.props[2]]
+
+    # Positions are written in the file's units, tolerances are in Blender units (meters)
+    position_scale = 100.0 / unit_scale_factor(root)
+
+    keys_before = keys_after = 0
+    reduced = {}
+    for uid, curve in curves.items():
+        key_times = find_elem(curve, b'KeyTime').props[0]
+        key_values = find_elem(curve, b'KeyValueFloat').props[0]
+        keys_before += len(key_values)
+
+        tolerance = tolerances.get(channels.get(uid))
+        if tolerance is None:
+            keys_after += len(key_values)
+            continue
+
+        if channels[uid] == b'T':
+            tolerance *= position_scale
+
+        times = np.frombuffer(key_times, dtype=np.int64).astype(np.float64)
+        values = np.frombuffer(key_values, dtype=np.float32).astype(np.float64)
+        keep = reduce_curve(times, values, tolerance)
+        keys_after += int(keep.sum())
+
+        if not keep.all():
+            reduced[uid] = (
+                array.array(key_times.typecode, np.frombuffer(key_times, dtype=np.int64)[keep].tobytes()),
+                array.array(key_values.typecode, np.frombuffer(key_values, dtype=np.float32)[keep].tobytes()),
+            )
+
+    if reduced:
+        encode_bin.init_version(version)
+        encoded_root = encode_elem(encode_bin, root, reduced)
+
+        # Written next to the file first, so a failed write never leaves half a file behind
+        temp_path = Path(path).with_suffix('.reduced.fbx')
+        encode_bin.write(str(temp_path), encoded_root, version)
+        os.replace(temp_path, path)
+
+    return keys_before, keys_after
+
+
+def find_elem(elem, elem_id):
+    for child in elem.elems:
+        if child.id == elem_id:
+            return child
+
+    return None
+
+
+def unit_scale_factor(root):
+    """The file's UnitScaleFactor: how many centimeters one of its units is."""
+    global_settings = find_elem(root, b'GlobalSettings')
+    properties = find_elem(global_settings, b'Properties70') if global_settings else None
+    if properties:
+        for prop in properties.elems:
+            if prop.props[0] == b'UnitScaleFactor':
+                return prop.props[4]
+
+    return 1.0
+
+
+# Parsed FBX property type -> encode_bin.FBXElem method that writes it
+ADD_PROP = {
+    b'C': 'add_bool',
+    b'Z': 'add_int8',
+    b'Y': 'add_int16',
+    b'I': 'add_int32',
+    b'L': 'add_int64',
+    b'F': 'add_float32',
+    b'D': 'add_float64',
+    b'R': 'add_bytes',
+    b'S': 'add_string',
+    b'i': 'add_int32_array',
+    b'l': 'add_int64_array',
+    b'f': 'add_float32_array',
+    b'd': 'add_float64_array',
+    b'b': 'add_bool_array',
+    b'c': 'add_byte_array',
+}
+
+
+def encode_elem(encode_bin, elem, reduced):
+    """Turns a parsed FBX element back into one encode_bin can write, with the reduced curves' keys swapped in."""
+    encoded = encode_bin.FBXElem(elem.id)
+    for prop, prop_type in zip(elem.props, elem.props_type):
+        getattr(encoded, ADD_PROP[bytes([prop_type])])(prop)
+
+    children = elem.elems
+    if elem.id == b'AnimationCurve' and elem.props[0] in reduced:
+        children = [reduced_curve_child(child, *reduced[elem.props[0]]) for child in children]
+
+    for child in children:
+        encoded.elems.append(encode_elem(encode_bin, child, reduced))
+
+    return encoded
+
+
+def reduced_curve_child(child, key_times, key_values):
+    if child.id == b'KeyTime':
+        return child._replace(props=[key_times])
+    if child.id == b'KeyValueFloat':
+        return child._replace(props=[key_values])
+    if child.id == b'KeyAttrRefCount':
+        # All keys share the same (linear) key attributes
+        return child._replace(props=[array.array(child.props[0].typecode, [len(key_values)])])
+
+    return child
@@ -0,0 +1,68 @@
+import numpy as np
+
+
+def material_indices(mesh):
+    """Returns every polygon's material_index as an array."""
+    indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('material_index', indices)
+    return indices
+
+
+def used_material_slots(mesh, indices=None):
+    """Returns the sorted indices of the material slots used by at least one polygon."""
+    if indices is None:
+        indices = material_indices(mesh)
+
+    slot_count = len(mesh.materials)
+    if slot_count == 0:
+        return np.empty(0, dtype=np.int32)
+
+    # Polygons with an index past the last slot use the last slot
+    return np.unique(np.minimum(indices, slot_count - 1))
+
+
+def has_unused_material_slots(mesh):
+    return len(used_material_slots(mesh)) < len(mesh.materials)
+
+
+def compact_material_slots(meshes, restore=None):
+    """Removes the material slots no polygon uses from every mesh in meshes, remapping polygon material indices to
+    the slots that are left. Returns what restore_material_slots() needs to put the meshes back as they were,
+    appended to restore if it's given so meshes compacted before an error can still be restored."""
+    if restore is None:
+        restore = []
+
+    for mesh in dict.fromkeys(meshes):
+        slot_count = len(mesh.materials)
+        if slot_count == 0:
+            continue
+
+        indices = material_indices(mesh)
+        used = used_material_slots(mesh, indices)
+        if len(used) == slot_count:
+            continue
+
+        remap = np.zeros(slot_count, dtype=np.int32)
+        remap[used] = np.arange(len(used), dtype=np.int32)
+
+        materials = list(mesh.materials)
+        restore.append((mesh, materials, indices))
+
+        # Clearing the slots resets the polygons' indices, so they're written after the slots are rebuilt
+        mesh.materials.clear()
+        for index in used:
+            mesh.materials.append(materials[index])
+        mesh.polygons.foreach_set('material_index', remap[np.minimum(indices, slot_count - 1)])
+        mesh.update()
+
+    return restore
+
+
+def restore_material_slots(restore):
+    """Undoes compact_material_slots()."""
+    for mesh, materials, indices in reversed(restore):
+        mesh.materials.clear()
+        for material in materials:
+            mesh.materials.append(material)
+        mesh.polygons.foreach_set('material_index', indices)
+        mesh.update()
@@ -0,0 +1,95 @@
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+
+# Linux ioctl that makes a copy-on-write clone of a file (Btrfs, XFS...)
+FICLONE = 0x40049409
+
+
+class Publisher:
+    """Copies exported files to their Published folders on a background thread, so the next file can be exported
+    while the last one is still being copied. Hardlinks or reflinks are used instead of copies where the file system
+    allows it. Copies are written to ExportOutputs' pending paths, which skips the ones identical to what's published.
+
+    publish() queues a file, finish() waits for everything queued and returns the results."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.results = []
+        self.seconds = 0.0
+        self.thread = None
+
+    def publish(self, source, destination):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name='BitTools Publisher', daemon=True)
+            self.thread.start()
+
+        self.queue.put((Path(source), Path(destination)))
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+
+            source, destination = item
+            start = time.perf_counter()
+            try:
+                method = publish_file(source, destination)
+                self.results.append({'path': str(destination), 'method': method, 'error': None})
+            except OSError as err:
+                self.results.append({'path': str(destination), 'method': None, 'error': str(err)})
+            self.seconds += time.perf_counter() - start
+
+    def finish(self):
+        """Waits for every queued file to be published. Returns a list of {'path', 'method', 'error'} dicts."""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+        return self.results
+
+
+def publish_file(source, destination):
+    """Puts a copy of source at destination. Returns how: 'HARDLINK', 'REFLINK' or 'COPY'."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.unlink(missing_ok=True)
+
+    return link_or_copy(source, destination)
+
+
+def link_or_copy(source, destination):
+    try:
+        os.link(source, destination)
+        return 'HARDLINK'
+    except OSError:
+        pass
+
+    if reflink(source, destination):
+        return 'REFLINK'
+
+    shutil.copy(source, destination)
+    return 'COPY'
+
+
+def reflink(source, destination):
+    if fcntl is None:
+        return False
+
+    try:
+        with open(source, 'rb') as source_file, open(destination, 'wb') as destination_file:
+            fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+        return True
+    except OSError:
+        destination.unlink(missing_ok=True)
+        return False
+
@@ -7,7 +7,7 @@ from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper
 
 from ..exporter.exporter_configs import check_project_for_settings
-from ..helpers import get_current_project_assets_path, get_exporter_configs, get_generic_project_structure_json, get_generic_project_structure_json_path, get_registered_projects_path
+from ..helpers import clear_registered_projects_cache, get_current_project_assets_path, get_exporter_configs, get_generic_project_structure_json, get_generic_project_structure_json_path, get_registered_projects, get_registered_projects_path
 
 
 class BITCAKE_OT_register_project(Operator, ImportHelper):
@@ -147,6 +147,7 @@ def project_definitions(engine, dir_path, assets_path):
 def register_project(project):
     """Checks if file exist, if not create it and write details as json"""
 
+    clear_registered_projects_cache()
     projects_file_path = get_registered_projects_path()
 
     if projects_file_path.is_file():
@@ -164,6 +165,7 @@ def register_project(project):
 def unregister_project(project):
     """Pass a Project string in order to delete it from registered_projects.json"""
 
+    clear_registered_projects_cache()
     all_projects = Path(get_registered_projects_path())
     all_projects = json.load(all_projects.open())
     all_projects.pop(project)
@@ -227,6 +229,11 @@ def draw_panel(self, context):
     row = layout.row()
     row.prop(exporter_configs, 'engine_configs_list')
 
+    if len(get_registered_projects()) > 1:
+        layout.label(text='Also Send To')
+        row = layout.row(align=True)
+        row.prop(exporter_configs, 'extra_export_projects')
+
     if exporter_configs.project_has_settings == False:
         box = layout.box()
         box.alert = True
@@ -0,0 +1,252 @@
+import bpy
+import hashlib
+import json
+import numpy as np
+import os
+import struct
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from .export_cache import CACHE_FOLDER
+
+TEXTURES_FOLDER = 'Textures'
+TEXTURE_CACHE_FILENAME = 'texture_cache.json'
+TEXTURE_CACHE_VERSION = 2
+TEXTURE_FORMATS = {'PNG': '.png', 'TGA': '.tga'}
+
+
+class TextureStage:
+    """Writes the images used by the exported materials to a Textures folder next to the exported files,
+    resized to the engine's texture_max_size and converted to its texture_format (see engine_configs.json).
+
+    Pixels are read from Blender on the main thread, everything else (hashing, resizing, encoding, writing) runs on
+    a thread pool while the FBX files are exported. Textures whose pixels and settings didn't change since they were
+    last written are skipped. Like the exported files, textures are written to outputs' pending folder and moved into
+    place with everything else (see export_outputs.py)."""
+
+    def __init__(self, export_directory, engine_configs, outputs):
+        self.directory = Path(export_directory)
+        self.export_outputs = outputs
+        self.cache_path = self.directory / CACHE_FOLDER / TEXTURE_CACHE_FILENAME
+        self.cache = self.load_cache()
+
+        self.max_size = engine_configs.get('texture_max_size', 0)
+        self.format = engine_configs.get('texture_format', 'PNG')
+        self.settings_digest = f'{TEXTURE_CACHE_VERSION}|{self.max_size}|{self.format}'
+
+        self.outputs = {}   # Image -> set of folders it's written to
+        self.pool = None
+        self.futures = []
+
+    def add(self, images, directory):
+        """Queues images to be written to <directory>/Textures."""
+        for image in images:
+            if image is not None:
+                self.outputs.setdefault(image, set()).add(Path(directory) / TEXTURES_FOLDER)
+
+    def start(self, operator):
+        if self.format not in TEXTURE_FORMATS:
+            operator.report({'ERROR'}, f"Unknown texture_format '{self.format}' in engine_configs.json, use one of {list(TEXTURE_FORMATS)}")
+            return self
+
+        worker_count = os.cpu_count() or 1
+        self.pool = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix='BitTools Textures')
+        taken = {}  # Folder -> lowercase filenames already written to it, file systems may ignore case
+
+        for image, folders in self.outputs.items():
+            # Every queued texture holds its pixels until it's processed, keep just enough queued for the pool
+            queued = [future for future in self.futures if not future.done()]
+            if len(queued) >= worker_count * 2:
+                wait(queued, return_when=FIRST_COMPLETED)
+
+            pixels = read_image_pixels(image)
+            if pixels is None:
+                operator.report({'WARNING'}, f"Texture '{image.name}' has no pixels or is a float (HDR) image, it won't be written")
+                continue
+
+            filename = unique_texture_filename(image.name, TEXTURE_FORMATS[self.format], [taken.setdefault(folder, set()) for folder in folders])
+            if Path(filename).stem != bpy.path.clean_name(Path(image.name).stem):
+                operator.report({'WARNING'}, f"Another texture is already written as '{bpy.path.clean_name(Path(image.name).stem)}', '{image.name}' is written as '{filename}'")
+            for folder in folders:
+                taken[folder].add(filename.lower())
+
+            paths = [folder / filename for folder in sorted(folders)]
+            cached = {str(path): self.cache.get(self.key(path)) for path in paths}
+            pending = {str(path): self.export_outputs.stage(path, str(path)) for path in paths}
+
+            self.futures.append(self.pool.submit(process_texture, pixels, paths, pending, cached, self.settings_digest, self.max_size, self.format))
+
+        return self
+
+    def finish(self, operator):
+        """Waits for the textures to be written, updates the cache and reports what was done."""
+        if self.pool is None:
+            return
+
+        written = skipped = 0
+        for future in self.futures:
+            try:
+                digest, paths_written, paths_skipped = future.result()
+            except (OSError, ValueError) as err:
+                operator.report({'ERROR'}, f"Failed to write texture: {err}")
+                continue
+
+            for path in paths_written + paths_skipped:
+                self.cache[self.key(path)] = digest
+            for path in paths_written:
+                self.export_outputs.done(str(path))
+
+            written += len(paths_written)
+            skipped += len(paths_skipped)
+
+        self.pool.shutdown()
+        self.pool = None
+        self.save_cache()
+
+        operator.report({'INFO'}, f"{written} texture(s) written, {skipped} unchanged texture(s) skipped")
+
+    def key(self, path):
+        try:
+            return Path(path).relative_to(self.directory).as_posix()
+        except ValueError:
+            return Path(path).as_posix()
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, 'r') as cache_file:
+                return json.load(cache_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_cache(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'w') as cache_file:
+            json.dump(self.cache, cache_file, indent=4, sort_keys=True)
+
+
+def unique_texture_filename(image_name, extension, taken_names):
+    """Returns the filename image_name is written as: its cleaned up name without extension, unless that's in one of
+    taken_names (sets of lowercase filenames). Then its extension (or Blender's .001 suffix) is kept in the name,
+    and if that's taken too it's numbered, e.g. wood.png -> wood.tga, wood.jpg -> wood_jpg.tga, wood.001 -> wood_001.tga."""
+    image_path = Path(image_name)
+    stem = bpy.path.clean_name(image_path.stem)
+    candidates = [stem]
+    if image_path.suffix:
+        candidates.append(f'{stem}_{bpy.path.clean_name(image_path.suffix[1:])}')
+
+    number = 2
+    while True:
+        for candidate in candidates:
+            filename = candidate + extension
+            if not any(filename.lower() in names for names in taken_names):
+                return filename
+
+        candidates = [f'{stem}_{number}']
+        number += 1
+
+
+def read_image_pixels(image):
+    """Returns the image's pixels as a (height, width, 4) uint8 array, bottom row first. Main thread only.
+    Blender only hands out float pixels, they're converted right away so queued textures take a quarter of the memory."""
+    width, height = image.size
+    if width == 0 or height == 0 or image.is_float:
+        return None
+
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+
+    return float_to_uint8(pixels).reshape(height, width, 4)
+
+
+def float_to_uint8(pixels):
+    """Converts 0-1 float pixels to uint8, clamping and scaling them in place."""
+    np.clip(pixels, 0, 1, out=pixels)
+    pixels *= 255
+    return np.rint(pixels, out=pixels).astype(np.uint8)
+
+
+def process_texture(pixels, paths, pending, cached, settings_digest, max_size, texture_format):
+    """Runs on the texture thread pool. Writes the outdated paths to their pending paths.
+    Returns (digest, paths written, paths skipped)."""
+    hasher = hashlib.sha1(settings_digest.encode())
+    hasher.update(struct.pack('<II', pixels.shape[1], pixels.shape[0]))
+    hasher.update(pixels.tobytes())
+    digest = hasher.hexdigest()
+
+    outdated = [path for path in paths if cached.get(str(path)) != digest or not path.is_file()]
+    if not outdated:
+        return digest, [], paths
+
+    pixels = resize_pixels(pixels, max_size)
+
+    # Don't write an alpha channel nobody uses
+    if np.all(pixels[..., 3] == 255):
+        pixels = pixels[..., :3]
+
+    if texture_format == 'TGA':
+        data = encode_tga(pixels)
+    else:
+        data = encode_png(pixels)
+
+    for path in outdated:
+        pending[str(path)].write_bytes(data)
+
+    return digest, outdated, [path for path in paths if path not in outdated]
+
+
+def resize_pixels(pixels, max_size):
+    """Downscales uint8 pixels so neither side is bigger than max_size, averaging 2x2 blocks while it can."""
+    if not max_size or max(pixels.shape[:2]) <= max_size:
+        return pixels
+
+    pixels = pixels.astype(np.float32) / 255
+    while max(pixels.shape[:2]) >= max_size * 2:
+        height, width = pixels.shape[0] // 2 * 2, pixels.shape[1] // 2 * 2
+        pixels = pixels[:height, :width]
+        pixels = (pixels[0::2, 0::2] + pixels[1::2, 0::2] + pixels[0::2, 1::2] + pixels[1::2, 1::2]) * 0.25
+
+    height, width = pixels.shape[:2]
+    if max(height, width) > max_size:
+        scale = max_size / max(height, width)
+        rows = (np.arange(max(1, round(height * scale))) + 0.5) / scale
+        columns = (np.arange(max(1, round(width * scale))) + 0.5) / scale
+        pixels = pixels[np.minimum(rows.astype(int), height - 1)][:, np.minimum(columns.astype(int), width - 1)]
+
+    return float_to_uint8(pixels)
+
+
+def encode_png(pixels):
+    """Encodes (height, width, 3 or 4) uint8 pixels, bottom row first like Blender's, as a PNG file."""
+    height, width, channels = pixels.shape
+    rows = np.ascontiguousarray(pixels[::-1]).reshape(height, width * channels)
+
+    # 'Up' filter on every row: store the difference to the row above, it compresses a lot better
+    filtered = rows.copy()
+    filtered[1:] -= rows[:-1]
+    scanlines = np.empty((height, width * channels + 1), dtype=np.uint8)
+    scanlines[:, 0] = 2
+    scanlines[:, 1:] = filtered
+
+    color_type = 6 if channels == 4 else 2
+    header = struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)
+
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        png_chunk(b'IHDR', header),
+        png_chunk(b'IDAT', zlib.compress(scanlines.tobytes(), 6)),
+        png_chunk(b'IEND', b''),
+    ])
+
+
+def png_chunk(chunk_type, data):
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff)
+
+
+def encode_tga(pixels):
+    """Encodes (height, width, 3 or 4) uint8 pixels, bottom row first like Blender's, as an uncompressed TGA file."""
+    height, width, channels = pixels.shape
+    bgr = pixels[..., [2, 1, 0, 3][:channels]]
+    descriptor = 8 if channels == 4 else 0     # Alpha bits, origin at the bottom left
+    header = struct.pack('<BBBHHBHHHHBB', 0, 0, 2, 0, 0, 0, 0, 0, width, height, channels * 8, descriptor)
+
+    return header + np.ascontiguousarray(bgr).tobytes()
@@ -41,9 +41,11 @@ def panel_category_name():
     v_pch = version[2]
     return f'{name} {v_maj}.{v_min}.{v_pch}'
 
-def is_wip_in_path():
-    """Receives a Path object and checks if there's a WIP folder in one of the parent folders"""
-    filepath = Path(bpy.data.filepath)
+def is_wip_in_path(filepath=None):
+    """Receives a Path object and checks if there's a WIP folder in one of the parent folders. Defaults to the current .blend"""
+    if filepath is None:
+        filepath = bpy.data.filepath
+    filepath = Path(filepath)
     addon_prefs = get_addon_prefs()
     parts = filepath.parts
 
@@ -142,10 +144,6 @@ def is_inside_published(directory):
     return False
 
 
-def name_prefix(name):
-    return name.split(bpy.context.scene.exporter_configs.separator)[0]
-
-
 def parent_to(obj, parent):
     obj.parent = parent
     obj.matrix_parent_inverse.identity()
@@ -192,19 +190,36 @@ def clear_pose(obj, clear_armature_properties=True, clear_bone_properties=True):
         pose_bone.scale = Vector((1.0, 1.0, 1.0))
 
 
-def get_current_project_assets_path():
-    """Returns a String Path for the current project Asset folder"""
+def get_current_project_assets_path(project=None):
+    """Returns a String Path for the current project Asset folder, or for the given registered project's"""
 
-    active_project = get_exporter_configs().registered_projects
+    if project is None:
+        project = get_exporter_configs().registered_projects
 
-    for mod in addon_utils.modules():
-        if mod.bl_info['name'] == __package__:
-            addon_path = Path(mod.__file__)
+    return get_registered_projects()[project]['assets']
 
-    projects_file_path = Path(addon_path.parent / 'configs' / 'registered_projects.json')
-    projects_json = json.load(projects_file_path.open())
+# registered_projects.json is read once instead of on every panel redraw.
+# Cleared when projects are registered or unregistered and when a file is loaded.
+registered_projects_cache = None
 
-    return projects_json[active_project]['assets']
+def get_registered_projects():
+    """Returns registered_projects.json as a json Object: project name -> {'engine', 'path', 'assets'}"""
+    global registered_projects_cache
+
+    if registered_projects_cache is None:
+        projects_file_path = get_registered_projects_path()
+        if projects_file_path.is_file():
+            with open(projects_file_path, 'r') as projects_file:
+                registered_projects_cache = json.load(projects_file)
+        else:
+            registered_projects_cache = {}
+
+    return registered_projects_cache
+
+def clear_registered_projects_cache():
+    """Makes the next get_registered_projects() read registered_projects.json again"""
+    global registered_projects_cache
+    registered_projects_cache = None
 
 def get_generic_project_structure_json_path():
     """Returns the Path to the json Object of the BitTools generic project_structure.json"""
@@ -223,10 +238,10 @@ def get_generic_project_structure_json():
 
     return project_structure_json
 
-def get_current_project_structure_json():
+def get_current_project_structure_json(project=None):
     """Returns the project_structure.json file created by BitPipe as a json Object. Returns None if file not found."""
     try:
-        asset_path = Path(get_current_project_assets_path())
+        asset_path = Path(get_current_project_assets_path(project))
         json_path = asset_path.joinpath('project_structure.json')
 
         json_file = json.load(json_path.open())
@@ -272,34 +287,6 @@ def select_and_make_active(context, obj):
     bpy.data.objects[obj.name].select_set(True)
     context.view_layer.objects.active = obj
 
-def get_collider_prefixes():
-    exporter_configs = get_addon_prefs()
-    collider_prefixes = [
-        exporter_configs.box_collider_prefix,
-        exporter_configs.capsule_collider_prefix,
-        exporter_configs.sphere_collider_prefix,
-        exporter_configs.convex_collider_prefix,
-        exporter_configs.mesh_collider_prefix,
-        exporter_configs.standard_collider_prefix,
-        exporter_configs.movement_collider_prefix,
-        exporter_configs.slippery_collider_prefix
-    ]
-    return collider_prefixes
-
-
-def get_object_prefixes():
-    context = bpy.context
-    exporter_configs = context.scene.exporter_configs
-
-    objects_prefixes = [
-        exporter_configs.static_mesh_prefix,
-        exporter_configs.skeletal_mesh_prefix,
-        exporter_configs.camera_prefix
-    ]
-
-    return objects_prefixes
-
-
 def select_object_hierarchy(obj):
     bpy.ops.object.select_all(action='DESELECT')
     bpy.context.view_layer.objects.active = obj
@@ -1,6 +1,7 @@
 import bpy
 from bpy.types import Operator, PropertyGroup, Scene
 from bpy.props import IntProperty, FloatProperty
+from ..naming_rules import NamingRules
 
 class BITCAKE_PROPS_lod_configs(PropertyGroup):
     lod_number: IntProperty(name='Number of LODs', default=2, min=0, max=10)
@@ -22,14 +23,16 @@ class BITCAKE_OT_lod_maker(Operator):
         obj = context.active_object
         selection = context.selected_objects
         scene_data = bpy.data.objects
+        naming_rules = NamingRules(context)
 
         for obj in selection:
             if not obj.get('LOD'):
                 obj['LOD'] = 0
 
             for child_obj in obj.children_recursive:
-                if child_obj.get('LOD') is not None:
-                    if child_obj.get('LOD') > 0:
+                child_lod = naming_rules.classify(child_obj).lod
+                if child_lod is not None:
+                    if child_lod > 0:
                         scene_data.remove(child_obj)
 
                         if child_obj in selection:
@@ -37,7 +40,7 @@ class BITCAKE_OT_lod_maker(Operator):
 
         for obj in selection:
             for lod in range(self.lod_number):
-                if obj.get('LOD') != 0:
+                if naming_rules.classify(obj).lod != 0:
                     continue
 
                 obj_copy = duplicate(obj)
@@ -48,7 +51,7 @@ class BITCAKE_OT_lod_maker(Operator):
                     obj_copy['LOD'] = current_lod
 
                 obj_name = obj_copy.name.split('.')
-                obj_copy.name = obj_name[0] + '_LOD' + str(current_lod)
+                obj_copy.name = naming_rules.lod_name(obj_name[0], current_lod)
 
                 decimate = obj_copy.modifiers.get('Decimate')
                 if not decimate:
@@ -103,10 +106,12 @@ def draw_panel(self, context):
         return
 
 
+    naming_rules = NamingRules(context)
     displayed_objs = []
     for obj in selection:
-        if obj.get('LOD') is not None:
-            if obj.get('LOD') > 0 or obj.parent is not None:
+        lod = naming_rules.classify(obj).lod
+        if lod is not None:
+            if lod > 0 or obj.parent is not None:
                 continue
             row = layout.row()
             row.label(text=f'{obj.name} LODs Ratio')
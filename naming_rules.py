@@ -0,0 +1,157 @@
+import bpy
+from collections import namedtuple
+from .helpers import get_addon_prefs
+
+# Blender's object names can't be longer than this many bytes, longer names get cut
+MAX_NAME_LENGTH = 63
+
+ObjectClass = namedtuple('ObjectClass', ['kind', 'prefix', 'collider_shape', 'collider_type', 'lod'])
+
+
+class NamingRules:
+    """Naming rules (object prefixes, collider prefixes, LODs) compiled once from the Addon Preferences and the
+    scene's Exporter Configs, so objects can be recognized and named without rebuilding prefix lists for each one.
+
+    Make one per export or tool run, settings changed after that aren't picked up."""
+
+    def __init__(self, context=None):
+        context = context or bpy.context
+        addon_prefs = get_addon_prefs()
+        exporter_configs = context.scene.exporter_configs
+
+        self.separator = exporter_configs.separator
+
+        # Collider names are <shape prefix>_<type prefix>_<name>, e.g. UBX_COL_Wall
+        self.collider_shapes = {
+            addon_prefs.box_collider_prefix: 'box',
+            addon_prefs.capsule_collider_prefix: 'capsule',
+            addon_prefs.sphere_collider_prefix: 'sphere',
+            addon_prefs.convex_collider_prefix: 'convex',
+            addon_prefs.mesh_collider_prefix: 'mesh',
+        }
+        self.collider_types = {
+            addon_prefs.standard_collider_prefix: 'COLLIDER',
+            addon_prefs.movement_collider_prefix: 'MOV_BLOCKER',
+            addon_prefs.slippery_collider_prefix: 'SLIPPERY',
+        }
+        self.shape_prefixes = {shape: prefix for prefix, shape in self.collider_shapes.items()}
+        self.type_prefixes = {collider_type: prefix for prefix, collider_type in self.collider_types.items()}
+        self.collider_prefixes = self.collider_shapes.keys() | self.collider_types.keys()
+
+        self.static_prefix = exporter_configs.static_mesh_prefix
+        self.object_prefixes = {
+            'ARMATURE': exporter_configs.skeletal_mesh_prefix,
+            'CAMERA': exporter_configs.camera_prefix,
+        }
+        self.known_prefixes = self.collider_prefixes | {self.static_prefix, *self.object_prefixes.values()}
+
+    def prefix(self, name):
+        """Returns the first part of name, whatever it is."""
+        return name.split(self.separator, 1)[0]
+
+    def is_collider(self, obj):
+        return self.prefix(obj.name) in self.collider_prefixes
+
+    def existing_prefix(self, name):
+        """Returns the known prefix name already has (one or two parts, like SM or UBX_COL), or '' if it has none."""
+        parts = name.split(self.separator, 2)
+        if parts[0] not in self.known_prefixes:
+            return ''
+
+        if len(parts) > 1 and parts[1] in self.known_prefixes:
+            return parts[0] + self.separator + parts[1]
+
+        return parts[0]
+
+    def correct_prefix(self, obj):
+        """Returns the prefix obj already has, or the one it should have for its type."""
+        return self.existing_prefix(obj.name) or self.object_prefixes.get(obj.type, self.static_prefix)
+
+    def classify(self, obj):
+        """Returns what obj is as an ObjectClass: its kind (COLLIDER, SKELETAL, CAMERA or STATIC), prefix, collider
+        shape and type (colliders only) and LOD number (None if it isn't a LOD)."""
+        prefix = self.correct_prefix(obj)
+        parts = prefix.split(self.separator)
+        if parts[0] in self.collider_prefixes:
+            collider_type = self.collider_types.get(parts[-1])
+            return ObjectClass('COLLIDER', prefix, self.collider_shapes.get(parts[0]), collider_type, obj.get('LOD'))
+
+        kind = {'ARMATURE': 'SKELETAL', 'CAMERA': 'CAMERA'}.get(obj.type, 'STATIC')
+        return ObjectClass(kind, prefix, None, None, obj.get('LOD'))
+
+    def prefixed_name(self, name, prefix):
+        """Returns name with prefix in front of it, unless it already starts with it."""
+        if name == prefix or name.startswith(prefix + self.separator):
+            return name
+
+        return f'{prefix}{self.separator}{name}'
+
+    def collider_prefix(self, shape, collider_type):
+        """Returns the start of a new collider's name, like UBX_COL_. Collider Tools have always joined these with '_',
+        whatever the exporter's separator is."""
+        return f'{self.shape_prefixes[shape]}_{self.type_prefixes[collider_type]}_'
+
+    def lod_name(self, name, lod):
+        return f'{name}_LOD{lod}'
+
+    def export_names(self, objects_list):
+        """Returns a dict of object -> the name it will have in the exported file, for objects_list and all their
+        children. Objects themselves are not renamed.
+
+        Roots and children get their type's prefix, colliders are named after their parent and numbered, and LOD0s
+        get _LOD0 appended."""
+        separator = self.separator
+        export_names = {}
+
+        for obj in objects_list:
+            if obj.parent:
+                continue
+
+            export_names[obj] = self.prefixed_name(obj.name, self.correct_prefix(obj))
+
+            collider_index = 0
+            for child in obj.children_recursive:
+                child_class = self.classify(child)
+
+                if child_class.kind == 'COLLIDER':
+                    export_names[child] = f'{child_class.prefix}{separator}{child.parent.name}{separator}{collider_index:02}'
+                    collider_index += 1
+                else:
+                    export_names[child] = self.prefixed_name(child.name, child_class.prefix)
+
+        for obj in objects_list:
+            if self.classify(obj).lod == 0:
+                export_names[obj] = self.lod_name(export_names.get(obj, obj.name), 0)
+
+        # Everything else in the exported hierarchies keeps its name
+        for obj in objects_list:
+            if obj not in export_names:
+                for member in (obj, *obj.children_recursive):
+                    export_names.setdefault(member, member.name)
+
+        return export_names
+
+    def name_conflicts(self, export_names):
+        """Returns a message for every export name that can't be used: two objects that would get the same name,
+        a name already taken by an object that isn't exported (its staged copy would end up with a .001 suffix),
+        or a name too long for Blender."""
+        conflicts = []
+        owners = {}
+
+        for obj, name in export_names.items():
+            if len(name.encode()) > MAX_NAME_LENGTH:
+                conflicts.append(f"'{obj.name}' would be exported as '{name}', which is longer than {MAX_NAME_LENGTH} characters")
+
+            other = bpy.data.objects.get(name)
+            if other is not None and other not in export_names:
+                conflicts.append(f"'{obj.name}' would be exported as '{name}', which is already the name of '{other.name}'")
+
+            owner = owners.setdefault(name, obj)
+            if owner is not obj:
+                conflicts.append(f"'{owner.name}' and '{obj.name}' would both be exported as '{name}'")
+
+        return conflicts
+
+    def colliders(self, export_names):
+        """Returns the objects whose export names make them colliders, they're exported without materials."""
+        return {obj for obj, name in export_names.items() if self.prefix(name) in self.collider_prefixes}
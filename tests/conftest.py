@@ -0,0 +1,32 @@
+"""The tests need Blender's Python, or any Python with the bpy module installed (pip install bpy). From the add-on folder:
+
+    blender -b --python-expr "import sys, pytest; sys.exit(pytest.main(['tests']))"
+
+The add-on is imported as BitTools, the name it's installed under. Tests that need its properties use the addon
+fixture, which registers it once for the whole run."""
+import importlib.util
+import sys
+from pathlib import Path
+import pytest
+
+ADDON_ROOT = Path(__file__).resolve().parent.parent
+ADDON_NAME = 'BitTools'
+
+
+def pytest_configure(config):
+    # Without bpy every test module skips itself, there's nothing to import
+    if importlib.util.find_spec('bpy') is None or ADDON_NAME in sys.modules:
+        return
+
+    spec = importlib.util.spec_from_file_location(ADDON_NAME, ADDON_ROOT / '__init__.py', submodule_search_locations=[str(ADDON_ROOT)])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[ADDON_NAME] = module
+    spec.loader.exec_module(module)
+
+
+@pytest.fixture(scope='session')
+def addon():
+    bittools = sys.modules[ADDON_NAME]
+    bittools.register()
+    yield bittools
+    bittools.unregister()
@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip('bpy')
+import numpy as np
+from BitTools.exporter.adaptive_sampling import MAX_STEP_MULTIPLIER, bone_step_multipliers
+
+FRAMES = 33
+
+
+def bone_points(heads, x_axes):
+    """Points shaped like sample_bone_points() returns them for one bone of length 1 pointing up Y."""
+    tails = heads + [0, 1, 0]
+    z_axes = np.cross(x_axes, [0, 1, 0])
+    return np.stack((heads, tails, heads + x_axes, heads + z_axes), axis=1)[:, None]
+
+
+def still_heads():
+    return np.zeros((FRAMES, 3))
+
+
+def still_x_axes():
+    return np.tile([1.0, 0, 0], (FRAMES, 1))
+
+
+def test_still_and_linear_bones_get_the_largest_step():
+    moving = still_heads()
+    moving[:, 0] = np.linspace(0, 10, FRAMES)
+    points = np.concatenate((bone_points(still_heads(), still_x_axes()), bone_points(moving, still_x_axes())), axis=1)
+
+    assert bone_step_multipliers(points, 0.001).tolist() == [MAX_STEP_MULTIPLIER, MAX_STEP_MULTIPLIER]
+
+
+def test_jittering_bone_needs_every_sample():
+    heads = still_heads()
+    heads[1::2, 2] = 0.5
+
+    assert bone_step_multipliers(bone_points(heads, still_x_axes()), 0.01).tolist() == [1]
+
+
+def test_twisting_bone_needs_every_sample():
+    # Head and tail never move, only the roll around Y does
+    angles = np.where(np.arange(FRAMES) % 2, 0.5, 0.0)
+    x_axes = np.stack((np.cos(angles), np.zeros(FRAMES), -np.sin(angles)), axis=1)
+
+    assert bone_step_multipliers(bone_points(still_heads(), x_axes), 0.01).tolist() == [1]
+
+
+def test_smooth_motion_gets_a_step_within_tolerance():
+    heads = still_heads()
+    heads[:, 1] = np.sin(np.arange(FRAMES) * 0.05)
+    tolerance = 0.01
+
+    multiplier = bone_step_multipliers(bone_points(heads, still_x_axes()), tolerance)[0]
+    kept = np.unique(np.append(np.arange(0, FRAMES, multiplier), FRAMES - 1))
+    rebuilt = np.interp(np.arange(FRAMES), kept, heads[kept, 1])
+
+    assert 1 < multiplier < MAX_STEP_MULTIPLIER
+    assert np.abs(rebuilt - heads[:, 1]).max() <= tolerance
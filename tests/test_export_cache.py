@@ -0,0 +1,72 @@
+import pytest
+
+bpy = pytest.importorskip('bpy')
+from BitTools.exporter.export_cache import ExportCache
+
+ENGINE_CONFIGS = {'apply_scale': 'FBX_SCALE_ALL', 'texture_format': 'PNG'}
+
+
+@pytest.fixture
+def cube(addon):
+    mesh = bpy.data.meshes.new('BitToolsTestCube')
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], [], [(0, 1, 2, 3)])
+    obj = bpy.data.objects.new('BitToolsTestCube', mesh)
+    bpy.context.scene.collection.objects.link(obj)
+
+    yield obj
+
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(mesh)
+
+
+def test_fingerprint_survives_saving_and_loading(cube, tmp_path):
+    context = bpy.context
+    filepath = tmp_path / 'SM_Cube.fbx'
+
+    cache = ExportCache(context, tmp_path, ENGINE_CONFIGS)
+    fingerprint = cache.fingerprint(context, [cube])
+    assert fingerprint is not None
+    assert not cache.matches(filepath, fingerprint)
+
+    cache.update(filepath, fingerprint)
+    cache.save()
+
+    loaded = ExportCache(context, tmp_path, ENGINE_CONFIGS)
+    assert loaded.fingerprint(context, [cube]) == fingerprint
+    assert loaded.matches(filepath, fingerprint)
+    assert not loaded.is_up_to_date(filepath, fingerprint)
+
+    filepath.touch()
+    assert loaded.is_up_to_date(filepath, fingerprint)
+
+
+def test_changes_and_settings_invalidate_the_cache(cube, tmp_path):
+    context = bpy.context
+    filepath = tmp_path / 'SM_Cube.fbx'
+
+    cache = ExportCache(context, tmp_path, ENGINE_CONFIGS)
+    fingerprint = cache.fingerprint(context, [cube])
+    cache.update(filepath, fingerprint)
+    cache.save()
+
+    other_engine = ExportCache(context, tmp_path, {**ENGINE_CONFIGS, 'texture_format': 'TGA'})
+    assert not other_engine.matches(filepath, fingerprint)
+
+    cube.data.vertices[0].co.z = 1
+    cube.data.update()
+    context.view_layer.update()
+    edited = ExportCache(context, tmp_path, ENGINE_CONFIGS)
+    assert edited.fingerprint(context, [cube]) != fingerprint
+
+
+def test_forgotten_files_are_exported_again(cube, tmp_path):
+    context = bpy.context
+    filepath = tmp_path / 'SM_Cube.fbx'
+
+    cache = ExportCache(context, tmp_path, ENGINE_CONFIGS)
+    fingerprint = cache.fingerprint(context, [cube])
+    cache.update(filepath, fingerprint)
+    cache.forget(filepath)
+
+    assert not cache.matches(filepath, fingerprint)
+    assert cache.fingerprint(context, [cube]) == fingerprint
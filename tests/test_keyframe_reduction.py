@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip('bpy')
+import numpy as np
+from BitTools.exporter.keyframe_reduction import reduce_curve
+
+
+def test_straight_line_keeps_only_its_ends():
+    times = np.arange(30, dtype=np.float64)
+    keep = reduce_curve(times, times * 0.5 + 2, 0.001)
+
+    assert keep.tolist() == [True] + [False] * 28 + [True]
+
+
+def test_reduced_curve_stays_within_tolerance():
+    times = np.arange(120, dtype=np.float64)
+    values = np.sin(times * 0.1) * 3 + np.where(times > 60, 1.5, 0)
+    tolerance = 0.01
+
+    keep = reduce_curve(times, values, tolerance)
+    rebuilt = np.interp(times, times[keep], values[keep])
+
+    assert keep[0] and keep[-1]
+    assert keep.sum() < len(times)
+    assert np.abs(rebuilt - values).max() <= tolerance
+
+
+def test_steps_keep_their_corners():
+    times = np.arange(10, dtype=np.float64)
+    values = np.array([0, 0, 0, 0, 0, 1, 1, 1, 1, 1], dtype=np.float64)
+
+    keep = reduce_curve(times, values, 0.001)
+
+    assert np.flatnonzero(keep).tolist() == [0, 4, 5, 9]
+
+
+@pytest.mark.parametrize('count', [1, 2])
+def test_short_curves_keep_every_key(count):
+    times = np.arange(count, dtype=np.float64)
+
+    assert reduce_curve(times, times, 0.1).all()
@@ -0,0 +1,61 @@
+import pytest
+
+bpy = pytest.importorskip('bpy')
+from BitTools.exporter.material_slots import compact_material_slots, has_unused_material_slots, restore_material_slots
+
+
+@pytest.fixture
+def mesh():
+    """Three quads and four material slots, the second and last slots unused."""
+    mesh = bpy.data.meshes.new('BitToolsTestMesh')
+    vertices = [(x, y, 0) for x in range(4) for y in range(2)]
+    mesh.from_pydata(vertices, [], [(i * 2, i * 2 + 2, i * 2 + 3, i * 2 + 1) for i in range(3)])
+    materials = [bpy.data.materials.new(f'BitToolsTestMaterial{i}') for i in range(4)]
+    for material in materials:
+        mesh.materials.append(material)
+    mesh.polygons.foreach_set('material_index', [2, 0, 2])
+
+    yield mesh
+
+    bpy.data.meshes.remove(mesh)
+    for material in materials:
+        bpy.data.materials.remove(material)
+
+
+def slot_names(mesh):
+    return [material.name for material in mesh.materials]
+
+
+def polygon_materials(mesh):
+    return [mesh.materials[polygon.material_index].name for polygon in mesh.polygons]
+
+
+def test_unused_slots_are_removed_and_polygons_keep_their_materials(mesh):
+    before = polygon_materials(mesh)
+    assert has_unused_material_slots(mesh)
+
+    compact_material_slots([mesh])
+
+    assert slot_names(mesh) == ['BitToolsTestMaterial0', 'BitToolsTestMaterial2']
+    assert [polygon.material_index for polygon in mesh.polygons] == [1, 0, 1]
+    assert polygon_materials(mesh) == before
+    assert not has_unused_material_slots(mesh)
+
+
+def test_restore_puts_slots_and_indices_back(mesh):
+    slots_before = slot_names(mesh)
+
+    restore = compact_material_slots([mesh, mesh])
+    assert len(restore) == 1
+    restore_material_slots(restore)
+
+    assert slot_names(mesh) == slots_before
+    assert [polygon.material_index for polygon in mesh.polygons] == [2, 0, 2]
+
+
+def test_meshes_using_every_slot_are_left_alone(mesh):
+    mesh.materials.pop()
+    mesh.polygons.foreach_set('material_index', [0, 1, 2])
+
+    assert compact_material_slots([mesh]) == []
+    assert len(mesh.materials) == 3
@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip('bpy')
+import numpy as np
+import struct
+import zlib
+from BitTools.exporter.texture_processing import encode_png, encode_tga, resize_pixels
+
+
+def gradient(height, width, channels=4):
+    """uint8 pixels whose every pixel is different, bottom row first like Blender's."""
+    values = np.arange(height * width * channels, dtype=np.uint32) * 7
+    return (values % 256).astype(np.uint8).reshape(height, width, channels)
+
+
+def decode_png(data):
+    """Reads back the 8 bit RGB(A) PNG files encode_png() writes, returned bottom row first."""
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    chunks = {}
+    position = 8
+    while position < len(data):
+        length, = struct.unpack('>I', data[position:position + 4])
+        chunk_type = data[position + 4:position + 8]
+        chunk = data[position + 8:position + 8 + length]
+        crc, = struct.unpack('>I', data[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(chunk_type + chunk) & 0xffffffff
+        chunks[chunk_type] = chunk
+        position += 12 + length
+
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', chunks[b'IHDR'][:10])
+    assert bit_depth == 8
+    channels = 4 if color_type == 6 else 3
+
+    scanlines = np.frombuffer(zlib.decompress(chunks[b'IDAT']), dtype=np.uint8).reshape(height, -1)
+    assert (scanlines[:, 0] == 2).all()
+    rows = np.cumsum(scanlines[:, 1:], axis=0, dtype=np.uint8)
+
+    return rows.reshape(height, width, channels)[::-1]
+
+
+@pytest.mark.parametrize('channels', [3, 4])
+def test_png_round_trip(channels):
+    pixels = gradient(5, 7, channels)
+
+    assert np.array_equal(decode_png(encode_png(pixels)), pixels)
+
+
+@pytest.mark.parametrize('channels', [3, 4])
+def test_tga_header_and_pixels(channels):
+    pixels = gradient(3, 6, channels)
+    data = encode_tga(pixels)
+
+    image_type, width, height, bits, descriptor = struct.unpack('<2xB9xHHBB', data[:18])
+    assert (image_type, width, height, bits) == (2, 6, 3, channels * 8)
+    assert descriptor == (8 if channels == 4 else 0)
+
+    bgr = np.frombuffer(data[18:], dtype=np.uint8).reshape(3, 6, channels)
+    assert np.array_equal(bgr[..., [2, 1, 0, 3][:channels]], pixels)
+
+
+def test_resize_leaves_small_textures_alone():
+    pixels = gradient(4, 8)
+
+    assert resize_pixels(pixels, 8) is pixels
+    assert resize_pixels(pixels, 0) is pixels
+
+
+def test_resize_averages_down_to_max_size():
+    pixels = np.zeros((8, 16, 4), dtype=np.uint8)
+    pixels[:, ::2] = 200
+
+    resized = resize_pixels(pixels, 4)
+
+    assert resized.shape == (2, 4, 4)
+    assert resized.dtype == np.uint8
+    assert (resized == 100).all()
+
+
+def test_resize_to_sizes_that_are_not_powers_of_two():
+    resized = resize_pixels(np.full((30, 60, 4), 80, dtype=np.uint8), 25)
+
+    assert resized.shape == (12, 25, 4)
+    assert (resized == 80).all()